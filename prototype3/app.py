@@ -5,10 +5,12 @@ Fully AI-driven cybersecurity assessment with Flask and Jinja2
 
 import os
 import logging
-from flask import Flask, render_template, session, request
+import time
+from flask import Flask, session, request, g
 from flask_session import Session
 from flask_babel import Babel
 from dotenv import load_dotenv
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 # Load environment variables
 load_dotenv()
@@ -18,6 +20,11 @@ from routes.home import home_bp
 from routes.assessment import assessment_bp
 from routes.dashboard import dashboard_bp
 from routes.api import api_bp
+from routes.assessments_api import assessments_api_bp
+from routes.analytics import analytics_bp
+from routes.exports import exports_bp
+from services.metrics import FAST_BUCKETS, REGISTRY, TimedSessionInterface
+from services import log_pipeline, profiler, rate_limiter, render_cache, static_assets, translation_bundles, warmup
 
 # Initialize Babel
 babel = Babel()
@@ -49,6 +56,7 @@ def create_app():
     # Configuration
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     app.config['SESSION_TYPE'] = 'filesystem'
+    app.config['SESSION_FILE_DIR'] = os.getenv('SESSION_FILE_DIR', os.path.join(os.getcwd(), 'flask_session'))
     app.config['GEMINI_API_KEY'] = os.getenv('GEMINI_API_KEY', '')
     app.config['DEBUG'] = os.getenv('FLASK_DEBUG', 'True') == 'True'
     app.config['LANGUAGES'] = SUPPORTED_LANGUAGES
@@ -69,6 +77,9 @@ def create_app():
     app.register_blueprint(assessment_bp, url_prefix='/assessment')
     app.register_blueprint(dashboard_bp, url_prefix='/dashboard')
     app.register_blueprint(api_bp, url_prefix='/api')
+    app.register_blueprint(assessments_api_bp, url_prefix='/api/assessments')
+    app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
+    app.register_blueprint(exports_bp, url_prefix='/api/exports')
     
     # Error handlers
     register_error_handlers(app)
@@ -76,32 +87,60 @@ def create_app():
     # Template filters
     register_template_filters(app)
     
+    # Client address and scheme from the X-Forwarded-* headers set by trusted proxies
+    proxy_hops = int(os.getenv('TRUSTED_PROXY_HOPS', 0))
+    if proxy_hops > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops, x_proto=proxy_hops)
+        # The same for the environ of the views the ASGI bridge runs as coroutines
+        app.extensions['proxy_fix'] = ProxyFix(lambda environ, start_response: environ,
+                                               x_for=proxy_hops, x_proto=proxy_hops)
+    
+    # Per-IP and per-session token buckets on page routes (RATE_LIMIT_*)
+    rate_limiter.init_app(app)
+    
+    # Persistent Jinja bytecode cache
+    render_cache.configure_bytecode_cache(app)
+    
+    # Fingerprinted, pre-compressed static files (python build_assets.py)
+    static_assets.init_app(app)
+    
+    # Per-locale client-side string bundles (python compile_translations.py)
+    translation_bundles.init_app(app)
+    
+    # Request timing metrics
+    register_request_metrics(app)
+    
+    # Opt-in profiling (PROFILER_TOKEN)
+    register_profiling(app)
+    
     app.logger.info('CyberHubs AI Assessment Platform initialized')
     
     return app
 
 def configure_logging(app):
-    """Configure application logging with debugging"""
-    if app.config['DEBUG']:
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('debug.log'),
-                logging.StreamHandler()
-            ]
-        )
-    else:
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('app.log'),
-                logging.StreamHandler()
-            ]
-        )
+    """
+    Configure application logging
     
-    app.logger.setLevel(logging.DEBUG if app.config['DEBUG'] else logging.INFO)
+    LOG_LEVEL overrides the level (DEBUG when FLASK_DEBUG is on, else INFO),
+    LOG_FORMAT=json emits one JSON object per line, LOG_ASYNC=True moves file
+    and console I/O to a background thread and LOG_DEBUG_SAMPLE_RATE keeps
+    DEBUG records for only that fraction of requests per route.
+    """
+    default_level = 'DEBUG' if app.config['DEBUG'] else 'INFO'
+    level = getattr(logging, os.getenv('LOG_LEVEL', default_level).upper(), logging.INFO)
+    
+    log_pipeline.install(
+        level=level,
+        handlers=[
+            logging.FileHandler('debug.log' if app.config['DEBUG'] else 'app.log'),
+            logging.StreamHandler()
+        ],
+        log_format=os.getenv('LOG_FORMAT', 'text').lower(),
+        use_queue=os.getenv('LOG_ASYNC', 'False') == 'True',
+        debug_sample_rate=float(os.getenv('LOG_DEBUG_SAMPLE_RATE', 1.0))
+    )
+    
+    app.logger.setLevel(level)
     app.logger.debug('Logging configured successfully')
 
 def register_error_handlers(app):
@@ -110,17 +149,17 @@ def register_error_handlers(app):
     @app.errorhandler(404)
     def not_found_error(error):
         app.logger.error(f'404 Error: {error}')
-        return render_template('errors/404.html'), 404
+        return render_cache.render_cached('errors/404.html'), 404
     
     @app.errorhandler(500)
     def internal_error(error):
         app.logger.error(f'500 Error: {error}')
-        return render_template('errors/500.html'), 500
+        return render_cache.render_cached('errors/500.html'), 500
     
     @app.errorhandler(Exception)
     def handle_exception(error):
         app.logger.exception(f'Unhandled exception: {error}')
-        return render_template('errors/500.html'), 500
+        return render_cache.render_cached('errors/500.html'), 500
 
 def register_template_filters(app):
     """Register custom Jinja2 template filters"""
@@ -142,24 +181,114 @@ def register_template_filters(app):
             return 0
         return round((value / total) * 100, 1)
 
-if __name__ == '__main__':
-    # Setup logging for startup
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+def register_request_metrics(app):
+    """Record per-blueprint/endpoint request latency and session load/save time"""
+    request_latency = REGISTRY.histogram(
+        'http_request_duration_seconds',
+        'Request latency including session load and save',
+        labelnames=('blueprint', 'endpoint', 'method'),
     )
-    logger = logging.getLogger(__name__)
+    request_count = REGISTRY.counter(
+        'http_requests_total',
+        'Requests served',
+        labelnames=('blueprint', 'endpoint', 'method', 'status'),
+    )
+    session_latency = REGISTRY.histogram(
+        'session_duration_seconds',
+        'Time spent loading and saving the server-side session',
+        labelnames=('operation',),
+        buckets=FAST_BUCKETS,
+    )
+    app.session_interface = TimedSessionInterface(app.session_interface, session_latency)
     
-    app = create_app()
+    @app.after_request
+    def tag_request_route(response):
+        # The WSGI wrapper below observes after the session is saved, when the
+        # request context is gone, so hand it the route labels via the environ
+        request.environ['cyberhubs.route'] = (
+            request.blueprint or 'app',
+            request.endpoint or 'unmatched',
+            str(response.status_code),
+        )
+        return response
     
-    # Load question bank (hardcoded questions only - no cache needed)
-    logger.info('🚀 Loading hardcoded question bank...')
-    from services.question_bank import QuestionBank
-    question_bank = QuestionBank()
+    def observe_request(environ, seconds):
+        blueprint, endpoint, status = environ.get('cyberhubs.route', ('app', 'unmatched', '500'))
+        method = environ.get('REQUEST_METHOD', '')
+        request_latency.observe(seconds, blueprint=blueprint, endpoint=endpoint, method=method)
+        request_count.inc(blueprint=blueprint, endpoint=endpoint, method=method, status=status)
+        REGISTRY.maybe_flush()
+    
+    # Also used by the ASGI bridge for the views it runs as coroutines
+    app.extensions['observe_request'] = observe_request
+    
+    wsgi_app = app.wsgi_app
+    
+    def timed_wsgi_app(environ, start_response):
+        start = time.perf_counter()
+        try:
+            return wsgi_app(environ, start_response)
+        finally:
+            observe_request(environ, time.perf_counter() - start)
+    
+    app.wsgi_app = timed_wsgi_app
+
+def register_profiling(app):
+    """Tag threads with their route and allow cProfile of single requests when PROFILER_TOKEN is set"""
+    if not profiler.profiler_token():
+        return
+    
+    @app.before_request
+    def start_request_profile():
+        profiler.mark_route(request.endpoint)
+        if profiler.is_authorized(request.headers.get('X-Profile')):
+            request_profile = profiler.RequestProfile(request.endpoint)
+            if request_profile.start():
+                g.request_profile = request_profile
+    
+    @app.after_request
+    def stop_request_profile(response):
+        request_profile = g.pop('request_profile', None)
+        if request_profile is not None:
+            path = request_profile.stop()
+            response.headers['X-Profile-File'] = os.path.basename(path)
+            app.logger.info(f'✅ Request profile for {request_profile.endpoint} written to {path}')
+        return response
+    
+    @app.teardown_request
+    def clear_route_tag(error=None):
+        profiler.mark_route(None)
+    
+    # kill -USR2 <pid> samples that worker in the background
+    profiler.install_from_env()
+    
+    app.logger.info('Profiling enabled')
+
+def init_services(app):
+    """
+    Build the service singletons eagerly
+    
+    Called once before serving (and, under gunicorn --preload, before forking)
+    so the question bank is loaded a single time and shared copy-on-write by
+    all workers instead of being built lazily on each worker's first request.
+    """
+    from services import get_question_bank, get_assessment_service, get_gemini_service
+    
+    app.logger.info('🚀 Loading hardcoded question bank...')
+    question_bank = get_question_bank()
     question_count = question_bank.get_question_count()
-    logger.info(f'✅ Question bank loaded: {question_count["total"]} total questions')
+    app.logger.info(f'✅ Question bank loaded: {question_count["total"]} total questions')
     for domain, counts in question_count['by_domain'].items():
-        logger.info(f'   {domain}: {counts["total"]} questions ({counts["beginner"]} beginner, {counts["intermediate"]} intermediate, {counts["advanced"]} advanced)')
+        app.logger.info(f'   {domain}: {counts["total"]} questions ({counts["beginner"]} beginner, {counts["intermediate"]} intermediate, {counts["advanced"]} advanced)')
+    
+    get_assessment_service()
+    # Only stores configuration; the Gemini client connects on first call, in the worker
+    get_gemini_service()
+
+if __name__ == '__main__':
+    app = create_app()
+    init_services(app)
+    warmup.warm(app)
     
     port = int(os.getenv('PORT', 5000))
     app.run(
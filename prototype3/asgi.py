@@ -0,0 +1,23 @@
+"""
+CyberHubs AI Assessment Platform - ASGI Entry Point
+Async serving: gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:application
+"""
+
+import os
+
+from app import create_app, init_services
+from routes.api import stream_summary_async
+from services import get_gemini_service, warmup
+from services.asgi_bridge import AsgiBridge
+
+app = create_app()
+init_services(app)
+
+# Views that wait on Gemini run as coroutines; everything else keeps the WSGI code path
+application = AsgiBridge(
+    app,
+    wsgi_threads=int(os.getenv('ASGI_WSGI_THREADS', 32)),
+    on_startup=lambda: warmup.warm(app),
+    on_shutdown=lambda: get_gemini_service().aclose(),
+)
+application.async_view('api.stream_summary', stream_summary_async)
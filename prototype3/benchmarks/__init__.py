@@ -0,0 +1,4 @@
+"""
+Benchmarks package
+Load and performance tooling that runs without a real Gemini key
+"""
@@ -0,0 +1,102 @@
+"""
+HTTP client adapters shared by the benchmark scripts
+"""
+
+import os
+import re
+import tempfile
+from typing import Dict, Tuple
+
+from benchmarks.mock_gemini import MockConfig, start_server
+
+QUESTION_ID_RE = re.compile(r'name="question_id"\s+value="([^"]+)"')
+DOMAINS = ('network-security', 'secure-coding', 'incident-response')
+
+
+class FlaskClient:
+    """
+    Adapter over the Flask test client
+
+    Redirects are followed by hand: /assessment/question redirects to itself after
+    drawing a question, which Werkzeug's built-in follower reports as a loop.
+    """
+
+    MAX_REDIRECTS = 5
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def _follow(self, response) -> Tuple[int, str]:
+        for _ in range(self.MAX_REDIRECTS):
+            if response.status_code not in (301, 302, 303, 307, 308):
+                break
+            response = self.client.get(response.headers['Location'])
+        return response.status_code, response.get_data(as_text=True)
+
+    def get(self, path: str, follow: bool = True) -> Tuple[int, str]:
+        response = self.client.get(path)
+        return self._follow(response) if follow else (response.status_code, response.get_data(as_text=True))
+
+    def post(self, path: str, data: Dict, follow: bool = True) -> Tuple[int, str]:
+        response = self.client.post(path, data=data)
+        return self._follow(response) if follow else (response.status_code, response.get_data(as_text=True))
+
+
+class HttpClient:
+    """Adapter over a requests session against a running server"""
+
+    def __init__(self, base_url: str):
+        import requests
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def get(self, path: str, follow: bool = True) -> Tuple[int, str]:
+        response = self.session.get(self.base_url + path, allow_redirects=follow)
+        return response.status_code, response.text
+
+    def post(self, path: str, data: Dict, follow: bool = True) -> Tuple[int, str]:
+        response = self.session.post(self.base_url + path, data=data, allow_redirects=follow)
+        return response.status_code, response.text
+
+
+def complete_assessment(client, domain: str, num_questions: int) -> None:
+    """Drive one assessment up to (but not including) the results page"""
+    status, html = client.post('/assessment/start', {'domain': domain, 'num_questions': num_questions})
+    for i in range(num_questions):
+        if i:
+            status, html = client.get('/assessment/question')
+        match = QUESTION_ID_RE.search(html)
+        if not match:
+            raise RuntimeError(f'No question on page (HTTP {status})')
+        # Not following the redirect: the last answer redirects to the results page
+        status, _ = client.post('/assessment/question', {'question_id': match.group(1), 'answer': 0}, follow=False)
+        if status >= 400:
+            raise RuntimeError(f'Answer rejected (HTTP {status})')
+
+
+def create_mock_app(config: MockConfig):
+    """
+    Create an in-process app wired to a local mock Gemini server
+
+    Sessions go to a temporary directory, and the feedback pack and page rate
+    limits (every simulated user shares one address) are disabled so every
+    run measures the same code path.
+
+    Returns:
+        (app, mock_server, mock_stats)
+    """
+    mock_server, mock_stats = start_server(config)
+    host, port = mock_server.server_address[:2]
+    workdir = tempfile.mkdtemp(prefix='cyberhubs-bench-')
+    os.environ.update({
+        'GEMINI_API_KEY': 'mock',
+        'GEMINI_API_ENDPOINT': f'http://{host}:{port}',
+        'FLASK_DEBUG': 'False',
+        'SESSION_FILE_DIR': os.path.join(workdir, 'flask_session'),
+        'GEMINI_FEEDBACK_PACK': os.path.join(workdir, 'no_feedback_pack.json'),
+        'RESULTS_DB': os.path.join(workdir, 'results.db'),
+        'LEADERBOARD_SNAPSHOT': os.path.join(workdir, 'leaderboard_snapshot.json'),
+        'RATE_LIMIT_ENABLED': 'False',
+    })
+    from app import create_app
+    return create_app(), mock_server, mock_stats
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of full user journeys with a committed baseline.
+
+Usage:
+  In-process (Flask test client, mock Gemini, compared against baseline.json):
+    python -m benchmarks.e2e
+
+  Multi-process HTTP driver against a running server:
+    python -m benchmarks.e2e --url http://127.0.0.1:5000 --processes 4 --journeys 200
+
+  Record a new baseline after an intended change:
+    python -m benchmarks.e2e --update-baseline
+
+  Skip the cold-start budget check (e.g. on a loaded machine):
+    python -m benchmarks.e2e --skip-startup
+
+What it does:
+- Runs journeys: start page, start POST, N x (question GET + answer POST),
+  results, dashboard, history and badges
+- Reports per-route throughput and p50/p99 latency, session bytes written
+  (in-process only) and peak RSS
+- Runs the cold-start check of benchmarks.startup against its budget
+- Fails (exit 1) when a metric regresses past --threshold versus the baseline
+  or startup is over budget
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+from benchmarks import startup
+from benchmarks.clients import DOMAINS, QUESTION_ID_RE, FlaskClient, HttpClient, create_mock_app
+from benchmarks.mock_gemini import MockConfig
+from benchmarks.stats import summarize
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Latency differences below these many ms are treated as noise; tail latency of
+# a few dozen samples is jumpier, so it gets a wider floor
+P50_NOISE_FLOOR_MS = 5.0
+P99_NOISE_FLOOR_MS = 15.0
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+class SessionWriteMeter:
+    """Counts bytes the filesystem session backend writes"""
+
+    def __init__(self, app):
+        self.bytes_written = 0
+        self.writes = 0
+        cache = getattr(app.session_interface, 'cache', None)
+        if cache is None or not hasattr(cache, '_get_filename'):
+            self.enabled = False
+            return
+        self.enabled = True
+        original_set = cache.set
+
+        def metered_set(key, value, timeout=None, **kwargs):
+            result = original_set(key, value, timeout, **kwargs)
+            try:
+                self.bytes_written += os.path.getsize(cache._get_filename(key))
+                self.writes += 1
+            except OSError:
+                pass
+            return result
+
+        cache.set = metered_set
+
+
+def run_journey(client, index: int, rounds: int, record) -> None:
+    """One full user journey; record(label, seconds) is called per request"""
+
+    def timed(label, fn, *args, **kwargs):
+        start = time.perf_counter()
+        status, html = fn(*args, **kwargs)
+        record(label, time.perf_counter() - start)
+        if status >= 400:
+            raise RuntimeError(f'{label} returned HTTP {status}')
+        return status, html
+
+    domain = DOMAINS[index % len(DOMAINS)]
+    timed('GET /assessment/start', client.get, '/assessment/start')
+    timed('POST /assessment/start', client.post, '/assessment/start',
+          {'domain': domain, 'num_questions': rounds}, follow=False)
+
+    for _ in range(rounds):
+        _, html = timed('GET /assessment/question', client.get, '/assessment/question')
+        match = QUESTION_ID_RE.search(html)
+        if not match:
+            raise RuntimeError('No question on page')
+        timed('POST /assessment/question', client.post, '/assessment/question',
+              {'question_id': match.group(1), 'answer': index % 4}, follow=False)
+
+    timed('GET /assessment/results', client.get, '/assessment/results')
+    timed('GET /dashboard/', client.get, '/dashboard/')
+    timed('GET /dashboard/history', client.get, '/dashboard/history')
+    timed('GET /dashboard/badges', client.get, '/dashboard/badges')
+
+
+def _http_worker(args) -> Dict:
+    """Run a share of the journeys in a separate process against a server"""
+    url, indices, rounds = args
+    timings: Dict[str, List[float]] = {}
+    errors = 0
+    for i in indices:
+        try:
+            run_journey(HttpClient(url), i, rounds, lambda label, t: timings.setdefault(label, []).append(t))
+        except Exception:
+            errors += 1
+    return {'timings': timings, 'errors': errors, 'peak_rss_mb': peak_rss_mb()}
+
+
+def run(args: argparse.Namespace) -> Dict:
+    timings: Dict[str, List[float]] = {}
+    errors = 0
+    session_meter = None
+    driver_rss = None
+
+    start = time.perf_counter()
+    if args.url:
+        processes = max(1, args.processes)
+        shares = [(args.url, list(range(p, args.journeys, processes)), args.rounds) for p in range(processes)]
+        with multiprocessing.Pool(processes) as pool:
+            for result in pool.map(_http_worker, shares):
+                for label, values in result['timings'].items():
+                    timings.setdefault(label, []).extend(values)
+                errors += result['errors']
+                if result['peak_rss_mb'] is not None:
+                    driver_rss = max(driver_rss or 0, result['peak_rss_mb'])
+    else:
+        app, mock_server, _ = create_mock_app(MockConfig(latency_ms=args.gemini_latency_ms))
+        session_meter = SessionWriteMeter(app)
+        # Warm-up journey so one-time imports and template compilation are not measured
+        run_journey(FlaskClient(app), 0, args.rounds, lambda label, t: None)
+        start = time.perf_counter()
+        for i in range(args.journeys):
+            try:
+                run_journey(FlaskClient(app), i, args.rounds, lambda label, t: timings.setdefault(label, []).append(t))
+            except Exception:
+                errors += 1
+        mock_server.shutdown()
+    wall_time = time.perf_counter() - start
+
+    report = {
+        'mode': 'http' if args.url else 'in-process',
+        'journeys': args.journeys,
+        'rounds': args.rounds,
+        'errors': errors,
+        'wall_time_s': round(wall_time, 2),
+        'journeys_per_s': round((args.journeys - errors) / wall_time, 2) if wall_time else 0.0,
+        'routes': {label: summarize(values, wall_time) for label, values in sorted(timings.items())},
+        'peak_rss_mb': peak_rss_mb() if not args.url else driver_rss,
+    }
+    if session_meter is not None and session_meter.enabled:
+        report['session_bytes_written'] = session_meter.bytes_written
+        report['session_bytes_per_journey'] = round(session_meter.bytes_written / max(1, args.journeys + 1))
+    return report
+
+
+def compare(report: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return human-readable regressions of report versus baseline"""
+    regressions: List[str] = []
+
+    def worse(name: str, current: float, previous: float, higher_is_worse: bool = True, floor: float = 0.0) -> None:
+        if previous is None or current is None or previous <= 0:
+            return
+        delta = current - previous if higher_is_worse else previous - current
+        if delta > floor and delta / previous > threshold:
+            regressions.append(f'{name}: {previous} -> {current} ({delta / previous:+.0%})')
+
+    for label, summary in report['routes'].items():
+        base = baseline.get('routes', {}).get(label)
+        if not base:
+            continue
+        worse(f'{label} p50_ms', summary['p50_ms'], base['p50_ms'], floor=P50_NOISE_FLOOR_MS)
+        worse(f'{label} p99_ms', summary['p99_ms'], base['p99_ms'], floor=P99_NOISE_FLOOR_MS)
+
+    worse('journeys_per_s', report['journeys_per_s'], baseline.get('journeys_per_s'), higher_is_worse=False)
+    worse('session_bytes_per_journey', report.get('session_bytes_per_journey'), baseline.get('session_bytes_per_journey'))
+    worse('peak_rss_mb', report.get('peak_rss_mb'), baseline.get('peak_rss_mb'))
+    return regressions
+
+
+def print_report(report: Dict) -> None:
+    print(f"{report['mode']}: {report['journeys'] - report['errors']}/{report['journeys']} journeys "
+          f"({report['rounds']} rounds) in {report['wall_time_s']}s - {report['journeys_per_s']} journeys/s")
+    print(f"{'route':<32} {'count':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for label, s in report['routes'].items():
+        print(f"{label:<32} {s['count']:>7} {s['throughput_rps']:>9.2f} {s['p50_ms']:>9.2f} {s['p99_ms']:>9.2f}")
+    if 'session_bytes_written' in report:
+        print(f"Session bytes written: {report['session_bytes_written']} "
+              f"({report['session_bytes_per_journey']} per journey)")
+    if report.get('peak_rss_mb') is not None:
+        print(f"Peak RSS: {report['peak_rss_mb']} MB")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description='End-to-end benchmark of the assessment flow')
+    parser.add_argument('--journeys', type=int, default=30, help='Journeys to run (default: 30)')
+    parser.add_argument('--rounds', type=int, default=10, help='Question rounds per journey (default: 10)')
+    parser.add_argument('--url', default=None, help='Drive a running server over HTTP instead of the test client')
+    parser.add_argument('--processes', type=int, default=4, help='HTTP driver processes (default: 4)')
+    parser.add_argument('--gemini-latency-ms', type=float, default=0.0, help='Mock Gemini latency, in-process mode (default: 0)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline file (default: benchmarks/baseline.json)')
+    parser.add_argument('--threshold', type=float, default=0.3, help='Allowed relative regression (default: 0.3)')
+    parser.add_argument('--update-baseline', action='store_true', help='Write this run as the new baseline')
+    parser.add_argument('--startup-budget-ms', type=float, default=startup.DEFAULT_BUDGET_MS,
+                        help=f'Cold-start budget (default: {startup.DEFAULT_BUDGET_MS:.0f})')
+    parser.add_argument('--skip-startup', action='store_true', help='Skip the cold-start budget check')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    startup_report = None
+    if not args.skip_startup:
+        startup_report = startup.run(argparse.Namespace(runs=5, budget_ms=args.startup_budget_ms, top=5))
+    if args.json:
+        print(json.dumps({**report, 'startup': startup_report} if startup_report else report, indent=2))
+    else:
+        print_report(report)
+        if startup_report:
+            startup.print_report(startup_report)
+
+    if report['errors']:
+        print(f"Error: {report['errors']} journeys failed", file=sys.stderr)
+        return 1
+
+    # The startup budget is absolute, so it is checked whatever the baseline says
+    failed = False
+    if startup_report:
+        problems = startup.failures(startup_report)
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        failed = bool(problems)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f'Baseline written to {args.baseline}')
+        return 1 if failed else 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline found - run with --update-baseline to create one')
+        return 1 if failed else 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('mode') != report['mode'] or baseline.get('rounds') != report['rounds']:
+        print(f"Baseline was recorded in {baseline.get('mode')} mode with {baseline.get('rounds')} rounds - not comparable")
+        return 1 if failed else 0
+
+    regressions = compare(report, baseline, args.threshold)
+    if regressions:
+        print(f'Regressions versus baseline (threshold {args.threshold:.0%}):')
+        for line in regressions:
+            print(f'  - {line}')
+        return 1
+    print(f'No regressions versus baseline (threshold {args.threshold:.0%})')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Load harness for the results flow against a mock Gemini backend.
+
+Usage:
+  In-process app + mock Gemini (no key, no network):
+    python -m benchmarks.load_results --assessments 200 --concurrency 16 --latency-ms 800 --error-rate 0.05
+
+  Include the streamed AI summary and recommendations in each journey:
+    python -m benchmarks.load_results --with-summary-stream
+
+  Against an already running server (start it with GEMINI_API_ENDPOINT pointing at the mock):
+    python -m benchmarks.load_results --url http://127.0.0.1:5000
+
+What it does:
+- Starts benchmarks.mock_gemini in-process and points GeminiService at it
+- Completes assessments concurrently (start, answer every question)
+- Times GET /assessment/results (and optionally the summary stream)
+- Reports throughput and p50/p95/p99 latency
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from benchmarks.clients import DOMAINS, FlaskClient, HttpClient, complete_assessment, create_mock_app
+from benchmarks.mock_gemini import add_mock_arguments, config_from_args
+from benchmarks.stats import format_header, format_row, summarize
+
+STREAM_URL_RE = re.compile(r'data-stream-url="([^"]+)"')
+
+
+def run_journey(make_client, index: int, num_questions: int, with_stream: bool,
+                timings: Dict[str, List[float]], lock: threading.Lock) -> None:
+    client = make_client()
+    complete_assessment(client, DOMAINS[index % len(DOMAINS)], num_questions)
+
+    start = time.perf_counter()
+    status, html = client.get('/assessment/results')
+    elapsed = time.perf_counter() - start
+    if status != 200:
+        raise RuntimeError(f'Results returned HTTP {status}')
+    with lock:
+        timings['GET /assessment/results'].append(elapsed)
+
+    if with_stream:
+        match = STREAM_URL_RE.search(html)
+        if match:
+            start = time.perf_counter()
+            client.get(match.group(1))
+            elapsed = time.perf_counter() - start
+            with lock:
+                timings['GET /api/results/<id>/summary/stream'].append(elapsed)
+
+
+def run(args: argparse.Namespace) -> Dict:
+    mock_server = mock_stats = None
+    if args.url:
+        make_client = lambda: HttpClient(args.url)  # noqa: E731
+    else:
+        app, mock_server, mock_stats = create_mock_app(config_from_args(args))
+        make_client = lambda: FlaskClient(app)  # noqa: E731
+
+    timings: Dict[str, List[float]] = {
+        'GET /assessment/results': [],
+        'GET /api/results/<id>/summary/stream': [],
+    }
+    lock = threading.Lock()
+    errors: List[str] = []
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [
+            pool.submit(run_journey, make_client, i, args.questions, args.with_summary_stream, timings, lock)
+            for i in range(args.assessments)
+        ]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                errors.append(str(e))
+    wall_time = time.perf_counter() - start
+
+    report = {
+        'assessments': args.assessments,
+        'concurrency': args.concurrency,
+        'wall_time_s': round(wall_time, 2),
+        'errors': len(errors),
+        'routes': {name: summarize(values, wall_time) for name, values in timings.items() if values},
+    }
+    if mock_stats is not None:
+        report['mock_gemini'] = mock_stats.to_dict()
+        mock_server.shutdown()
+    if errors:
+        report['first_error'] = errors[0]
+    return report
+
+
+def print_report(report: Dict) -> None:
+    print(f"Completed {report['assessments'] - report['errors']}/{report['assessments']} journeys "
+          f"at concurrency {report['concurrency']} in {report['wall_time_s']}s")
+    print(format_header())
+    for name, summary in report['routes'].items():
+        print(format_row(name, summary))
+    if 'mock_gemini' in report:
+        print(f"Mock Gemini: {report['mock_gemini']}")
+    if report.get('first_error'):
+        print(f"First error: {report['first_error']}")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description='Load-test /assessment/results with a mock Gemini backend')
+    parser.add_argument('--assessments', type=int, default=100, help='Completed assessments to drive (default: 100)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent users (default: 8)')
+    parser.add_argument('--questions', type=int, default=5, help='Questions per assessment (default: 5)')
+    parser.add_argument('--with-summary-stream', action='store_true', help='Also fetch the streamed AI summary')
+    parser.add_argument('--url', default=None, help='Drive a running server instead of an in-process app')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    add_mock_arguments(parser)
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Gemini generateContent REST API.
+
+Usage:
+  python -m benchmarks.mock_gemini --port 8089 --latency-ms 800 --latency-dist lognormal --error-rate 0.05
+
+Point the app at it with:
+  GEMINI_API_KEY=mock GEMINI_API_ENDPOINT=http://127.0.0.1:8089 python app.py
+
+What it does:
+- Serves POST /v1beta/models/<model>:generateContent and :streamGenerateContent
+- Sleeps according to a configurable latency distribution before answering
+- Fails a configurable fraction of calls with 503 UNAVAILABLE
+- Streams responses as several chunks with a configurable inter-chunk delay
+- Answers summary, recommendation and question prompts with plausible text
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 500.0
+    latency_dist: str = 'fixed'   # fixed | uniform | exponential | lognormal
+    jitter_ms: float = 0.0        # spread for uniform/lognormal
+    error_rate: float = 0.0
+    stream_chunks: int = 4
+    chunk_delay_ms: float = 50.0
+    seed: Optional[int] = None
+
+
+class MockStats:
+    """Thread-safe call counters, readable at GET /stats"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.streams = 0
+
+    def record(self, error: bool, stream: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += int(error)
+            self.streams += int(stream)
+
+    def to_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {'calls': self.calls, 'errors': self.errors, 'streams': self.streams}
+
+
+def sample_latency(config: MockConfig, rng: random.Random) -> float:
+    """Latency in seconds drawn from the configured distribution"""
+    mean = config.latency_ms
+    if config.latency_dist == 'uniform':
+        value = rng.uniform(max(0.0, mean - config.jitter_ms), mean + config.jitter_ms)
+    elif config.latency_dist == 'exponential':
+        value = rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+    elif config.latency_dist == 'lognormal':
+        # jitter_ms is used as the standard deviation of the distribution
+        sigma_ms = config.jitter_ms or mean / 2
+        if mean <= 0:
+            value = 0.0
+        else:
+            sigma2 = math.log(1 + (sigma_ms / mean) ** 2)
+            value = rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+    else:
+        value = mean
+    return max(0.0, value) / 1000.0
+
+
+def fake_text(prompt: str) -> str:
+    """Plausible model output for the prompts GeminiService builds"""
+    if '"learningPoints"' in prompt:
+        n = random.randint(0, 10 ** 9)
+        return json.dumps({
+            'title': f'Mock Question {n}',
+            'context': 'A mock scenario generated for load testing.',
+            'question': f'Which option is correct for mock question {n}?',
+            'options': ['Option A', 'Option B', 'Option C', 'Option D'],
+            'correct': n % 4,
+            'explanation': 'This is a mock explanation.',
+            'learningPoints': ['Mock learning point one', 'Mock learning point two'],
+            'sources': ['https://example.com/mock'],
+            'difficulty': 'beginner',
+            'domain': 'network-security',
+        })
+    if 'bulleted list' in prompt:
+        return '\n'.join(f'- Mock recommendation {i}' for i in range(1, 6))
+    return ('You completed the assessment with a solid effort. Your answers show a good grasp of the '
+            'fundamentals, and a little more practice on the harder scenarios will lift your score further.')
+
+
+def candidate(text: str, finished: bool = True) -> Dict:
+    body = {
+        'candidates': [{
+            'content': {'parts': [{'text': text}], 'role': 'model'},
+            'index': 0,
+            'safetyRatings': [],
+        }],
+    }
+    if finished:
+        body['candidates'][0]['finishReason'] = 'STOP'
+    return body
+
+
+def split_chunks(text: str, n: int) -> List[str]:
+    n = max(1, n)
+    size = max(1, -(-len(text) // n))
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def make_handler(config: MockConfig, stats: MockStats):
+    rng = random.Random(config.seed)
+    rng_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = 'MockGemini/1.0'
+
+        def log_message(self, format, *args):  # noqa: A002 - signature from BaseHTTPRequestHandler
+            pass
+
+        def _send_json(self, status: int, body: Dict) -> None:
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=UTF-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path.rstrip('/') == '/stats':
+                self._send_json(200, stats.to_dict())
+            else:
+                self._send_json(404, {'error': {'code': 404, 'message': 'Not found', 'status': 'NOT_FOUND'}})
+
+        def do_POST(self):
+            path = self.path.split('?', 1)[0]
+            stream = path.endswith(':streamGenerateContent')
+            if not (stream or path.endswith(':generateContent')):
+                self._send_json(404, {'error': {'code': 404, 'message': 'Not found', 'status': 'NOT_FOUND'}})
+                return
+
+            length = int(self.headers.get('Content-Length', 0) or 0)
+            try:
+                request = json.loads(self.rfile.read(length) or b'{}')
+                prompt = ''.join(
+                    part.get('text', '')
+                    for content in request.get('contents', [])
+                    for part in content.get('parts', [])
+                )
+            except json.JSONDecodeError:
+                prompt = ''
+
+            with rng_lock:
+                delay = sample_latency(config, rng)
+                failed = rng.random() < config.error_rate
+            time.sleep(delay)
+            stats.record(error=failed, stream=stream)
+
+            if failed:
+                self._send_json(503, {'error': {'code': 503, 'message': 'Mock upstream overloaded', 'status': 'UNAVAILABLE'}})
+                return
+
+            text = fake_text(prompt)
+            if not stream:
+                self._send_json(200, candidate(text))
+                return
+
+            # Streamed responses are a JSON array written element by element
+            chunks = split_chunks(text, config.stream_chunks)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=UTF-8')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.wfile.write(b'[')
+            for i, chunk in enumerate(chunks):
+                if i:
+                    self.wfile.write(b',\r\n')
+                    time.sleep(config.chunk_delay_ms / 1000.0)
+                self.wfile.write(json.dumps(candidate(chunk, finished=i == len(chunks) - 1)).encode('utf-8'))
+                self.wfile.flush()
+            self.wfile.write(b']')
+            self.close_connection = True
+
+    return Handler
+
+
+class MockServer(ThreadingHTTPServer):
+    # The default listen backlog (5) resets connections under async bursts
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+def start_server(config: MockConfig, host: str = '127.0.0.1', port: int = 0):
+    """
+    Start the mock server on a background thread
+
+    Returns:
+        (server, stats); server.server_address holds the bound port
+    """
+    stats = MockStats()
+    server = MockServer((host, port), make_handler(config, stats))
+    thread = threading.Thread(target=server.serve_forever, name='mock-gemini', daemon=True)
+    thread.start()
+    return server, stats
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--latency-ms', type=float, default=500.0, help='Mean upstream latency in ms (default: 500)')
+    parser.add_argument('--latency-dist', choices=['fixed', 'uniform', 'exponential', 'lognormal'], default='fixed',
+                        help='Latency distribution (default: fixed)')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Spread for uniform / std-dev for lognormal (ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of calls failing with 503 (default: 0)')
+    parser.add_argument('--stream-chunks', type=int, default=4, help='Chunks per streamed response (default: 4)')
+    parser.add_argument('--chunk-delay-ms', type=float, default=50.0, help='Delay between streamed chunks (default: 50)')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible runs')
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        stream_chunks=args.stream_chunks,
+        chunk_delay_ms=args.chunk_delay_ms,
+        seed=args.seed,
+    )
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description='Run a local mock of the Gemini generateContent API')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8089, help='Port (default: 8089)')
+    add_mock_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server, _ = start_server(config_from_args(args), args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f'Mock Gemini listening on http://{host}:{port}')
+    print(f'  GEMINI_API_KEY=mock GEMINI_API_ENDPOINT=http://{host}:{port}')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: import time and create_app() time with a budget.
+
+Usage:
+  python -m benchmarks.startup                  # median of 5 fresh interpreters
+  python -m benchmarks.startup --runs 10 --budget-ms 500 --top 20
+
+What it does:
+- Starts fresh interpreters with `python -X importtime` that import app and
+  call create_app() without a Gemini key
+- Reports median import and create_app() wall time plus the slowest modules
+  by cumulative import time
+- Fails (exit 1) when the median exceeds --budget-ms or when a deferred heavy
+  dependency (e.g. google.generativeai) was imported during startup
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_MS = 400.0
+
+# Heavy optional dependencies that must only be imported on first real use
+DEFERRED_MODULES = ('google.generativeai', 'grpc')
+
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app()
+done = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (done - imported) * 1000,
+    'modules': sorted(sys.modules),
+}))
+'''
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    """(module, cumulative microseconds) pairs from -X importtime output"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # header line
+        modules.append((parts[2].strip(), int(parts[1])))
+    return modules
+
+
+def run_once() -> Dict:
+    env = dict(os.environ, GEMINI_API_KEY='', FLASK_DEBUG='False', PYTHONPATH=APP_DIR)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=APP_DIR, env=env, capture_output=True, text=True, check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'Startup probe failed:\n{result.stderr[-2000:]}')
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    probe['importtime'] = parse_importtime(result.stderr)
+    return probe
+
+
+def run(args: argparse.Namespace) -> Dict:
+    probes = [run_once() for _ in range(args.runs)]
+    totals = [p['import_ms'] + p['create_app_ms'] for p in probes]
+
+    # Slowest modules by cumulative import time, median across runs
+    per_module: Dict[str, List[int]] = {}
+    for probe in probes:
+        for name, cumulative in probe['importtime']:
+            per_module.setdefault(name, []).append(cumulative)
+    slowest = sorted(
+        ((name, statistics.median(values) / 1000) for name, values in per_module.items()),
+        key=lambda item: item[1], reverse=True,
+    )[:args.top]
+
+    loaded = set(probes[-1]['modules'])
+    return {
+        'runs': args.runs,
+        'import_ms': round(statistics.median(p['import_ms'] for p in probes), 1),
+        'create_app_ms': round(statistics.median(p['create_app_ms'] for p in probes), 1),
+        'total_ms': round(statistics.median(totals), 1),
+        'budget_ms': args.budget_ms,
+        'deferred_imported': [m for m in DEFERRED_MODULES if m in loaded],
+        'slowest_modules_ms': [[name, round(ms, 1)] for name, ms in slowest],
+    }
+
+
+def failures(report: Dict) -> List[str]:
+    """Why a report breaks the startup budget; empty when it is within it"""
+    problems = []
+    if report['deferred_imported']:
+        problems.append(f"Deferred modules imported at startup: {', '.join(report['deferred_imported'])}")
+    if report['total_ms'] > report['budget_ms']:
+        problems.append(f"Startup {report['total_ms']} ms exceeds budget {report['budget_ms']} ms")
+    return problems
+
+
+def print_report(report: Dict) -> None:
+    print(f"Startup (median of {report['runs']}): import {report['import_ms']} ms + "
+          f"create_app {report['create_app_ms']} ms = {report['total_ms']} ms "
+          f"(budget {report['budget_ms']} ms)")
+    print(f"{'module':<60} {'cumulative ms':>14}")
+    for name, ms in report['slowest_modules_ms']:
+        print(f'{name:<60} {ms:>14.1f}')
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description='Measure cold-start import and create_app() time')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to start (default: 5)')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'Allowed median import + create_app() time (default: {DEFAULT_BUDGET_MS:.0f})')
+    parser.add_argument('--top', type=int, default=15, help='Slowest modules to list (default: 15)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    problems = failures(report)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if not problems:
+        print('Startup within budget')
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
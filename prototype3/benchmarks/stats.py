@@ -0,0 +1,40 @@
+"""
+Latency statistics helpers shared by the benchmark scripts
+"""
+
+import math
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: List[float], wall_time: float) -> Dict[str, float]:
+    """Throughput and latency percentiles (milliseconds) for a list of durations in seconds"""
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        'count': count,
+        'throughput_rps': round(count / wall_time, 2) if wall_time > 0 else 0.0,
+        'mean_ms': round(sum(values) / count * 1000, 2) if count else 0.0,
+        'p50_ms': round(percentile(values, 50) * 1000, 2),
+        'p95_ms': round(percentile(values, 95) * 1000, 2),
+        'p99_ms': round(percentile(values, 99) * 1000, 2),
+        'max_ms': round(values[-1] * 1000, 2) if count else 0.0,
+    }
+
+
+def format_row(name: str, summary: Dict[str, float]) -> str:
+    return (
+        f"{name:<40} {summary['count']:>7} {summary['throughput_rps']:>9.2f} "
+        f"{summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f}"
+    )
+
+
+def format_header() -> str:
+    return f"{'route':<40} {'count':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Fingerprint and pre-compress static files for production.
+
+Usage:
+  Build into static/dist (keeps earlier builds for rolling restarts):
+    python build_assets.py
+
+  Start from an empty static/dist:
+    python build_assets.py --clean
+
+What it does:
+- Copies every file under static/ to static/dist/ with a content hash in its
+  name (sound/correct.mp3 -> dist/sound/correct.<hash>.mp3)
+- Writes .gz (and .br when the optional brotli package is installed) next to
+  text assets when that saves at least 10%
+- Writes static/dist/manifest.json, which asset_url() in templates uses to
+  link the fingerprinted files; they are served with immutable cache headers
+
+Restart the app after a build so workers load the new manifest.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import List
+
+from services import static_assets
+
+DEFAULT_STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description='Fingerprint and pre-compress static assets')
+    parser.add_argument('--static-dir', default=DEFAULT_STATIC_DIR, help='Static folder (default: static/)')
+    parser.add_argument('--clean', action='store_true', help='Remove static/dist before building')
+    args = parser.parse_args(argv)
+
+    try:
+        assets = static_assets.build(args.static_dir, clean=args.clean)
+    except Exception as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+
+    compressed = sum(1 for entry in assets.values() if entry['encodings'])
+    print(f'Built {len(assets)} assets ({compressed} with pre-compressed variants)')
+    if static_assets.brotli is None:
+        print('Note: brotli is not installed - only gzip variants were written')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
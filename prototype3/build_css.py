@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Build the site stylesheet with the Tailwind CLI instead of the browser CDN.
+
+Usage:
+  Build, minify and fingerprint static/css/app.css:
+    python build_css.py
+
+  Rebuild on template changes while developing (no fingerprinting):
+    python build_css.py --watch
+
+What it does:
+- Compiles styles/app.css with Tailwind, emitting only the classes that
+  appear in templates/
+- Writes the minified result to static/css/app.css (committed, so dev and
+  test work offline without the CLI installed)
+- Re-runs the static asset build so asset_url('css/app.css') points at the
+  new fingerprinted, pre-compressed copy
+
+Requires the Tailwind standalone CLI: `pip install tailwindcss-bin`, a
+`tailwindcss` binary on PATH, or TAILWINDCSS_BIN=/path/to/tailwindcss.
+Rebuild after adding classes to templates.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+from typing import List, Optional
+
+from services import static_assets
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INPUT = os.path.join(BASE_DIR, 'styles', 'app.css')
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, 'static', 'css', 'app.css')
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+
+
+def find_tailwind() -> Optional[str]:
+    """Path of the Tailwind CLI, or None if it is not installed"""
+    explicit = os.getenv('TAILWINDCSS_BIN')
+    if explicit:
+        return explicit
+    try:
+        from tailwindcss_bin import find_tailwindcss_bin
+        return find_tailwindcss_bin()
+    except (ImportError, FileNotFoundError):
+        pass
+    return shutil.which('tailwindcss')
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description='Build the purged, minified site stylesheet')
+    parser.add_argument('--input', default=DEFAULT_INPUT, help='Source stylesheet (default: styles/app.css)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Output file (default: static/css/app.css)')
+    parser.add_argument('--watch', action='store_true', help='Rebuild on changes (skips minify and fingerprinting)')
+    args = parser.parse_args(argv)
+
+    tailwind = find_tailwind()
+    if not tailwind:
+        print('Error: Tailwind CLI not found - pip install tailwindcss-bin or set TAILWINDCSS_BIN', file=sys.stderr)
+        return 1
+
+    command = [tailwind, '--input', args.input, '--output', args.output]
+    command.append('--watch' if args.watch else '--minify')
+    try:
+        subprocess.run(command, cwd=BASE_DIR, check=True)
+    except subprocess.CalledProcessError as e:
+        print(f'Error: Tailwind exited with status {e.returncode}', file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 0
+
+    print(f'Wrote {args.output} ({os.path.getsize(args.output)} bytes)')
+    static_assets.build(STATIC_DIR)
+    print('Static assets fingerprinted')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
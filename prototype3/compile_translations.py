@@ -5,6 +5,7 @@ import os
 import sys
 from babel.messages.mofile import write_mo
 from babel.messages.pofile import read_po
+from services import render_cache, translation_bundles
 
 def compile_translations(translations_dir):
     """Compile all .po files to .mo files"""
@@ -31,4 +32,9 @@ def compile_translations(translations_dir):
 if __name__ == '__main__':
     translations_dir = os.path.join(os.path.dirname(__file__), 'translations')
     compile_translations(translations_dir)
+    # Client-side strings: one hashed bundle per locale from static/translations.json
+    translation_bundles.build_bundles(os.path.join(os.path.dirname(__file__), 'static'))
+    print('  ✓ client-side bundles built')
+    # Rendered pages embed translated text; make running workers re-render them
+    render_cache.invalidate()
     print('All translations compiled successfully!')
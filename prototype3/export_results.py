@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Export recorded assessment results for reporting.
+
+Usage:
+  Every result as CSV on stdout:
+    python export_results.py > results.csv
+
+  One domain and quarter as NDJSON, to a file:
+    python export_results.py --format ndjson --domain secure-coding --from 2026-01-01 --to 2026-03-31 -o q1.ndjson
+
+What it does:
+- Reads RESULTS_DB (or --db) oldest result first, in batches along its indexes
+- Writes rows as they are read, so memory stays flat for any export size
+- Uses the same filters and columns as GET /api/exports/results
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import List
+
+from services.question_bank import DIFFICULTIES, DOMAINS
+from services.results_export import FORMATS, parse_filters, stream_rows
+from services.results_store import EXPORT_COLUMNS, ResultsStore, results_db_path
+
+
+def export(db_path: str, output: str, fmt: str, args: dict) -> int:
+    filters = parse_filters(args)
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f'No results database at {db_path}')
+    store = ResultsStore(db_path)
+
+    out = open(output, 'w', encoding='utf-8', newline='') if output != '-' else sys.stdout
+    try:
+        for chunk in stream_rows(fmt, EXPORT_COLUMNS, store.export_rows(*filters)):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if output != '-':
+        print(f'Wrote {fmt} export to: {output}', file=sys.stderr)
+    return 0
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description='Export recorded assessment results as CSV or NDJSON')
+    parser.add_argument('--db', default=results_db_path(), help='Results database (default: RESULTS_DB or results.db)')
+    parser.add_argument('-o', '--output', default='-', help='Output file (default: stdout)')
+    parser.add_argument('--format', choices=sorted(FORMATS), default='csv', help='Output format (default: csv)')
+    parser.add_argument('--domain', choices=DOMAINS, help='Only this domain')
+    parser.add_argument('--difficulty', choices=DIFFICULTIES, help='Only this difficulty')
+    parser.add_argument('--from', dest='from_', metavar='DATE', help='Completed on or after (YYYY-MM-DD or ISO timestamp)')
+    parser.add_argument('--to', metavar='DATE', help='Completed on or before (YYYY-MM-DD or ISO timestamp)')
+
+    args = parser.parse_args(argv)
+    filters = {'domain': args.domain, 'difficulty': args.difficulty, 'from': args.from_, 'to': args.to}
+
+    try:
+        return export(args.db, args.output, args.format, filters)
+    except BrokenPipeError:
+        # Output piped into head or similar
+        sys.stderr.close()
+        return 0
+    except Exception as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
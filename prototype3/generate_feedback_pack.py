@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Pre-generate AI feedback (summary + recommendations) for every results bucket.
+
+Usage:
+  Show what is missing from the pack (no API calls):
+    python generate_feedback_pack.py --dry-run
+
+  Generate / resume the pack (requires GEMINI_API_KEY):
+    python generate_feedback_pack.py
+
+  Start a new pack version from scratch, slower rate, subset of locales:
+    python generate_feedback_pack.py --fresh --rpm 20 --locales en,et
+
+What it does:
+- Walks the grid: locale x domain x difficulty x score bucket
+- Calls Gemini through a rate limiter (requests per minute) with retries
+- Checkpoints the pack atomically, so an interrupted run resumes where it stopped
+- Writes a versioned pack that GeminiService serves before any live call
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, Any, List
+
+from services.feedback_pack import (
+    DEFAULT_BUCKET_SIZE,
+    FeedbackPack,
+    iter_grid,
+    pack_key,
+)
+from services.gemini_service import GeminiService, MODEL_NAME
+
+# Repository-relative defaults
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), 'feedback_pack.json')
+TRANSLATIONS_DIR = os.path.join(os.path.dirname(__file__), 'translations')
+
+
+class RateLimiter:
+    """Spaces out calls to stay under a requests-per-minute budget"""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+
+    def acquire(self, calls: int = 1) -> None:
+        now = time.monotonic()
+        if now < self._next:
+            time.sleep(self._next - now)
+            now = self._next
+        self._next = now + self.interval * calls
+
+
+def available_locales() -> List[str]:
+    """Locales that have a compiled translation catalog"""
+    if not os.path.isdir(TRANSLATIONS_DIR):
+        return ['en']
+    return sorted(
+        d for d in os.listdir(TRANSLATIONS_DIR)
+        if os.path.isdir(os.path.join(TRANSLATIONS_DIR, d, 'LC_MESSAGES'))
+    )
+
+
+def representative_results(locale: str, domain: str, difficulty: str, bucket: int, bucket_size: int) -> Dict[str, Any]:
+    """Results dict standing in for every assessment that falls in this bucket"""
+    upper = min(bucket + bucket_size - 1, 100)
+    return {
+        'locale': locale,
+        'domain': domain,
+        'difficulty': difficulty,
+        'score': min(bucket + bucket_size / 2, 100),
+        'score_range': f'{bucket}-{upper}' if upper > bucket else f'{bucket}',
+    }
+
+
+def generate(output: str, locales: List[str], rpm: float, max_retries: int, checkpoint_every: int,
+             fresh: bool = False, dry_run: bool = False, limit: int = 0) -> int:
+    if fresh or not os.path.exists(output):
+        pack = FeedbackPack(bucket_size=DEFAULT_BUCKET_SIZE)
+    else:
+        pack = FeedbackPack.load(output)
+
+    todo = [
+        cell for cell in iter_grid(locales, pack.bucket_size)
+        if pack_key(*cell) not in pack
+    ]
+    total_cells = len(list(iter_grid(locales, pack.bucket_size)))
+    print(f'Feedback pack {pack.version}: {len(pack)} entries, {len(todo)}/{total_cells} grid cells missing')
+
+    if dry_run:
+        print('  Dry-run (no API calls made).')
+        return 0
+    if not todo:
+        print('  Nothing to do.')
+        return 0
+    if limit:
+        todo = todo[:limit]
+
+    service = GeminiService(feedback_pack=FeedbackPack())
+    if not service.model:
+        print('Error: GEMINI_API_KEY is not configured', file=sys.stderr)
+        return 1
+    pack.model = MODEL_NAME
+
+    limiter = RateLimiter(rpm)
+    generated = 0
+    failed = 0
+    try:
+        for i, cell in enumerate(todo, 1):
+            key = pack_key(*cell)
+            data = representative_results(*cell, bucket_size=pack.bucket_size)
+
+            for attempt in range(max_retries + 1):
+                limiter.acquire(2)  # summary + recommendations
+                try:
+                    pack.set(key, service.generate_pack_entry(data))
+                    generated += 1
+                    print(f'  [{i}/{len(todo)}] {key}')
+                    break
+                except Exception as e:
+                    if attempt == max_retries:
+                        failed += 1
+                        print(f'  [{i}/{len(todo)}] {key} failed: {e}', file=sys.stderr)
+                    else:
+                        time.sleep(min(60, 2 ** attempt * 2))
+
+            if generated and generated % checkpoint_every == 0:
+                pack.save(output)
+    except KeyboardInterrupt:
+        print('\nInterrupted - saving progress')
+    finally:
+        if generated:
+            pack.save(output)
+
+    print('Generation summary:')
+    print(f'  Generated: {generated}')
+    print(f'  Failed (will be retried on next run): {failed}')
+    print(f'  Pack entries: {len(pack)}')
+    print(f'  Wrote pack to: {output}')
+    return 1 if failed else 0
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description='Pre-generate the AI feedback pack served by GeminiService')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Path to the pack file (default: feedback_pack.json)')
+    parser.add_argument('--locales', default='', help='Comma-separated locales (default: every compiled translation)')
+    parser.add_argument('--rpm', type=float, default=30, help='Max Gemini requests per minute (default: 30)')
+    parser.add_argument('--max-retries', type=int, default=3, help='Retries per grid cell (default: 3)')
+    parser.add_argument('--checkpoint', type=int, default=10, help='Save the pack every N generated entries (default: 10)')
+    parser.add_argument('--limit', type=int, default=0, help='Generate at most N entries this run')
+    parser.add_argument('--fresh', action='store_true', help='Start a new pack version instead of resuming')
+    parser.add_argument('--dry-run', action='store_true', help='Only report missing grid cells')
+
+    args = parser.parse_args(argv)
+    locales = [l.strip() for l in args.locales.split(',') if l.strip()] or available_locales()
+
+    try:
+        return generate(
+            args.output,
+            locales,
+            rpm=args.rpm,
+            max_retries=args.max_retries,
+            checkpoint_every=max(1, args.checkpoint),
+            fresh=args.fresh,
+            dry_run=args.dry_run,
+            limit=args.limit,
+        )
+    except Exception as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""
+Gunicorn configuration for CyberHubs AI Assessment Platform
+Usage: gunicorn -c gunicorn.conf.py wsgi:app
+
+The app and the service singletons are built once in the master (preload_app)
+and frozen out of the garbage collector before forking, so workers share
+those pages copy-on-write instead of each holding a private copy.
+"""
+
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', (os.cpu_count() or 1) * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 0))
+preload_app = True
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+
+# No collections in the master while the app is loading: a collection touches
+# object headers and would un-share pages we are about to hand to the workers
+gc.disable()
+
+
+def on_starting(server):
+    # Metric snapshots of an earlier run would be summed into every scrape
+    from services.metrics import REGISTRY
+    REGISTRY.clear_files()
+
+
+def pre_fork(server, worker):
+    # Move everything allocated so far to the permanent generation
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    gc.enable()
+
+
+def post_worker_init(worker):
+    # Workers reset SIGUSR2 to its default (terminate); restore the opt-in profiling signal
+    from services import profiler, warmup
+    if profiler.profiler_token():
+        profiler.install_from_env()
+
+    # Load, compile and prime everything before this worker accepts a connection
+    # (asgi:application wraps the Flask app; its lifespan startup then finds the worker warm)
+    warmup.warm(getattr(worker.wsgi, 'app', worker.wsgi))
+
+
+def child_exit(server, worker):
+    # Keep the exited worker's counts and free its pid's snapshot for a new worker
+    from services.metrics import REGISTRY
+    REGISTRY.archive_process(worker.pid)
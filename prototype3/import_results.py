@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Bulk-import historical assessment results, e.g. when migrating learners from another platform.
+
+Usage:
+  Check a file without writing anything:
+    python import_results.py legacy.csv --dry-run
+
+  Import, then recompute badges of the affected learners on 8 processes:
+    python import_results.py legacy.csv more.ndjson --workers 8
+
+  Also write a claim link per learner (SECRET_KEY must be the app's):
+    python import_results.py legacy.csv --claim-links claims.csv
+
+Input:
+- CSV with a header row, or NDJSON (.ndjson/.jsonl), one result per row
+- Fields: learner_id plus the session history fields date, domain,
+  difficulty, score and performance_level (as /dashboard/history/export writes);
+  performance_level may be left empty and must otherwise match the score
+
+What it does:
+- Validates every record; invalid ones are reported with their line and skipped
+- Reports records identical to an earlier one in the same import as duplicates and skips them
+- Writes valid records to RESULTS_DB (or --db) in large transactions
+- Skips records imported before, so an interrupted import can simply be re-run
+- Replays each affected learner's full history through the badge rules in a process pool
+- With --claim-links, writes learner_id,claim_path rows: opening the path signs
+  the learner's browser session in as that learner_id, so their imported history
+  and badges show on the dashboard. Without a claim, imported results only feed
+  the leaderboards and cohort analytics.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+import time
+from typing import Dict, List, Set
+
+from services.results_import import claim_token, read_records, recompute_badges, validate_record
+from services.results_store import ResultsStore, results_db_path
+
+# Invalid records printed in full; the rest are only counted
+MAX_REPORTED = 20
+
+
+def valid_records(paths: List[str], fmt: str | None, counts: Dict[str, int], learners: Set[str]):
+    """
+    Validated records of every file; counts read, invalid and duplicate records
+    and collects the learner ids as it goes
+
+    Import ids are derived from the record's content, so a record identical to
+    an earlier one of this import would be taken for one imported before.
+    """
+    seen = set()
+    for path in paths:
+        for line_number, record in read_records(path, fmt):
+            counts['read'] += 1
+            try:
+                row = validate_record(record)
+            except ValueError as e:
+                counts['invalid'] += 1
+                if counts['invalid'] <= MAX_REPORTED:
+                    print(f'  {path}:{line_number}: {e}', file=sys.stderr)
+                continue
+            if row[1] in seen:
+                counts['duplicate'] += 1
+                if counts['duplicate'] <= MAX_REPORTED:
+                    print(f'  {path}:{line_number}: duplicate of an earlier record of this import', file=sys.stderr)
+                continue
+            seen.add(row[1])
+            learners.add(row[0])
+            yield row
+
+
+def write_claim_links(path: str, learners: Set[str], secret_key: str) -> None:
+    """learner_id,claim_path rows; each path lets that learner take over their imported history"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(('learner_id', 'claim_path'))
+        for learner in sorted(learners):
+            writer.writerow((learner, f'/dashboard/claim/{claim_token(secret_key, learner)}'))
+
+
+def run_import(paths: List[str], db_path: str, fmt: str | None, batch_size: int, workers: int | None,
+               dry_run: bool, claim_links: str | None = None) -> int:
+    counts = {'read': 0, 'invalid': 0, 'duplicate': 0}
+    learners_seen: Set[str] = set()
+    start = time.perf_counter()
+
+    if dry_run:
+        for _ in valid_records(paths, fmt, counts, learners_seen):
+            pass
+        print(f'Read: {counts["read"]}, invalid: {counts["invalid"]}, duplicate: {counts["duplicate"]} '
+              '(dry run, nothing written)')
+        return 1 if counts['invalid'] else 0
+
+    store = ResultsStore(db_path)
+    first_new_id = store.last_result_id()
+    inserted = store.import_results(valid_records(paths, fmt, counts, learners_seen), batch_size=batch_size)
+    learners = store.learners_after(first_new_id) if inserted else []
+    imported = time.perf_counter()
+    already_imported = counts['read'] - counts['invalid'] - counts['duplicate'] - inserted
+    print(f'Read: {counts["read"]}, invalid: {counts["invalid"]}, duplicate: {counts["duplicate"]}, '
+          f'inserted: {inserted}, already imported: {already_imported} '
+          f'({imported - start:.1f}s)')
+
+    awarded = recompute_badges(store, learners, workers=workers)
+    print(f'Badges recomputed for {len(learners)} learners: {awarded} newly awarded '
+          f'({time.perf_counter() - imported:.1f}s)')
+
+    if claim_links:
+        write_claim_links(claim_links, learners_seen, os.environ['SECRET_KEY'])
+        print(f'Claim links for {len(learners_seen)} learners written to {claim_links}')
+    return 1 if counts['invalid'] else 0
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description='Bulk-import historical assessment results')
+    parser.add_argument('files', nargs='+', help='CSV or NDJSON files of results')
+    parser.add_argument('--db', default=results_db_path(), help='Results database (default: RESULTS_DB or results.db)')
+    parser.add_argument('--format', choices=('csv', 'ndjson'), help='Input format (default: from the file extension)')
+    parser.add_argument('--batch-size', type=int, default=50000, help='Records per transaction (default: 50000)')
+    parser.add_argument('--workers', type=int, help='Badge recomputation processes (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true', help='Only validate the files')
+    parser.add_argument('--claim-links', metavar='CSV',
+                        help='Write a claim link per learner of the files (signed with SECRET_KEY)')
+
+    args = parser.parse_args(argv)
+    if args.claim_links and not os.getenv('SECRET_KEY'):
+        parser.error('--claim-links needs the SECRET_KEY the app runs with')
+
+    try:
+        return run_import(
+            args.files,
+            args.db,
+            args.format,
+            batch_size=max(1, args.batch_size),
+            workers=args.workers,
+            dry_run=args.dry_run,
+            claim_links=args.claim_links,
+        )
+    except Exception as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -28,27 +28,20 @@ import os
 import re
 import sys
 from datetime import datetime
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List
+
+from services.question_validation import (
+    build_existing_index,
+    norm_text,
+    normalize_to_category,
+    validate_question,
+)
 
 # Repository-relative defaults
 DEFAULT_SOURCE = os.path.join(os.path.dirname(__file__), 'tobeAddedQuestions.json')
 DEFAULT_TARGET = os.path.join(os.path.dirname(__file__), 'questions.json')
 
 
-REQUIRED_FIELDS = {
-    'title': str,
-    'context': str,
-    'question': str,
-    'options': list,
-    'correct': int,
-    'explanation': str,
-    'learningPoints': list,
-    'sources': list,
-    'difficulty': str,
-    'domain': str,
-}
-
-
 def _strip_json_comments_and_trailing_commas(text: str) -> str:
     """Allow JSON with // and /* */ comments and trailing commas."""
     # Remove /* block comments */
@@ -96,77 +89,10 @@ def backup_file(path: str) -> str:
     return backup_path
 
 
-def norm_text(s: str) -> str:
-    return ' '.join((s or '').strip().lower().split())
-
-
 def category_key(domain: str, difficulty: str) -> str:
     return f"{domain.strip()}_{difficulty.strip()}"
 
 
-def validate_question(q: Dict[str, Any]) -> List[str]:
-    errors: List[str] = []
-
-    # Required fields and types
-    for field, tp in REQUIRED_FIELDS.items():
-        if field not in q:
-            errors.append(f"Missing required field '{field}'")
-            continue
-        if not isinstance(q[field], tp):
-            errors.append(f"Field '{field}' must be of type {tp.__name__}")
-
-    if errors:
-        return errors
-
-    # Options sanity
-    options = q['options']
-    if len(options) < 2:
-        errors.append('Options must contain at least 2 choices')
-    if len(options) > 8:
-        errors.append('Options must not exceed 8 choices')
-    # Typical convention is 4 options; warn if not 4
-    if len(options) != 4:
-        errors.append(f"Info: Non-standard option count ({len(options)}). Expected 4.")
-
-    # Correct index bounds
-    correct = q['correct']
-    if not (0 <= correct < len(options)):
-        errors.append(f"Correct index {correct} out of bounds for options length {len(options)}")
-
-    # Strings not empty (basic sanity)
-    for sf in ['title', 'context', 'question', 'explanation', 'difficulty', 'domain']:
-        if not str(q[sf]).strip():
-            errors.append(f"Field '{sf}' must not be empty")
-
-    # Lists content type checks (optional but helpful)
-    if not all(isinstance(o, str) for o in options):
-        errors.append('All options must be strings')
-    if not all(isinstance(lp, str) for lp in q['learningPoints']):
-        errors.append('All learningPoints must be strings')
-    if not all(isinstance(src, str) for src in q['sources']):
-        errors.append('All sources must be strings')
-
-    return errors
-
-
-def build_existing_index(existing: Dict[str, Any]) -> Dict[Tuple[str, str, str, str], bool]:
-    idx: Dict[Tuple[str, str, str, str], bool] = {}
-    questions = existing.get('questions', {})
-    for key, arr in questions.items():
-        if not isinstance(arr, list):
-            continue
-        try:
-            domain, difficulty = key.rsplit('_', 1)
-        except ValueError:
-            # Skip malformed keys
-            continue
-        for q in arr:
-            title = norm_text(q.get('title', ''))
-            qtext = norm_text(q.get('question', ''))
-            idx[(domain, difficulty, title, qtext)] = True
-    return idx
-
-
 def ensure_category(existing: Dict[str, Any], key: str) -> None:
     if 'questions' not in existing or not isinstance(existing['questions'], dict):
         existing['questions'] = {}
@@ -174,24 +100,6 @@ def ensure_category(existing: Dict[str, Any], key: str) -> None:
         existing['questions'][key] = []
 
 
-def normalize_to_category(q: Dict[str, Any], cat_domain: str, cat_diff: str) -> Dict[str, Any]:
-    q = dict(q)  # shallow copy
-    # Normalize whitespace in strings
-    for f in ['title', 'context', 'question', 'explanation', 'difficulty', 'domain']:
-        if f in q and isinstance(q[f], str):
-            q[f] = q[f].strip()
-    # Trim options strings
-    if 'options' in q and isinstance(q['options'], list):
-        q['options'] = [str(o).strip() for o in q['options']]
-    # Force domain/difficulty to match the category
-    q['domain'] = cat_domain
-    q['difficulty'] = cat_diff
-    # Remove any runtime-only fields if present (e.g., id, timestamp)
-    q.pop('id', None)
-    q.pop('timestamp', None)
-    return q
-
-
 def merge(source_path: str, target_path: str, apply: bool = False) -> int:
     # Load files
     new_data = load_json(source_path)
@@ -6,10 +6,16 @@ from .home import home_bp
 from .assessment import assessment_bp
 from .dashboard import dashboard_bp
 from .api import api_bp
+from .assessments_api import assessments_api_bp
+from .analytics import analytics_bp
+from .exports import exports_bp
 
 __all__ = [
     'home_bp',
     'assessment_bp',
     'dashboard_bp',
     'api_bp',
+    'assessments_api_bp',
+    'analytics_bp',
+    'exports_bp',
 ]
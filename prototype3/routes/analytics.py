@@ -0,0 +1,96 @@
+"""
+Analytics Route Module
+Cohort-wide views for instructors: score distributions, question difficulty and progress curves
+
+Requires ANALYTICS_TOKEN, sent by clients in the X-Analytics-Token header.
+"""
+
+import logging
+from flask import Blueprint, jsonify, request, session
+from services import cohort_analytics
+from services.question_bank import DOMAINS
+
+logger = logging.getLogger(__name__)
+
+analytics_bp = Blueprint('analytics', __name__)
+
+TOKEN_HEADER = 'X-Analytics-Token'
+
+
+def _error(message, status):
+    return jsonify({'success': False, 'error': message}), status
+
+
+@analytics_bp.before_request
+def require_token():
+    if not cohort_analytics.analytics_token():
+        return _error('Not found', 404)
+    if not cohort_analytics.is_authorized(request.headers.get(TOKEN_HEADER)):
+        return _error('Forbidden', 403)
+    if not cohort_analytics.analytics_available():
+        return _error('Cohort analytics require numpy', 503)
+    return None
+
+
+@analytics_bp.after_request
+def skip_session(response):
+    """Token-authenticated scripts get no server-side session"""
+    session.clear()
+    session.modified = False
+    return response
+
+
+def _int_arg(name, default, low, high):
+    """Query argument clamped to [low, high], or None if it is not an integer"""
+    try:
+        return max(low, min(int(request.args.get(name, default)), high))
+    except ValueError:
+        return None
+
+
+def _respond(data):
+    """JSON with an ETag on the data version, so unchanged aggregates cost pollers a 304"""
+    response = jsonify({'success': True, **data})
+    response.set_etag(f'{data["as_of_result"]}')
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+
+@analytics_bp.route('/overview', methods=['GET'])
+def overview():
+    """Learners, results, answers and distinct questions recorded"""
+    return _respond(cohort_analytics.get_cohort_analytics().overview())
+
+
+@analytics_bp.route('/scores', methods=['GET'])
+def scores():
+    """Score histogram (?bins=10) and percentiles, overall and per domain"""
+    bins = _int_arg('bins', 10, 1, 100)
+    if bins is None:
+        return _error('bins must be an integer', 400)
+    return _respond(cohort_analytics.get_cohort_analytics().score_distributions(bins))
+
+
+@analytics_bp.route('/questions', methods=['GET'])
+def questions():
+    """Hardest questions first; ?domain=, ?min_attempts=5, ?limit=50"""
+    domain = request.args.get('domain') or None
+    if domain is not None and domain not in DOMAINS:
+        return _error('Unknown domain', 400)
+    min_attempts = _int_arg('min_attempts', 5, 1, 1000000)
+    limit = _int_arg('limit', 50, 1, 1000)
+    if min_attempts is None or limit is None:
+        return _error('min_attempts and limit must be integers', 400)
+    return _respond(cohort_analytics.get_cohort_analytics().question_difficulty(domain, min_attempts, limit))
+
+
+@analytics_bp.route('/progress', methods=['GET'])
+def progress():
+    """Scores of learners' 1st..Nth assessment; ?domain=, ?max_attempts=20"""
+    domain = request.args.get('domain') or None
+    if domain is not None and domain not in DOMAINS:
+        return _error('Unknown domain', 400)
+    max_attempts = _int_arg('max_attempts', 20, 1, 100)
+    if max_attempts is None:
+        return _error('max_attempts must be an integer', 400)
+    return _respond(cohort_analytics.get_cohort_analytics().progress_curves(domain, max_attempts))
@@ -3,9 +3,22 @@ API Route Module
 Handles JSON API endpoints
 """
 
+import json
 import logging
-from flask import Blueprint, jsonify, request, session
-from services import get_gemini_service, get_assessment_service
+import os
+from flask import Blueprint, Response, current_app, jsonify, request, session, url_for
+from flask_babel import get_locale
+from services import (
+    get_gemini_service,
+    get_assessment_service,
+    get_question_generator,
+    get_leaderboard,
+    render_prometheus,
+    PROMETHEUS_CONTENT_TYPE,
+)
+from services import profiler, translation_bundles, warmup
+from services.leaderboard import METRICS, OVERALL, SCOPES
+from services.question_generator import GeneratorBusy
 
 logger = logging.getLogger(__name__)
 
@@ -20,33 +33,108 @@ def health():
         'service': 'CyberHubs AI Assessment'
     })
 
+@api_bp.route('/ready', methods=['GET'])
+def ready():
+    """
+    Readiness probe: 200 once this worker is warmed up and its dependencies
+    respond, else 503; /health only says the process is alive
+    """
+    report = warmup.readiness(current_app)
+    if not report['ready']:
+        logger.warning(f'Readiness check failed: {report}')
+    return jsonify(report), 200 if report['ready'] else 503
+
+@api_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(render_prometheus(), mimetype=PROMETHEUS_CONTENT_TYPE)
+
+@api_bp.route('/profile', methods=['GET'])
+def profile():
+    """
+    Sample this worker's stacks for ?seconds=N (default 10) and return
+    collapsed stacks tagged with route names. Requires X-Profiler-Token.
+    """
+    if not profiler.profiler_token():
+        return jsonify({'success': False, 'error': 'Not found'}), 404
+    if not profiler.is_authorized(request.headers.get('X-Profiler-Token')):
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    
+    try:
+        seconds = float(request.args.get('seconds', 10))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'seconds must be a number'}), 400
+    
+    logger.info(f'Sampling profile requested for {seconds}s')
+    content = profiler.sample_stacks(seconds)
+    if content is None:
+        return jsonify({'success': False, 'error': 'A profile is already running in this worker'}), 409
+    
+    return Response(
+        content,
+        mimetype='text/plain',
+        headers={'Content-Disposition': f'attachment; filename=profile-{os.getpid()}.folded'}
+    )
+
 @api_bp.route('/generate-question', methods=['POST'])
 def generate_question():
-    """API endpoint to generate a question"""
+    """
+    API endpoint to get an AI-generated question
+    
+    Returns a pre-generated question immediately when one is buffered,
+    otherwise a job id to poll (202), or 429 while this worker already has
+    QUESTION_MAX_PENDING_JOBS jobs queued. Generation never runs in the request.
+    """
     logger.info('Question generation API called')
     
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         domain = data.get('domain', 'network-security')
         difficulty = data.get('difficulty', 'beginner')
         
-        logger.debug(f'Generating question via API - Domain: {domain}, Difficulty: {difficulty}')
+        logger.debug(f'Requesting generated question via API - Domain: {domain}, Difficulty: {difficulty}')
+        
+        generator = get_question_generator()
+        if not generator.enabled:
+            logger.warning('Question generation requested but Gemini is not configured')
+            return jsonify({
+                'success': False,
+                'error': 'AI question generation is not configured'
+            }), 503
         
-        gemini_service = get_gemini_service()
-        question = gemini_service.generate_question(domain, difficulty)
+        if not generator.has_category(domain, difficulty):
+            logger.warning(f'Question generation requested for unknown category: {domain}_{difficulty}')
+            return jsonify({
+                'success': False,
+                'error': 'Unknown domain or difficulty'
+            }), 400
+        
+        try:
+            question, job_id = generator.request_question(domain, difficulty)
+        except GeneratorBusy as e:
+            logger.warning(f'Question generation refused: {e}')
+            response = jsonify({
+                'success': False,
+                'error': 'Too many questions are being generated, try again shortly'
+            })
+            response.headers['Retry-After'] = '5'
+            return response, 429
         
         if question:
-            logger.info('Question generated successfully via API')
+            logger.info('Buffered question served via API')
             return jsonify({
                 'success': True,
+                'status': 'done',
                 'question': question
             })
-        else:
-            logger.warning('Failed to generate question via API')
-            return jsonify({
-                'success': False,
-                'error': 'Failed to generate question'
-            }), 500
+        
+        logger.info(f'Question generation job queued: {job_id}')
+        return jsonify({
+            'success': True,
+            'status': 'pending',
+            'job_id': job_id,
+            'poll_url': url_for('api.generate_question_job', job_id=job_id)
+        }), 202
     
     except Exception as e:
         logger.exception(f'Error in generate_question API: {str(e)}')
@@ -55,6 +143,105 @@ def generate_question():
             'error': str(e)
         }), 500
 
+@api_bp.route('/generate-question/<job_id>', methods=['GET'])
+def generate_question_job(job_id):
+    """Poll a question generation job"""
+    job = get_question_generator().get_job(job_id)
+    
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    response = {
+        'success': job['status'] != 'failed',
+        'status': job['status'],
+        'job_id': job_id
+    }
+    if job['question']:
+        response['question'] = job['question']
+    if job['error']:
+        response['error'] = job['error']
+    return jsonify(response)
+
+def _sse_event(event, data):
+    """Format a single server-sent event"""
+    return f'event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+
+def _summary_results(assessment_id):
+    """Results of the session's assessment for the summary stream, or an error response"""
+    assessment = session.get('current_assessment')
+    if not assessment or assessment.get('id') != assessment_id:
+        logger.warning(f'Summary stream for unknown assessment: {assessment_id}')
+        return None, (jsonify({
+            'success': False,
+            'error': 'Assessment not found'
+        }), 404)
+    
+    results_data = get_assessment_service().calculate_results(assessment)
+    if 'error' in results_data:
+        return None, (jsonify({
+            'success': False,
+            'error': results_data['error']
+        }), 400)
+    results_data['locale'] = str(get_locale() or 'en')
+    return results_data, None
+
+def _sse_response(events):
+    return Response(
+        events,
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        }
+    )
+
+@api_bp.route('/results/<assessment_id>/summary/stream', methods=['GET'])
+def stream_summary(assessment_id):
+    """
+    Stream the AI feedback of a completed assessment as server-sent events
+    
+    'chunk' events carry the summary text as it is generated, then one
+    'recommendations' event carries the learning recommendations.
+    """
+    logger.info(f'Summary stream requested for assessment {assessment_id}')
+    
+    results_data, error = _summary_results(assessment_id)
+    if error:
+        return error
+    
+    gemini_service = get_gemini_service()
+    
+    def generate():
+        for chunk in gemini_service.stream_assessment_summary(results_data):
+            yield _sse_event('chunk', {'text': chunk})
+        recommendations = gemini_service.generate_recommendations(results_data) or []
+        yield _sse_event('recommendations', {'items': recommendations})
+        yield _sse_event('done', {})
+    
+    return _sse_response(generate())
+
+async def stream_summary_async(assessment_id):
+    """stream_summary() for the ASGI entry point: no thread is held while the model generates"""
+    logger.info(f'Summary stream requested for assessment {assessment_id}')
+    
+    results_data, error = _summary_results(assessment_id)
+    if error:
+        return error
+    
+    gemini_service = get_gemini_service()
+    
+    async def generate():
+        async for chunk in gemini_service.stream_assessment_summary_async(results_data):
+            yield _sse_event('chunk', {'text': chunk})
+        recommendations = await gemini_service.generate_recommendations_async(results_data) or []
+        yield _sse_event('recommendations', {'items': recommendations})
+        yield _sse_event('done', {})
+    
+    return _sse_response(generate())
+
 @api_bp.route('/stats', methods=['GET'])
 def get_stats():
     """Get user statistics"""
@@ -81,6 +268,33 @@ def get_stats():
             'error': str(e)
         }), 500
 
+@api_bp.route('/leaderboard', methods=['GET'])
+def leaderboard():
+    """
+    Leaders of ?scope= (overall or a domain) by ?metric= (best or average),
+    ?limit= (default 10) from ?offset=, plus the caller's own standing
+    """
+    scope = request.args.get('scope', OVERALL)
+    metric = request.args.get('metric', 'best')
+    if scope not in SCOPES or metric not in METRICS:
+        return jsonify({'success': False, 'error': 'Unknown scope or metric'}), 400
+    try:
+        limit = max(1, min(int(request.args.get('limit', 10)), 100))
+        offset = max(0, int(request.args.get('offset', 0)))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'limit and offset must be integers'}), 400
+    
+    board = get_leaderboard()
+    learner_id = session.get('learner_id')
+    return jsonify({
+        'success': True,
+        'scope': scope,
+        'metric': metric,
+        'ranked': board.size(scope, metric),
+        'leaders': board.top(scope, metric, limit, offset, viewer=learner_id),
+        'me': board.standing(learner_id, scope, metric) if learner_id else None,
+    })
+
 @api_bp.route('/clear-session', methods=['POST'])
 def clear_session():
     """Clear user session (for testing/debugging)"""
@@ -116,7 +330,8 @@ def set_language(language):
             return jsonify({
                 'success': True,
                 'message': f'Language set to {SUPPORTED_LANGUAGES[language]}',
-                'language': language
+                'language': language,
+                'bundle_url': translation_bundles.bundle_url(language)
             })
         else:
             logger.warning(f'Unsupported language requested: {language}')
@@ -132,6 +347,17 @@ def set_language(language):
             'error': str(e)
         }), 500
 
+@api_bp.route('/translations/<language>', methods=['GET'])
+def translations(language):
+    """Client-side strings for one locale when no bundles have been built"""
+    from app import SUPPORTED_LANGUAGES
+    
+    if language not in SUPPORTED_LANGUAGES:
+        return jsonify({'success': False, 'error': 'Unsupported language'}), 404
+    
+    strings = translation_bundles.load_strings(current_app.static_folder, language)
+    return jsonify(strings or translation_bundles.load_strings(current_app.static_folder, 'en'))
+
 @api_bp.errorhandler(404)
 def api_not_found(error):
     """API 404 handler"""
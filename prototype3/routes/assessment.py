@@ -5,29 +5,24 @@ Handles assessment creation, questions, and submissions
 
 import logging
 import time
+import uuid
 from flask import Blueprint, render_template, request, session, redirect, url_for, current_app
+from flask_babel import get_locale
 from services import (
-    get_gemini_service,
     get_assessment_service,
-    QuestionBank,
+    get_question_bank,
+    get_results_store,
+    get_leaderboard,
     evaluate_badges,
+    render_cached,
     BADGE_DEFS,
 )
+from services.question_bank import DOMAINS
 
 logger = logging.getLogger(__name__)
 
 assessment_bp = Blueprint('assessment', __name__)
 
-# Global question bank instance
-_question_bank = None
-
-def get_question_bank():
-    """Get or create the global question bank instance"""
-    global _question_bank
-    if _question_bank is None:
-        _question_bank = QuestionBank()
-    return _question_bank
-
 @assessment_bp.route('/start', methods=['GET', 'POST'])
 def start():
     """Start a new assessment"""
@@ -40,11 +35,13 @@ def start():
         if domain:
             # Domain selected from home page - show quick start confirmation
             logger.debug(f'Domain pre-selected: {domain}')
+            if domain in DOMAINS:
+                return render_cached('assessment/start.html', cache_inputs=domain, selected_domain=domain)
             return render_template('assessment/start.html', selected_domain=domain)
         else:
             # No domain - show full selection page
             logger.debug('Showing domain selection')
-            return render_template('assessment/start.html')
+            return render_cached('assessment/start.html')
     
     # Handle POST - create new assessment
     try:
@@ -84,7 +81,7 @@ def question():
     assessment = session['current_assessment']
     current_question_index = assessment['current_question']
     
-    logger.debug(f'Current question index: {current_question_index}')
+    logger.debug('Current question index: %s', current_question_index)
     
     # Handle answer submission
     if request.method == 'POST':
@@ -127,7 +124,7 @@ def generate_next_question(assessment):
         assessment_service = get_assessment_service()
         
         # Get question from hardcoded bank
-        logger.debug(f'Retrieving question - Domain: {assessment["domain"]}, Difficulty: {assessment["difficulty"]}')
+        logger.debug('Retrieving question - Domain: %s, Difficulty: %s', assessment['domain'], assessment['difficulty'])
         question = question_bank.get_question(
             domain=assessment['domain'],
             difficulty=assessment['difficulty']
@@ -172,7 +169,7 @@ def handle_answer_submission(assessment):
             time_taken = 0
             logger.warning('No start time found for question')
         
-        logger.debug(f'Answer: {answer_index}, Time taken: {time_taken}s, Question ID: {question_id}')
+        logger.debug('Answer: %s, Time taken: %ss, Question ID: %s', answer_index, time_taken, question_id)
         
         # Submit answer
         assessment_service = get_assessment_service()
@@ -227,7 +224,7 @@ def handle_answer_submission(assessment):
 
 @assessment_bp.route('/results')
 def results():
-    """Display assessment results with AI-generated summary and recommendations"""
+    """Display assessment results; the AI summary and recommendations are streamed in by the page"""
     logger.info('Results page accessed')
     
     # Check if assessment exists
@@ -237,64 +234,70 @@ def results():
     
     try:
         assessment = session['current_assessment']
-        assessment_service = get_assessment_service()
-        
-        # Calculate results
-        logger.info(f'Calculating results for assessment {assessment["id"]}')
-        results_data = assessment_service.calculate_results(assessment)
-        
-        # Get performance level
-        performance_level = assessment_service.get_performance_level(results_data['score'])
-        results_data['performance_level'] = performance_level
-        
-        # Get recommendation
-        recommendation = assessment_service.get_recommended_difficulty(
-            results_data['score'],
-            assessment['difficulty']
-        )
-        results_data['recommended_difficulty'] = recommendation
-        
-        logger.info(f'Results calculated - Score: {results_data["score"]}%, Level: {performance_level}')
-        
-        # Generate AI summary and recommendations
-        logger.info('Generating AI-powered summary and recommendations')
-        gemini_service = get_gemini_service()
-        
-        # Generate summary
-        summary = gemini_service.generate_assessment_summary(results_data)
-        if summary:
-            results_data['ai_summary'] = summary
-            logger.info('✅ AI summary generated')
-        else:
-            logger.warning('AI summary generation failed - using fallback')
-            results_data['ai_summary'] = None
-        
-        # Generate recommendations
-        recommendations = gemini_service.generate_recommendations(results_data)
-        if recommendations:
-            results_data['ai_recommendations'] = recommendations
-            logger.info(f'✅ Generated {len(recommendations)} AI recommendations')
-        else:
-            logger.warning('AI recommendations generation failed - using fallback')
-            results_data['ai_recommendations'] = []
-
-        # Update user stats and evaluate badges
-        newly_earned = update_user_stats(results_data)
-        # Map newly earned ids to badge definitions for display
-        badge_map = {b['id']: b for b in BADGE_DEFS}
-        newly_badges = [badge_map[b] for b in newly_earned if b in badge_map]
-
-        return render_template(
-            'assessment/results.html',
-            results=results_data,
-            assessment=assessment,
-            newly_badges=newly_badges,
-        )
+        results_data = prepare_results(assessment)
+        return render_results(assessment, results_data)
     
     except Exception as e:
         logger.exception(f'Error displaying results: {str(e)}')
         return render_template('errors/500.html'), 500
 
+def prepare_results(assessment):
+    """Score, performance level and recommended difficulty for the results page"""
+    assessment_service = get_assessment_service()
+    
+    # Calculate results
+    logger.info(f'Calculating results for assessment {assessment["id"]}')
+    results_data = assessment_service.calculate_results(assessment)
+    results_data['locale'] = str(get_locale() or 'en')
+    
+    # Get performance level
+    performance_level = assessment_service.get_performance_level(results_data['score'])
+    results_data['performance_level'] = performance_level
+    
+    # Get recommendation
+    recommendation = assessment_service.get_recommended_difficulty(
+        results_data['score'],
+        assessment['difficulty']
+    )
+    results_data['recommended_difficulty'] = recommendation
+    
+    logger.info(f'Results calculated - Score: {results_data["score"]}%, Level: {performance_level}')
+    
+    # The AI summary and recommendations are streamed by the page from the SSE
+    # endpoint so the numbers render without waiting on the LLM
+    results_data['ai_summary_stream_url'] = url_for(
+        'api.stream_summary',
+        assessment_id=assessment['id']
+    )
+    return results_data
+
+def render_results(assessment, results_data):
+    """Record the results in the user's stats and render the results page"""
+    # Update user stats and evaluate badges
+    newly_earned = update_user_stats(results_data)
+    record_result(assessment, results_data)
+    # Map newly earned ids to badge definitions for display
+    badge_map = {b['id']: b for b in BADGE_DEFS}
+    newly_badges = [badge_map[b] for b in newly_earned if b in badge_map]
+
+    return render_template(
+        'assessment/results.html',
+        results=results_data,
+        assessment=assessment,
+        newly_badges=newly_badges,
+    )
+
+def record_result(assessment, results_data):
+    """Add the result to the cohort-wide results store under the session's anonymous learner id"""
+    try:
+        learner_id = session.setdefault('learner_id', uuid.uuid4().hex)
+        # Reloading the results page records nothing new: results are keyed by assessment id
+        if get_results_store().record(learner_id, results_data, assessment) is not None:
+            # This worker's boards show the new result at once; others pick it up on their next refresh
+            get_leaderboard().refresh(force=True)
+    except Exception as e:
+        logger.exception(f'Error recording result: {str(e)}')
+
 def update_user_stats(results_data):
     """Update user statistics in session"""
     logger.debug('Updating user stats')
@@ -337,12 +340,12 @@ def update_user_stats(results_data):
             for b in newly_earned:
                 if b not in existing:
                     user_stats['badges'].append(b)
-            logger.info(f"Badges awarded: {', '.join(newly_earned)}")
+            logger.info('Badges awarded: %s', newly_earned)
 
         # Update session
         session['user_stats'] = user_stats
 
-        logger.debug(f'User stats updated: {user_stats}')
+        logger.debug('User stats updated: %s', user_stats)
         # Return newly earned badges to show on results page
         return newly_earned
 
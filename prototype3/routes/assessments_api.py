@@ -0,0 +1,395 @@
+"""
+Assessments API Route Module
+Session-free JSON assessment flow for mobile clients: create, questions, answers, results
+
+State lives in the shared assessment store, or with ASSESSMENT_STATE=token in
+a signed token the client sends back in the X-Assessment-Token header.
+"""
+
+import json
+import logging
+import time
+from flask import Blueprint, jsonify, request, session, url_for
+from services import (
+    get_assessment_service,
+    get_assessment_store,
+    get_question_bank,
+)
+from services import assessment_tokens
+from services.assessment_store import AssessmentConflict
+from services.assessment_tokens import InvalidAssessmentToken, get_replay_guard, get_token_codec
+from services.question_bank import DOMAINS
+
+logger = logging.getLogger(__name__)
+
+assessments_api_bp = Blueprint('assessments_api', __name__)
+
+MAX_QUESTIONS = 50
+
+# Upper bound on client-reported answer times in batch submissions
+MAX_ANSWER_SECONDS = 3600
+
+# Fields of a stored question a client needs to display it (never the answer key)
+QUESTION_FIELDS = ('title', 'context', 'question', 'options', 'difficulty')
+
+
+@assessments_api_bp.after_request
+def skip_session(response):
+    """
+    Keep API calls out of the server-side session
+
+    Flask-Session would otherwise write a session file and set a cookie for
+    every cookieless mobile call.
+    """
+    session.clear()
+    session.modified = False
+    return response
+
+
+def _error(message, status):
+    return jsonify({'success': False, 'error': message}), status
+
+
+def _json_object():
+    """The request's JSON body ({} without one), or None when it is not a JSON object"""
+    data = request.get_json(silent=True)
+    if data is None:
+        return {}
+    return data if isinstance(data, dict) else None
+
+
+@assessments_api_bp.errorhandler(InvalidAssessmentToken)
+def invalid_token(error):
+    logger.warning('Rejected assessment token: %s', error)
+    return _error(str(error), 403)
+
+
+@assessments_api_bp.errorhandler(AssessmentConflict)
+def assessment_conflict(error):
+    logger.warning('Concurrent assessment update rejected: %s', error)
+    return _error('Assessment was changed by another request; load it again and retry', 409)
+
+
+def _load(assessment_id):
+    """The assessment from the store or the request's token; None if not found"""
+    if assessment_tokens.tokens_enabled():
+        token = request.headers.get(assessment_tokens.TOKEN_HEADER)
+        if not token:
+            raise InvalidAssessmentToken(f'Missing {assessment_tokens.TOKEN_HEADER} header')
+        assessment = get_token_codec().loads(token)
+        if assessment['id'] != assessment_id:
+            raise InvalidAssessmentToken('Token belongs to a different assessment')
+        return assessment
+
+    assessment = get_assessment_store().get(assessment_id)
+    if assessment is None:
+        logger.warning('API assessment not found: %s', assessment_id)
+    return assessment
+
+
+def _save(assessment, payload, changed=True):
+    """Persist the assessment, or in token mode hand the client its new token"""
+    if assessment_tokens.tokens_enabled():
+        payload['token'] = get_token_codec().dumps(assessment)
+    elif changed:
+        get_assessment_store().save(assessment)
+    return payload
+
+
+def _progress(assessment):
+    return {
+        'answered': assessment['current_question'],
+        'total': assessment['total_questions'],
+        'difficulty': assessment['difficulty'],
+        'completed': assessment['current_question'] >= assessment['total_questions'],
+    }
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _question_payload(question, number):
+    payload = {'id': question['id'], 'number': number}
+    payload.update((field, question.get(field)) for field in QUESTION_FIELDS)
+    return payload
+
+
+@assessments_api_bp.route('', methods=['POST'])
+def create():
+    """Create an adaptive assessment; body: {"domain": ..., "num_questions": 10}"""
+    data = _json_object()
+    if data is None:
+        return _error('Request body must be a JSON object', 400)
+    domain = data.get('domain', 'network-security')
+    if domain not in DOMAINS:
+        return _error('Unknown domain', 400)
+    try:
+        num_questions = int(data.get('num_questions', 10))
+    except (TypeError, ValueError):
+        return _error('num_questions must be an integer', 400)
+    if not 1 <= num_questions <= MAX_QUESTIONS:
+        return _error(f'num_questions must be between 1 and {MAX_QUESTIONS}', 400)
+
+    assessment = get_assessment_service().create_assessment(domain)
+    assessment['total_questions'] = num_questions
+    assessment['question_started_at'] = None
+    if assessment_tokens.tokens_enabled():
+        assessment['deck_seed'] = assessment_tokens.new_deck_seed()
+        assessment['created_at'] = int(time.time())
+
+    logger.info(f'API assessment created: {assessment["id"]} - Domain: {domain}, Questions: {num_questions}')
+    response = jsonify(_save(assessment, {
+        'success': True,
+        'id': assessment['id'],
+        'domain': domain,
+        **_progress(assessment),
+    }))
+    response.headers['Location'] = url_for('assessments_api.next_question', assessment_id=assessment['id'])
+    return response, 201
+
+
+def _draw(assessment, count):
+    """Draw questions at the current difficulty until count are awaiting an answer; False if the bank ran dry"""
+    tokens = assessment_tokens.tokens_enabled()
+    question_bank = get_question_bank()
+    while len(assessment['questions']) - assessment['current_question'] < count:
+        if tokens:
+            # Seeded deck: no per-worker record of which questions were used
+            question = assessment_tokens.draw_question(question_bank, assessment)
+        else:
+            question = question_bank.get_question(
+                domain=assessment['domain'],
+                difficulty=assessment['difficulty']
+            )
+        if not question:
+            logger.error(f'No questions available for {assessment["domain"]} at {assessment["difficulty"]} difficulty')
+            return False
+
+        position = len(assessment['questions'])
+        get_assessment_service().add_question(
+            assessment,
+            question,
+            assessment_tokens.question_id(position) if tokens else None
+        )
+    return True
+
+
+def _start_clock(assessment):
+    started_at = time.time()
+    if assessment_tokens.tokens_enabled():
+        # Replaying an older token shows the same question again; it must not restart the clock
+        earlier = get_replay_guard().claim(f'{assessment["id"]}:{assessment["current_question"]}:shown', repr(started_at))
+        if earlier:
+            started_at = float(earlier)
+    assessment['question_started_at'] = started_at
+
+
+def _claim_answers(assessment_id, index, answers, payload):
+    """
+    Token mode: allow only one set of answers per starting question
+
+    Tokens are snapshots, so an old one could otherwise be replayed to answer
+    again after seeing the feedback. Retrying the same answers (e.g. after a
+    lost response) gets the original token back. Returns False on a conflict.
+    """
+    if not assessment_tokens.tokens_enabled():
+        return True
+    earlier = get_replay_guard().claim(
+        f'{assessment_id}:{index}:answered',
+        json.dumps({'answers': answers, 'token': payload['token']})
+    )
+    if earlier:
+        earlier = json.loads(earlier)
+        if earlier['answers'] != answers:
+            logger.warning('Replayed answer rejected for assessment %s question %s', assessment_id, index)
+            return False
+        payload['token'] = earlier['token']
+    return True
+
+
+@assessments_api_bp.route('/<assessment_id>/question', methods=['GET'])
+def next_question(assessment_id):
+    """
+    The question to answer next
+
+    Repeating the call before answering returns the same question, so a
+    retried request never skips one.
+    """
+    assessment = _load(assessment_id)
+    if assessment is None:
+        return _error('Assessment not found', 404)
+
+    progress = _progress(assessment)
+    if progress['completed']:
+        return jsonify(_save(assessment, {'success': True, 'question': None, **progress}, changed=False))
+
+    index = assessment['current_question']
+    changed = index >= len(assessment['questions'])
+    if changed and not _draw(assessment, 1):
+        return _error('No questions available for this domain and difficulty', 503)
+    if assessment.get('question_started_at') is None:
+        _start_clock(assessment)
+        changed = True
+
+    question = assessment['questions'][index]
+    return jsonify(_save(assessment, {
+        'success': True,
+        'question': _question_payload(question, index + 1),
+        **progress,
+    }, changed=changed))
+
+
+@assessments_api_bp.route('/<assessment_id>/questions', methods=['GET'])
+def upcoming_questions(assessment_id):
+    """
+    The next ?count=N questions (default: all remaining) for answering offline
+
+    They are all drawn at the current difficulty, so answering them offline is
+    not adaptive: answers synced through POST /answers only set the difficulty
+    of the questions drawn after them.
+    """
+    assessment = _load(assessment_id)
+    if assessment is None:
+        return _error('Assessment not found', 404)
+
+    progress = _progress(assessment)
+    remaining = progress['total'] - progress['answered']
+    try:
+        count = min(int(request.args.get('count', remaining)), remaining)
+    except ValueError:
+        return _error('count must be an integer', 400)
+
+    index = assessment['current_question']
+    changed = len(assessment['questions']) - index < count
+    if changed and not _draw(assessment, count):
+        return _error('No questions available for this domain and difficulty', 503)
+
+    questions = assessment['questions'][index:index + max(count, 0)]
+    return jsonify(_save(assessment, {
+        'success': True,
+        'questions': [_question_payload(q, index + 1 + n) for n, q in enumerate(questions)],
+        **progress,
+    }, changed=changed))
+
+
+@assessments_api_bp.route('/<assessment_id>/answer', methods=['POST'])
+def answer(assessment_id):
+    """Answer the current question; body: {"question_id": ..., "answer": 2}"""
+    assessment = _load(assessment_id)
+    if assessment is None:
+        return _error('Assessment not found', 404)
+
+    data = _json_object()
+    if data is None:
+        return _error('Request body must be a JSON object', 400)
+    index = assessment['current_question']
+    if index >= len(assessment['questions']):
+        return _error('No question is awaiting an answer', 409)
+
+    question = assessment['questions'][index]
+    if data.get('question_id') != question['id']:
+        # Answering anything but the current question (e.g. a resubmission)
+        return _error('Question is not the current question', 409)
+
+    answer_index = data.get('answer')
+    if not _is_int(answer_index) or not 0 <= answer_index < len(question['options']):
+        return _error('answer must be an option index', 400)
+
+    # Timed server-side from when the question was handed out
+    started_at = assessment.get('question_started_at')
+    time_taken = time.time() - started_at if started_at else 0
+
+    result = get_assessment_service().submit_answer(assessment, question['id'], answer_index, time_taken)
+    if 'error' in result:
+        return _error(result['error'], 400)
+
+    assessment['question_started_at'] = None
+    payload = _save(assessment, {
+        'success': True,
+        'feedback': result,
+        'time_taken': round(time_taken, 2),
+        **_progress(assessment),
+    })
+    if not _claim_answers(assessment_id, index, [answer_index], payload):
+        return _error('Question was already answered', 409)
+
+    return jsonify(payload)
+
+
+@assessments_api_bp.route('/<assessment_id>/answers', methods=['POST'])
+def answer_batch(assessment_id):
+    """
+    Answer several pending questions in one call, e.g. after answering offline
+
+    Body: {"answers": [[question_id, answer_index, time_taken], ...]} in
+    question order. Times come from the client since the server never saw
+    the questions being answered; each is capped at MAX_ANSWER_SECONDS.
+    """
+    assessment = _load(assessment_id)
+    if assessment is None:
+        return _error('Assessment not found', 404)
+
+    data = _json_object()
+    if data is None:
+        return _error('Request body must be a JSON object', 400)
+    entries = data.get('answers') or []
+    if not isinstance(entries, list):
+        return _error('answers must be [question_id, answer_index, time_taken] triples', 400)
+    answers = []
+    for entry in entries:
+        if not isinstance(entry, list) or len(entry) != 3:
+            return _error('answers must be [question_id, answer_index, time_taken] triples', 400)
+        question_id, answer_index, time_taken = entry
+        if not _is_int(answer_index) or isinstance(time_taken, bool) or not isinstance(time_taken, (int, float)):
+            return _error('answer_index must be an integer and time_taken a number', 400)
+        answers.append((question_id, answer_index, min(max(float(time_taken), 0.0), MAX_ANSWER_SECONDS)))
+
+    index = assessment['current_question']
+    outcome = get_assessment_service().submit_answers(assessment, answers)
+    if 'error' in outcome:
+        return _error(outcome['error'], 400)
+
+    assessment['question_started_at'] = None
+    payload = _save(assessment, {
+        'success': True,
+        'feedback': outcome['results'],
+        **_progress(assessment),
+    })
+    if not _claim_answers(assessment_id, index, [a[1] for a in answers], payload):
+        return _error('Questions were already answered', 409)
+
+    return jsonify(payload)
+
+
+@assessments_api_bp.route('/<assessment_id>/results', methods=['GET'])
+def results(assessment_id):
+    """Score and per-difficulty breakdown of the answers so far"""
+    assessment = _load(assessment_id)
+    if assessment is None:
+        return _error('Assessment not found', 404)
+
+    assessment_service = get_assessment_service()
+    results_data = assessment_service.calculate_results(assessment)
+    if 'error' in results_data:
+        return _error(results_data['error'], 409)
+
+    return jsonify({
+        'success': True,
+        'id': assessment['id'],
+        'domain': assessment['domain'],
+        'score': results_data['score'],
+        'correct': results_data['correct'],
+        'answered': results_data['answered'],
+        'total': assessment['total_questions'],
+        'completed': _progress(assessment)['completed'],
+        'avg_time': results_data['avg_time'],
+        'total_time': results_data['total_time'],
+        'performance_level': assessment_service.get_performance_level(results_data['score']),
+        'recommended_difficulty': assessment_service.get_recommended_difficulty(
+            results_data['score'],
+            assessment['difficulty']
+        ),
+        'difficulty_history': results_data['difficulty_history'],
+        'difficulty_performance': results_data['difficulty_performance'],
+    })
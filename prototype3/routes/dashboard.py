@@ -4,13 +4,18 @@ Handles user dashboard and statistics
 """
 
 import logging
-from flask import Blueprint, render_template, session, redirect, url_for
-from services import all_badges_with_earned
+from flask import Blueprint, current_app, render_template, request, session, redirect, url_for
+from services import all_badges_with_earned, get_leaderboard, get_results_store, render_cached
+from services.leaderboard import METRICS, OVERALL, SCOPES
+from services.results_export import FORMATS, HISTORY_COLUMNS, export_filename, export_response, history_rows, parse_filters
+from services.results_import import claimed_learner, claimed_stats
 
 logger = logging.getLogger(__name__)
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
+LEADERBOARD_SIZE = 20
+
 @dashboard_bp.route('/')
 def index():
     """Main dashboard page"""
@@ -59,7 +64,7 @@ def index():
             'total_assessments': user_stats.get('total_assessments', 0),
             'avg_score': user_stats.get('avg_score', 0),
             'best_score': best_score,
-            'badges': user_stats.get('badges', []),
+            'badges': sorted(set(user_stats.get('badges', [])) | set(stored_badges())),
             'by_domain': domain_stats,
         }
 
@@ -125,6 +130,22 @@ def history():
         logger.exception(f'Error displaying history: {str(e)}')
         return render_template('errors/500.html'), 500
 
+@dashboard_bp.route('/history/export')
+def export_history():
+    """Download of the learner's own history; ?format=csv|ndjson, ?domain=, ?difficulty=, ?from=, ?to="""
+    fmt = request.args.get('format', 'csv')
+    try:
+        filters = parse_filters(request.args)
+    except ValueError as e:
+        logger.warning(f'Invalid history export filters: {e}')
+        return redirect(url_for('dashboard.history'))
+    if fmt not in FORMATS:
+        return redirect(url_for('dashboard.history'))
+    
+    history = sorted(session.get('user_stats', {}).get('history', []), key=lambda x: x['date'])
+    logger.info(f'History export ({fmt}) of {len(history)} assessments requested')
+    return export_response(history_rows(history, filters), HISTORY_COLUMNS, fmt, export_filename('history', fmt, filters))
+
 @dashboard_bp.route('/badges')
 def badges():
     """Badges and achievements page"""
@@ -132,22 +153,91 @@ def badges():
     
     try:
         user_stats = session.get('user_stats', {'badges': []})
-        badges_list = all_badges_with_earned(user_stats)
-        logger.debug(f'User has earned {len(user_stats.get("badges", []))} badges')
+        badges_list = all_badges_with_earned(user_stats, stored_badges())
 
         # Convert to a dict keyed by id for template backward-compat
         badges_by_id = {b['id']: b for b in badges_list}
 
-        return render_template(
+        # The catalog only varies by which badges are earned
+        earned_ids = tuple(sorted(b['id'] for b in badges_list if b['earned']))
+        logger.debug(f'User has earned {len(earned_ids)} badges')
+        return render_cached(
             'dashboard/badges.html',
+            cache_inputs=earned_ids,
             badges=badges_by_id,
-            earned_count=len([b for b in badges_list if b['earned']])
+            earned_count=len(earned_ids)
         )
     
     except Exception as e:
         logger.exception(f'Error displaying badges: {str(e)}')
         return render_template('errors/500.html'), 500
 
+@dashboard_bp.route('/claim/<token>')
+def claim(token):
+    """
+    Take over the imported history of a migrated learner
+
+    Opened from a link written by import_results.py --claim-links: the session
+    adopts the learner's id, so their imported history and badges show on the
+    dashboard and later results are recorded under the same id.
+    """
+    learner_id = claimed_learner(current_app.config['SECRET_KEY'], token)
+    if learner_id is None:
+        logger.warning('Invalid or expired learner claim link')
+        return render_template('errors/404.html'), 404
+
+    if session.get('learner_id') != learner_id:
+        user_stats = session.get('user_stats', {'badges': [], 'history': []})
+        session['user_stats'] = claimed_stats(get_results_store(), learner_id, user_stats)
+        session['learner_id'] = learner_id
+        logger.info(f'Learner claimed {session["user_stats"]["total_assessments"]} imported assessments')
+    return redirect(url_for('dashboard.index'))
+
+@dashboard_bp.route('/leaderboard')
+def leaderboard():
+    """Leaderboard of one domain (or overall) by best or average score"""
+    logger.info('Leaderboard page accessed')
+    
+    scope = request.args.get('scope', OVERALL)
+    if scope not in SCOPES:
+        scope = OVERALL
+    metric = request.args.get('metric', 'best')
+    if metric not in METRICS:
+        metric = 'best'
+    
+    try:
+        board = get_leaderboard()
+        learner_id = session.get('learner_id')
+        leaders = board.top(scope, metric, LEADERBOARD_SIZE, viewer=learner_id)
+        standing = board.standing(learner_id, scope, metric) if learner_id else None
+        logger.debug(f'Leaderboard {scope}/{metric}: {board.size(scope, metric)} learners ranked')
+        
+        return render_template(
+            'dashboard/leaderboard.html',
+            leaders=leaders,
+            standing=standing,
+            scope=scope,
+            metric=metric,
+            scopes=SCOPES,
+            ranked=board.size(scope, metric),
+            min_average_count=board.min_average_count,
+        )
+    
+    except Exception as e:
+        logger.exception(f'Error displaying leaderboard: {str(e)}')
+        return render_template('errors/500.html'), 500
+
+def stored_badges():
+    """Badges recorded for the session's learner id, such as those recomputed from imported history"""
+    learner_id = session.get('learner_id')
+    if not learner_id:
+        return []
+    try:
+        return get_results_store().learner_badges(learner_id)
+    except Exception as e:
+        logger.exception(f'Error loading stored badges: {str(e)}')
+        return []
+
 def calculate_domain_stats(history):
     """Calculate performance statistics by domain"""
     logger.debug('Calculating domain statistics')
@@ -0,0 +1,55 @@
+"""
+Exports Route Module
+Streams recorded results for reporting as CSV or NDJSON
+
+Uses the instructors' ANALYTICS_TOKEN, sent in the X-Analytics-Token header.
+"""
+
+import logging
+from flask import Blueprint, jsonify, request, session
+from services import cohort_analytics, get_results_store
+from services.results_export import FORMATS, export_filename, export_response, parse_filters
+from services.results_store import EXPORT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+exports_bp = Blueprint('exports', __name__)
+
+TOKEN_HEADER = 'X-Analytics-Token'
+
+
+def _error(message, status):
+    return jsonify({'success': False, 'error': message}), status
+
+
+@exports_bp.before_request
+def require_token():
+    if not cohort_analytics.analytics_token():
+        return _error('Not found', 404)
+    if not cohort_analytics.is_authorized(request.headers.get(TOKEN_HEADER)):
+        return _error('Forbidden', 403)
+    return None
+
+
+@exports_bp.after_request
+def skip_session(response):
+    """Token-authenticated scripts get no server-side session"""
+    session.clear()
+    session.modified = False
+    return response
+
+
+@exports_bp.route('/results', methods=['GET'])
+def results():
+    """All recorded results, oldest first; ?format=csv|ndjson, ?domain=, ?difficulty=, ?from=, ?to="""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in FORMATS:
+        return _error('format must be csv or ndjson', 400)
+    try:
+        filters = parse_filters(request.args)
+    except ValueError as e:
+        return _error(str(e), 400)
+    
+    logger.info(f'Results export ({fmt}) requested: {filters}')
+    rows = get_results_store().export_rows(*filters)
+    return export_response(rows, EXPORT_COLUMNS, fmt, export_filename('results', fmt, filters))
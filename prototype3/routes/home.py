@@ -5,6 +5,7 @@ Handles main landing page and navigation
 
 import logging
 from flask import Blueprint, render_template, session, current_app
+from services import render_cached
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +15,7 @@ home_bp = Blueprint('home', __name__)
 def index():
     """Main landing page"""
     logger.info('Home page accessed')
-    logger.debug(f'Session data: {dict(session)}')
+    logger.debug('Session data: %s', session)
     
     try:
         # Get user stats from session if available
@@ -24,7 +25,7 @@ def index():
             'badges': []
         })
         
-        logger.debug(f'User stats: {user_stats}')
+        logger.debug('User stats: %s', user_stats)
         
         return render_template(
             'home.html',
@@ -42,7 +43,7 @@ def about():
     logger.info('About page accessed')
     
     try:
-        return render_template('about.html')
+        return render_cached('about.html')
     except Exception as e:
         logger.exception(f'Error rendering about page: {str(e)}')
         return render_template('errors/500.html'), 500
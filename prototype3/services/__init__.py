@@ -4,8 +4,16 @@ Services package initialization
 
 from .gemini_service import GeminiService, get_gemini_service
 from .assessment_service import AssessmentService, get_assessment_service
-from .question_bank import QuestionBank
+from .question_bank import QuestionBank, get_question_bank
+from .assessment_store import AssessmentStore, get_assessment_store
+from .results_store import ResultsStore, get_results_store
+from .leaderboard import LeaderboardService, get_leaderboard
 from .badges import evaluate_badges, all_badges_with_earned, BADGE_DEFS
+from .circuit_breaker import CircuitBreaker
+from .question_generator import QuestionGenerator, get_question_generator
+from .metrics import REGISTRY, render_prometheus, PROMETHEUS_CONTENT_TYPE
+from .render_cache import RenderCache, get_render_cache, render_cached
+from .rate_limiter import TokenBucketLimiter, ConcurrencyLimit
 
 __all__ = [
     'GeminiService',
@@ -13,7 +21,25 @@ __all__ = [
     'AssessmentService',
     'get_assessment_service',
     'QuestionBank',
+    'get_question_bank',
+    'AssessmentStore',
+    'get_assessment_store',
+    'ResultsStore',
+    'get_results_store',
+    'LeaderboardService',
+    'get_leaderboard',
     'evaluate_badges',
     'all_badges_with_earned',
     'BADGE_DEFS',
+    'CircuitBreaker',
+    'QuestionGenerator',
+    'get_question_generator',
+    'REGISTRY',
+    'render_prometheus',
+    'PROMETHEUS_CONTENT_TYPE',
+    'RenderCache',
+    'get_render_cache',
+    'render_cached',
+    'TokenBucketLimiter',
+    'ConcurrencyLimit',
 ]
@@ -0,0 +1,164 @@
+"""
+ASGI Bridge Module
+Serves the Flask app over ASGI: coroutine views for slow upstream calls, a thread pool for everything else
+"""
+
+import asyncio
+import contextvars
+import io
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict
+
+from a2wsgi import WSGIMiddleware
+from a2wsgi.wsgi import build_environ
+from werkzeug.exceptions import HTTPException
+
+logger = logging.getLogger(__name__)
+
+AsyncView = Callable[..., Awaitable]
+
+
+class AsgiBridge:
+    """
+    ASGI application wrapping a Flask app
+
+    Endpoints registered with async_view() are dispatched on the event loop
+    with a regular Flask request context (session, before/after_request hooks,
+    error handlers), so a view awaiting Gemini holds no thread while it waits.
+    All other requests run the unchanged WSGI app on a bounded thread pool.
+    """
+
+    def __init__(self, app, wsgi_threads: int = 32, on_startup: Callable[[], None] = None,
+                 on_shutdown: Callable[[], Awaitable] = None):
+        self.app = app
+        self.views: Dict[str, AsyncView] = {}
+        self.on_startup = on_startup
+        self.on_shutdown = on_shutdown
+        self.wsgi = WSGIMiddleware(app, workers=wsgi_threads)
+
+    def async_view(self, endpoint: str, view: AsyncView) -> None:
+        """Serve an endpoint (e.g. 'api.stream_summary') with a coroutine view taking the same arguments"""
+        if endpoint not in self.app.view_functions:
+            raise ValueError(f'Unknown endpoint: {endpoint}')
+        self.views[endpoint] = view
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return await self.wsgi(scope, receive, send)
+
+        environ = build_environ(scope, io.BytesIO())
+        try:
+            endpoint, view_args = self.app.url_map.bind_to_environ(environ).match()
+        except HTTPException:
+            endpoint = None
+        if endpoint not in self.views:
+            return await self.wsgi(scope, receive, send)
+
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get('body', b'')
+            more_body = message.get('more_body', False)
+        environ['wsgi.input'] = io.BytesIO(bytes(body))
+
+        await self._dispatch(environ, self.views[endpoint], view_args, send)
+
+    async def _dispatch(self, environ, view: AsyncView, view_args: Dict, send) -> None:
+        """
+        Flask's wsgi_app with an awaited view
+
+        Everything around the view may block (session store, before/after and
+        teardown hooks, error pages), so it runs off the loop, on one thread for
+        the whole request: hooks that tag their thread, like the profiler's, find
+        the same thread from before_request to teardown. The request context is
+        pushed and popped in a context of its own; the view and the streamed body
+        run on the loop in copies of it. The environ gets the same X-Forwarded-*
+        handling and metrics as requests through app.wsgi_app.
+        """
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        request_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix='asgi-request')
+
+        def blocking(func, *args):
+            return loop.run_in_executor(request_thread, context.run, func, *args)
+
+        def on_loop(coroutine):
+            # Tasks run in a copy of the context current when they are created
+            return context.run(loop.create_task, coroutine)
+
+        proxy_fix = self.app.extensions.get('proxy_fix')
+        if proxy_fix is not None:
+            environ = proxy_fix(environ, None)
+        ctx = self.app.request_context(environ)
+        error = None
+        try:
+            try:
+                # Opens the session
+                await blocking(ctx.push)
+                try:
+                    rv = await blocking(self.app.preprocess_request)
+                    if rv is None:
+                        rv = await on_loop(view(**view_args))
+                except Exception as e:
+                    rv = await blocking(self.app.handle_user_exception, e)
+                # Saves the session
+                response = await blocking(self.app.finalize_request, rv)
+            except Exception as e:
+                error = e
+                response = await blocking(self.app.handle_exception, e)
+
+            try:
+                # Streamed while the request context is still pushed
+                await on_loop(self._send_response(response, send))
+            finally:
+                response.close()
+                # Runs the teardown hooks
+                await blocking(ctx.pop, error)
+                observe_request = self.app.extensions.get('observe_request')
+                if observe_request:
+                    await blocking(observe_request, environ, time.perf_counter() - start)
+        finally:
+            request_thread.shutdown(wait=False)
+
+    @staticmethod
+    async def _send_response(response, send) -> None:
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [
+                (name.lower().encode('latin1'), value.encode('latin1'))
+                for name, value in response.headers.items()
+            ],
+        })
+        body = response.response
+        if hasattr(body, '__aiter__'):
+            async for chunk in body:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        else:
+            for chunk in response.iter_encoded():
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if self.on_startup is not None:
+                    # Blocking work; the server accepts connections only after startup completes
+                    await asyncio.get_running_loop().run_in_executor(None, self.on_startup)
+                logger.info(f'✅ ASGI bridge serving {len(self.views)} async views')
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.on_shutdown is not None:
+                    await self.on_shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
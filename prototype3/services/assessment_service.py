@@ -6,7 +6,7 @@ Handles assessment logic, scoring, and data management
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -53,18 +53,19 @@ class AssessmentService:
         logger.debug(f'Adaptive assessment created: {assessment_id}')
         return assessment
     
-    def add_question(self, assessment: Dict, question: Dict) -> Dict:
+    def add_question(self, assessment: Dict, question: Dict, question_id: Optional[str] = None) -> Dict:
         """
         Add a question to the assessment
         
         Args:
             assessment: Assessment session dictionary
             question: Question dictionary
+            question_id: Identifier to use instead of a random UUID
         
         Returns:
             Updated assessment
         """
-        question_id = str(uuid.uuid4())
+        question_id = question_id or str(uuid.uuid4())
         question['id'] = question_id
         question['timestamp'] = datetime.now().isoformat()
         
@@ -86,7 +87,7 @@ class AssessmentService:
         Returns:
             Answer result dictionary
         """
-        logger.debug(f'Submitting answer for question {question_id}')
+        logger.debug('Submitting answer for question %s', question_id)
         
         # Find the question
         question = next((q for q in assessment['questions'] if q['id'] == question_id), None)
@@ -95,11 +96,67 @@ class AssessmentService:
             logger.error(f'Question not found: {question_id}')
             return {'error': 'Question not found'}
         
+        result = self._record_answer(assessment, question, answer_index, time_taken)
+        
+        logger.info('Answer submitted - Correct: %s, Time: %ss, New difficulty: %s', result['is_correct'], time_taken, assessment['difficulty'])
+        
+        return result
+    
+    def submit_answers(self, assessment: Dict, answers: List[Tuple[str, int, float]]) -> Dict:
+        """
+        Submit several answers at once, e.g. answered offline and synced later
+        
+        The batch must answer the pending questions in order; it is checked as
+        a whole before anything is recorded, then scored in one pass with the
+        streak and difficulty updated after each answer as one-by-one submission
+        would. The questions were drawn up front, so they all kept the difficulty
+        they were drawn at: only the net change, which the next questions drawn
+        will use, enters difficulty_history.
+        
+        Args:
+            assessment: Assessment session dictionary
+            answers: (question_id, answer_index, time_taken) tuples in answering order
+        
+        Returns:
+            {'results': [answer result, ...]} or {'error': ...} with the assessment unchanged
+        """
+        start = assessment['current_question']
+        pending = assessment['questions'][start:]
+        
+        if not answers:
+            return {'error': 'No answers submitted'}
+        if len(answers) > len(pending):
+            return {'error': f'Only {len(pending)} questions are awaiting an answer'}
+        
+        for position, ((question_id, answer_index, _), question) in enumerate(zip(answers, pending)):
+            if question_id != question['id']:
+                logger.warning('Batch answer %s is for %s, expected %s', position, question_id, question['id'])
+                return {'error': f'Answer {position + 1} is not for question {start + position + 1}'}
+            if not 0 <= answer_index < len(question.get('options', [])):
+                return {'error': f'Answer {position + 1} is not an option index'}
+        
+        history = assessment['difficulty_history']
+        history_length = len(history)
+        results = [
+            self._record_answer(assessment, question, answer_index, time_taken)
+            for (_, answer_index, time_taken), question in zip(answers, pending)
+        ]
+        del history[history_length:]
+        if assessment['difficulty'] != history[-1]:
+            history.append(assessment['difficulty'])
+        
+        correct = sum(1 for result in results if result['is_correct'])
+        logger.info('Batch of %s answers submitted - Correct: %s, New difficulty: %s', len(results), correct, assessment['difficulty'])
+        
+        return {'results': results}
+    
+    def _record_answer(self, assessment: Dict, question: Dict, answer_index: int, time_taken: float) -> Dict:
+        """Score one answer, append it and adapt the difficulty; returns the answer result"""
         # Check if answer is correct
         is_correct = answer_index == question['correct']
         
         answer = {
-            'question_id': question_id,
+            'question_id': question['id'],
             'answer_index': answer_index,
             'is_correct': is_correct,
             'time_taken': time_taken,
@@ -114,8 +171,6 @@ class AssessmentService:
         if assessment.get('adaptive_mode', False):
             self._adjust_difficulty(assessment, is_correct, time_taken)
         
-        logger.info(f'Answer submitted - Correct: {is_correct}, Time: {time_taken}s, New difficulty: {assessment["difficulty"]}')
-        
         return {
             'is_correct': is_correct,
             'correct_answer': question['correct'],
@@ -134,7 +189,7 @@ class AssessmentService:
         Returns:
             Results dictionary with score and statistics
         """
-        logger.info(f'Calculating results for assessment {assessment["id"]}')
+        logger.info('Calculating results for assessment %s', assessment['id'])
         
         total_questions = len(assessment['questions'])
         total_answers = len(assessment['answers'])
@@ -182,9 +237,9 @@ class AssessmentService:
             'completion_date': datetime.now().isoformat()
         }
         
-        logger.info(f'Results calculated - Score: {score}%, Correct: {correct_answers}/{total_questions}')
-        logger.debug(f'Difficulty progression: {results["difficulty_history"]}')
-        logger.debug(f'Results details: {results}')
+        logger.info('Results calculated - Score: %s%%, Correct: %s/%s', score, correct_answers, total_questions)
+        logger.debug('Difficulty progression: %s', results['difficulty_history'])
+        logger.debug('Results details: %s', results)
         
         return results
     
@@ -218,7 +273,7 @@ class AssessmentService:
             else:
                 difficulty_stats[diff]['percentage'] = 0
         
-        logger.debug(f'Difficulty analysis: {difficulty_stats}')
+        logger.debug('Difficulty analysis: %s', difficulty_stats)
         return difficulty_stats
     
     def get_performance_level(self, score: float) -> str:
@@ -287,7 +342,7 @@ class AssessmentService:
         # Quick answer threshold (in seconds)
         QUICK_ANSWER_THRESHOLD = 30
         
-        logger.debug(f'Adjusting difficulty - Current: {current_difficulty}, Streak: {streak}, Correct: {is_correct}, Time: {time_taken}s')
+        logger.debug('Adjusting difficulty - Current: %s, Streak: %s, Correct: %s, Time: %ss', current_difficulty, streak, is_correct, time_taken)
         
         # Update streak
         if is_correct:
@@ -337,9 +392,9 @@ class AssessmentService:
         if new_difficulty != current_difficulty:
             assessment['difficulty'] = new_difficulty
             assessment['difficulty_history'].append(new_difficulty)
-            logger.info(f'Difficulty adjusted: {current_difficulty} → {new_difficulty}')
+            logger.info('Difficulty adjusted: %s → %s', current_difficulty, new_difficulty)
         else:
-            logger.debug(f'Difficulty unchanged: {current_difficulty} (streak: {streak})')
+            logger.debug('Difficulty unchanged: %s (streak: %s)', current_difficulty, streak)
 
 # Singleton instance
 _assessment_service = None
@@ -0,0 +1,99 @@
+"""
+Assessment Store Module
+Shared, cookie-free storage of API assessments keyed by assessment id
+"""
+
+import hashlib
+import logging
+import os
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from cachelib import FileSystemCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 60 * 60
+
+# Lock files that assessments are spread over; bounded, so they are never pruned
+LOCK_STRIPES = 256
+
+
+class AssessmentConflict(Exception):
+    """Raised when an assessment was saved by another request since it was loaded"""
+
+
+def assessment_store_dir() -> str:
+    """Directory every worker reads and writes API assessments in (must be shared between them)"""
+    return os.getenv('ASSESSMENT_STORE_DIR', os.path.join(os.getcwd(), 'assessment_store'))
+
+
+class AssessmentStore:
+    """
+    Assessment dictionaries keyed by id, visible to every worker
+
+    The API carries no server-side session: each call names its assessment,
+    so any worker can load it, apply the step and write it back. Each save
+    bumps the assessment's version, and a save based on an outdated version
+    is refused, so two concurrent steps never silently overwrite each other.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: int = DEFAULT_TTL, threshold: int = 10000):
+        self.directory = directory or assessment_store_dir()
+        self.ttl = ttl
+        # Same backend Flask-Session uses for the HTML flow
+        self._cache = FileSystemCache(self.directory, threshold=threshold, default_timeout=ttl)
+        # Next to the cache directory: files inside it would be taken for cache entries
+        self.lock_dir = f'{self.directory.rstrip(os.sep)}.locks'
+        os.makedirs(self.lock_dir, exist_ok=True)
+
+    def get(self, assessment_id: str) -> Optional[Dict]:
+        """Load an assessment, or None if it never existed or has expired"""
+        return self._cache.get(assessment_id)
+
+    @contextmanager
+    def _locked(self, assessment_id: str):
+        """Exclusive flock shared by every worker, held while an assessment is compared and written"""
+        import fcntl  # POSIX only, like the gunicorn workers that share the directory
+
+        stripe = int(hashlib.sha256(assessment_id.encode('utf-8')).hexdigest()[:8], 16) % LOCK_STRIPES
+        fd = os.open(os.path.join(self.lock_dir, f'{stripe:02x}'), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # Releases the lock
+
+    def save(self, assessment: Dict) -> None:
+        """
+        Write an assessment back; the expiry restarts on every step
+
+        Raises:
+            AssessmentConflict: If the stored assessment is newer than the one loaded
+        """
+        version = assessment.get('version', 0)
+        with self._locked(assessment['id']):
+            stored = self._cache.get(assessment['id'])
+            if stored is not None and stored.get('version', 0) != version:
+                raise AssessmentConflict(f'Assessment {assessment["id"]} is at version {stored.get("version", 0)}, not {version}')
+            assessment['version'] = version + 1
+            if not self._cache.set(assessment['id'], assessment):
+                assessment['version'] = version
+                logger.error(f'Could not persist assessment {assessment["id"]} to {self.directory}')
+                raise OSError(f'Assessment store is not writable: {self.directory}')
+
+    def delete(self, assessment_id: str) -> None:
+        self._cache.delete(assessment_id)
+
+
+# Singleton instance
+_assessment_store = None
+
+def get_assessment_store() -> AssessmentStore:
+    """Get or create assessment store singleton"""
+    global _assessment_store
+
+    if _assessment_store is None:
+        _assessment_store = AssessmentStore(ttl=int(os.getenv('ASSESSMENT_STORE_TTL', DEFAULT_TTL)))
+
+    return _assessment_store
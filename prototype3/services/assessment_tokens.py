@@ -0,0 +1,312 @@
+"""
+Assessment Tokens Module
+Signed, optionally encrypted assessment state carried by the client instead of stored on the server
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, Optional
+
+from flask import current_app
+
+from .question_bank import DIFFICULTIES, DOMAINS, QuestionBank, get_question_bank
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # Optional: tokens are signed but readable without it
+    Fernet = None
+    InvalidToken = ValueError
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = 'X-Assessment-Token'
+DEFAULT_TTL = 24 * 60 * 60
+SIGNATURE_BYTES = 16
+
+# Token prefixes name the format version and whether the body is encrypted
+SIGNED_PREFIX = 's1'
+ENCRYPTED_PREFIX = 'e1'
+
+
+class InvalidAssessmentToken(ValueError):
+    """The token is malformed, forged, expired, already used or from another question bank"""
+
+
+def tokens_enabled() -> bool:
+    """ASSESSMENT_STATE=token: the JSON API keeps assessment state in client-held tokens"""
+    return os.getenv('ASSESSMENT_STATE', 'store') == 'token'
+
+
+def replay_dir() -> str:
+    return os.getenv('ASSESSMENT_REPLAY_DIR', os.path.join(os.getcwd(), 'assessment_replay'))
+
+
+def question_id(position: int) -> str:
+    """Stable id of the n-th question of a token assessment (rebuilt on every decode)"""
+    return f'q{position + 1}'
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _derive(secret: str, purpose: bytes) -> bytes:
+    """Separate keys per purpose so tokens can never be confused with session signatures"""
+    return hmac.new(secret.encode('utf-8'), b'assessment-token:' + purpose, hashlib.sha256).digest()
+
+
+def new_deck_seed() -> int:
+    return secrets.randbits(31)
+
+
+def draw_question(question_bank: QuestionBank, assessment: Dict) -> Optional[Dict]:
+    """
+    Draw the next question of a token assessment from its seeded deck
+
+    The question keeps its bank reference under 'ref' so the token only has
+    to carry [difficulty, index] per question.
+    """
+    difficulty = assessment['difficulty']
+    position = sum(1 for q in assessment['questions'] if q.get('difficulty') == difficulty)
+    drawn = question_bank.draw_from_deck(assessment['domain'], difficulty, assessment['deck_seed'], position)
+    if drawn is None:
+        return None
+    index, question = drawn
+    question['difficulty'] = difficulty
+    question['ref'] = [DIFFICULTIES.index(difficulty), index]
+    return question
+
+
+class AssessmentTokenCodec:
+    """
+    Packs an assessment into a compact token and back
+
+    Payload keys: i id, d domain, n total questions, s deck seed, b question
+    bank version, q [difficulty, index] per question, a correct-answers bitmap,
+    t answer times (tenths of a second), l current difficulty, h difficulty
+    history, k streak (halves), w question shown at (tenths), z created, e expiry.
+    """
+
+    def __init__(self, secret: str, question_bank: QuestionBank, ttl: int = DEFAULT_TTL, encrypt: bool = False):
+        if not secret:
+            raise ValueError('Assessment tokens need a SECRET_KEY')
+        self.question_bank = question_bank
+        self.ttl = ttl
+        self._sign_key = _derive(secret, b'sign')
+        self._fernet = None
+        if encrypt:
+            if Fernet is None:
+                raise RuntimeError('ASSESSMENT_TOKEN_ENCRYPT=True requires the cryptography package')
+            self._fernet = Fernet(base64.urlsafe_b64encode(_derive(secret, b'encrypt')))
+
+    def _sign(self, message: str) -> str:
+        return _b64encode(hmac.new(self._sign_key, message.encode('utf-8'), hashlib.sha256).digest()[:SIGNATURE_BYTES])
+
+    def dumps(self, assessment: Dict) -> str:
+        """Serialize, compress, optionally encrypt and sign an assessment"""
+        started_at = assessment.get('question_started_at')
+        state = {
+            'i': assessment['id'],
+            'd': DOMAINS.index(assessment['domain']),
+            'n': assessment['total_questions'],
+            's': assessment['deck_seed'],
+            'b': self.question_bank.version,
+            'q': [q['ref'] for q in assessment['questions']],
+            'a': sum(1 << k for k, answer in enumerate(assessment['answers']) if answer['is_correct']),
+            't': [round(answer['time_taken'] * 10) for answer in assessment['answers']],
+            'l': DIFFICULTIES.index(assessment['difficulty']),
+            'h': [DIFFICULTIES.index(d) for d in assessment['difficulty_history']],
+            'k': round(assessment.get('performance_streak', 0) * 2),
+            'w': round(started_at * 10) if started_at else 0,
+            'z': assessment.get('created_at') or int(time.time()),
+            'e': int(time.time()) + self.ttl,
+        }
+        raw = zlib.compress(json.dumps(state, separators=(',', ':')).encode('utf-8'), 9)
+
+        if self._fernet is not None:
+            prefix, body = ENCRYPTED_PREFIX, self._fernet.encrypt(raw).decode('ascii')
+        else:
+            prefix, body = SIGNED_PREFIX, _b64encode(raw)
+        message = f'{prefix}.{body}'
+        return f'{message}.{self._sign(message)}'
+
+    def loads(self, token: str) -> Dict:
+        """
+        Verify and unpack a token into an assessment dictionary
+
+        Raises:
+            InvalidAssessmentToken: On any malformed, forged, expired or stale token
+        """
+        try:
+            prefix, body, signature = token.split('.')
+        except (AttributeError, ValueError):
+            raise InvalidAssessmentToken('Malformed assessment token')
+
+        if not hmac.compare_digest(signature.encode('utf-8'), self._sign(f'{prefix}.{body}').encode('ascii')):
+            raise InvalidAssessmentToken('Assessment token signature mismatch')
+
+        # Encrypted and plain tokens are not interchangeable
+        expected = ENCRYPTED_PREFIX if self._fernet is not None else SIGNED_PREFIX
+        if prefix != expected:
+            raise InvalidAssessmentToken('Assessment token format not accepted')
+
+        try:
+            if self._fernet is not None:
+                raw = self._fernet.decrypt(body.encode('utf-8'))
+            else:
+                raw = _b64decode(body)
+            state = json.loads(zlib.decompress(raw))
+        except (InvalidToken, ValueError, zlib.error):
+            raise InvalidAssessmentToken('Undecodable assessment token')
+
+        if state['e'] < time.time():
+            raise InvalidAssessmentToken('Assessment token expired')
+        if state['b'] != self.question_bank.version:
+            raise InvalidAssessmentToken('Question bank changed since the assessment started')
+        return self._unpack(state)
+
+    def _unpack(self, state: Dict) -> Dict:
+        domain = DOMAINS[state['d']]
+        questions = []
+        for position, (level, index) in enumerate(state['q']):
+            question = self.question_bank.question_at(domain, DIFFICULTIES[level], index)
+            if question is None:
+                raise InvalidAssessmentToken('Assessment token references an unknown question')
+            question['id'] = question_id(position)
+            question['difficulty'] = DIFFICULTIES[level]
+            question['ref'] = [level, index]
+            questions.append(question)
+
+        answers = [
+            {
+                'question_id': questions[k]['id'],
+                'answer_index': None,
+                'is_correct': bool(state['a'] >> k & 1),
+                'time_taken': tenths / 10,
+                'difficulty_at_time': questions[k]['difficulty'],
+            }
+            for k, tenths in enumerate(state['t'])
+        ]
+
+        return {
+            'id': state['i'],
+            'domain': domain,
+            'difficulty': DIFFICULTIES[state['l']],
+            'user_id': None,
+            'questions': questions,
+            'answers': answers,
+            'start_time': datetime.fromtimestamp(state['z']).isoformat(),
+            'created_at': state['z'],
+            'end_time': None,
+            'status': 'in_progress',
+            'current_question': len(answers),
+            'adaptive_mode': True,
+            'difficulty_history': [DIFFICULTIES[d] for d in state['h']],
+            'performance_streak': state['k'] / 2,
+            'total_questions': state['n'],
+            'deck_seed': state['s'],
+            'question_started_at': state['w'] / 10 if state['w'] else None,
+        }
+
+
+class ReplayGuard:
+    """
+    Single-use markers for assessment steps, shared by all workers through a directory
+
+    A token is a snapshot, so without this an old token could be replayed to
+    re-answer a question after seeing its feedback. Each step is claimed once
+    with an atomic link(); markers older than the token TTL can no longer
+    match a valid token and are pruned.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: int = DEFAULT_TTL, prune_every: int = 512):
+        self.directory = directory or replay_dir()
+        self.ttl = ttl
+        self.prune_every = prune_every
+        self._claims = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def claim(self, key: str, value: str) -> Optional[str]:
+        """
+        Record value under key unless the key was claimed before
+
+        Returns:
+            None if this call claimed the key, else the value recorded first
+        """
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.claim-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(value)
+            # link() fails if the marker exists, and a marker is never seen half-written
+            os.link(tmp_path, path)
+        except FileExistsError:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        finally:
+            os.unlink(tmp_path)
+
+        self._claims += 1
+        if self._claims % self.prune_every == 0:
+            self.prune()
+        return None
+
+    def prune(self) -> int:
+        """Remove markers older than the token TTL; returns how many were removed"""
+        cutoff = time.time() - self.ttl
+        removed = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError:
+                    continue  # Removed by another worker
+        if removed:
+            logger.info(f'Pruned {removed} expired assessment replay markers')
+        return removed
+
+
+# Singleton instances
+_token_codec = None
+_replay_guard = None
+
+def get_token_codec() -> AssessmentTokenCodec:
+    """Get or create the token codec, keyed from the app's SECRET_KEY"""
+    global _token_codec
+
+    if _token_codec is None:
+        _token_codec = AssessmentTokenCodec(
+            current_app.config['SECRET_KEY'],
+            get_question_bank(),
+            ttl=int(os.getenv('ASSESSMENT_TOKEN_TTL', DEFAULT_TTL)),
+            encrypt=os.getenv('ASSESSMENT_TOKEN_ENCRYPT', 'False') == 'True',
+        )
+
+    return _token_codec
+
+def get_replay_guard() -> ReplayGuard:
+    """Get or create the replay guard singleton"""
+    global _replay_guard
+
+    if _replay_guard is None:
+        _replay_guard = ReplayGuard(ttl=int(os.getenv('ASSESSMENT_TOKEN_TTL', DEFAULT_TTL)))
+
+    return _replay_guard
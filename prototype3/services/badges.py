@@ -4,7 +4,7 @@ Defines badge rules and evaluates which badges a user has earned.
 """
 from __future__ import annotations
 
-from typing import Dict, Any, List, Callable, Set
+from typing import Dict, Any, Iterable, List, Callable, Set
 from datetime import datetime
 
 
@@ -222,8 +222,12 @@ def evaluate_badges(user_stats: Dict[str, Any], last_results: Dict[str, Any]) ->
     return newly_earned
 
 
-def all_badges_with_earned(user_stats: Dict[str, Any]) -> List[Dict[str, Any]]:
-    earned: Set[str] = set(user_stats.get('badges', []) or [])
+def all_badges_with_earned(user_stats: Dict[str, Any], stored: Iterable[str] = ()) -> List[Dict[str, Any]]:
+    """
+    Every badge definition, flagged earned if it is in the session stats or
+    among the learner's stored badges (recomputed by import_results.py).
+    """
+    earned: Set[str] = set(user_stats.get('badges', []) or []) | set(stored)
     result: List[Dict[str, Any]] = []
     for b in BADGE_DEFS:
         result.append({
@@ -0,0 +1,321 @@
+"""
+Cohort Analytics Module
+Score distributions, question difficulty and progress curves across all learners, vectorized with NumPy
+"""
+
+import hmac
+import importlib.util
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .question_bank import DIFFICULTIES, DOMAINS
+from .results_store import ResultsStore, get_results_store
+
+# Optional: the analytics API answers 503 without it. Imported by the first
+# CohortAnalytics, so workers that never serve analytics do not pay for it.
+np = None
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# Rows fetched from the store per batch while loading
+LOAD_BATCH = 50000
+
+
+def analytics_available() -> bool:
+    return np is not None or importlib.util.find_spec('numpy') is not None
+
+
+def analytics_token() -> str:
+    """Shared secret for instructors' analytics requests; the analytics API is disabled when empty"""
+    return os.getenv('ANALYTICS_TOKEN', '')
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    """Check a client-supplied token against ANALYTICS_TOKEN"""
+    expected = analytics_token()
+    return bool(expected and token and hmac.compare_digest(token.encode('utf-8'), expected.encode('utf-8')))
+
+
+class _Columns:
+    """Equal-length NumPy columns that grow by doubling, so appending a batch is amortized O(batch)"""
+
+    def __init__(self, dtypes: Dict[str, str], capacity: int = 1024):
+        self.size = 0
+        self._data = {name: np.empty(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+
+    def extend(self, columns: Dict[str, List]) -> None:
+        count = len(next(iter(columns.values())))
+        needed = self.size + count
+        capacity = len(next(iter(self._data.values())))
+        if needed > capacity:
+            capacity = max(needed, capacity * 2)
+            for name, column in self._data.items():
+                grown = np.empty(capacity, dtype=column.dtype)
+                grown[:self.size] = column[:self.size]
+                self._data[name] = grown
+        for name, values in columns.items():
+            self._data[name][self.size:needed] = values
+        self.size = needed
+
+    def __getitem__(self, name: str):
+        return self._data[name][:self.size]
+
+
+def _round(value: float, digits: int = 2) -> Optional[float]:
+    return None if value != value else round(float(value), digits)  # NaN -> None
+
+
+def _summary(scores) -> Dict:
+    return {
+        'count': int(scores.size),
+        'mean': _round(scores.mean()),
+        'std': _round(scores.std()),
+        'percentiles': {f'p{p}': _round(v) for p, v in zip(PERCENTILES, np.percentile(scores, PERCENTILES))},
+    }
+
+
+class CohortAnalytics:
+    """
+    Columnar copy of the results store with cached cohort aggregates
+
+    refresh() appends only the results recorded since the last load, at most
+    every refresh_interval seconds. Aggregates are computed over whole
+    columns at once and cached until new rows arrive.
+    """
+
+    def __init__(self, store: ResultsStore, refresh_interval: float = 5.0):
+        global np
+        try:
+            import numpy as np
+        except ImportError:
+            raise RuntimeError('Cohort analytics require numpy') from None
+        self.store = store
+        self.refresh_interval = refresh_interval
+        self.last_result_id = 0
+        self.version = 0
+        # Category codes: small integers in the columns, names in these lists
+        self._learners: Dict[str, int] = {}
+        self._question_codes: Dict[str, int] = {}
+        self._question_info: List[tuple] = []
+        self._row_of_result: Dict[int, int] = {}
+        self.results = _Columns({'learner': 'int32', 'domain': 'int8', 'difficulty': 'int8', 'score': 'float32', 'completed': 'float64'})
+        self.answers = _Columns({'row': 'int32', 'question': 'int32', 'difficulty': 'int8', 'correct': 'float32', 'time': 'float32'})
+        self._cache: Dict[tuple, Dict] = {}
+        # Aggregates run under the lock too, so they never see results and answers of different loads
+        self._lock = threading.RLock()
+        self._last_refresh = 0.0
+
+    def refresh(self, force: bool = False) -> bool:
+        """Load results recorded since the last refresh; returns True if any were added"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return False
+            self._last_refresh = now
+
+            upto = self.store.last_result_id()
+            if upto <= self.last_result_id:
+                return False
+            start = time.perf_counter()
+            added = self._load_results(upto)
+            self._load_answers(upto)
+            self.last_result_id = upto
+            self.version += 1
+            self._cache.clear()
+            logger.info(f'Cohort analytics loaded {added} new results in {time.perf_counter() - start:.2f}s')
+            return True
+
+    def _load_results(self, upto: int) -> int:
+        cursor = self.store.results_between(self.last_result_id, upto)
+        added = 0
+        while True:
+            rows = cursor.fetchmany(LOAD_BATCH)
+            if not rows:
+                return added
+            ids, learners, domains, difficulties, scores, completed = zip(*rows)
+            base = self.results.size
+            self._row_of_result.update((result_id, base + k) for k, result_id in enumerate(ids))
+            self.results.extend({
+                'learner': [self._learners.setdefault(l, len(self._learners)) for l in learners],
+                'domain': [DOMAINS.index(d) if d in DOMAINS else -1 for d in domains],
+                'difficulty': [DIFFICULTIES.index(d) if d in DIFFICULTIES else -1 for d in difficulties],
+                'score': scores,
+                'completed': completed,
+            })
+            added += len(rows)
+
+    def _load_answers(self, upto: int) -> None:
+        cursor = self.store.answers_between(self.last_result_id, upto)
+        questions = None
+        while True:
+            rows = cursor.fetchmany(LOAD_BATCH)
+            if not rows:
+                return
+            result_ids, keys, difficulties, correct, times = zip(*rows)
+            codes = []
+            for key in keys:
+                code = self._question_codes.get(key)
+                if code is None:
+                    if questions is None:
+                        questions = self.store.questions()
+                    code = self._question_codes[key] = len(self._question_info)
+                    self._question_info.append((key, *questions.get(key, ('', '', None))))
+                codes.append(code)
+            self.answers.extend({
+                'row': [self._row_of_result[r] for r in result_ids],
+                'question': codes,
+                'difficulty': [DIFFICULTIES.index(d) if d in DIFFICULTIES else -1 for d in difficulties],
+                'correct': correct,
+                'time': times,
+            })
+
+    def _cached(self, key: tuple, compute) -> Dict:
+        with self._lock:
+            self.refresh()
+            cached = self._cache.get(key)
+            if cached is None:
+                cached = self._cache[key] = compute()
+                cached['as_of_result'] = self.last_result_id
+            return cached
+
+    def overview(self) -> Dict:
+        """Cohort size"""
+        return self._cached(('overview',), lambda: {
+            'learners': len(self._learners),
+            'results': self.results.size,
+            'answers': self.answers.size,
+            'questions': len(self._question_info),
+        })
+
+    def score_distributions(self, bins: int = 10) -> Dict:
+        """Histogram and percentiles of assessment scores, overall and per domain"""
+        def compute():
+            scores = self.results['score']
+            domains = self.results['domain']
+            edges = np.linspace(0, 100, bins + 1)
+            by_domain = {}
+            for code, domain in enumerate(DOMAINS):
+                domain_scores = scores[domains == code]
+                if domain_scores.size:
+                    by_domain[domain] = {
+                        **_summary(domain_scores),
+                        'histogram': np.histogram(domain_scores, bins=edges)[0].tolist(),
+                    }
+            return {
+                'bins': edges.tolist(),
+                'overall': {**_summary(scores), 'histogram': np.histogram(scores, bins=edges)[0].tolist()} if scores.size else None,
+                'domains': by_domain,
+            }
+        return self._cached(('scores', bins), compute)
+
+    def question_difficulty(self, domain: Optional[str] = None, min_attempts: int = 5, limit: int = 50) -> Dict:
+        """
+        Per-question share of correct answers, hardest first
+
+        discrimination is the point-biserial correlation between answering the
+        question correctly and the score of the whole assessment: near zero or
+        negative flags a question that does not separate strong from weak learners.
+        """
+        def compute():
+            count = len(self._question_info)
+            question = self.answers['question']
+            correct = self.answers['correct']
+            score = self.results['score'][self.answers['row']].astype('float64')
+
+            attempts = np.bincount(question, minlength=count)
+            sum_x = np.bincount(question, weights=correct, minlength=count)
+            sum_y = np.bincount(question, weights=score, minlength=count)
+            sum_xy = np.bincount(question, weights=correct * score, minlength=count)
+            sum_yy = np.bincount(question, weights=score * score, minlength=count)
+            seconds = np.bincount(question, weights=self.answers['time'], minlength=count)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                p_correct = sum_x / attempts
+                covariance = attempts * sum_xy - sum_x * sum_y
+                spread = (attempts * sum_x - sum_x ** 2) * (attempts * sum_yy - sum_y ** 2)
+                discrimination = covariance / np.sqrt(spread)
+
+            selected = attempts >= max(1, min_attempts)
+            if domain:
+                selected &= np.array([info[1] == domain for info in self._question_info], dtype=bool)
+            indices = np.flatnonzero(selected)
+            indices = indices[np.argsort(p_correct[indices], kind='stable')][:limit]
+
+            return {
+                'domain': domain,
+                'min_attempts': min_attempts,
+                'questions': [
+                    {
+                        'key': self._question_info[i][0],
+                        'domain': self._question_info[i][1],
+                        'difficulty': self._question_info[i][2],
+                        'title': self._question_info[i][3],
+                        'attempts': int(attempts[i]),
+                        'p_correct': _round(p_correct[i], 3),
+                        'avg_time': _round(seconds[i] / attempts[i]),
+                        'discrimination': _round(discrimination[i], 3),
+                    }
+                    for i in indices
+                ],
+            }
+        return self._cached(('questions', domain, min_attempts, limit), compute)
+
+    def progress_curves(self, domain: Optional[str] = None, max_attempts: int = 20) -> Dict:
+        """Score distribution of learners' 1st, 2nd, ... assessment (in a domain, or any)"""
+        def compute():
+            learner = self.results['learner']
+            completed = self.results['completed']
+            scores = self.results['score']
+            if domain:
+                mask = self.results['domain'] == DOMAINS.index(domain)
+                learner, completed, scores = learner[mask], completed[mask], scores[mask]
+
+            # Order by learner, then time; the attempt number is the offset from the learner's first row
+            order = np.lexsort((completed, learner))
+            learner, scores = learner[order], scores[order]
+            positions = np.arange(learner.size)
+            first = np.r_[True, learner[1:] != learner[:-1]] if learner.size else np.zeros(0, dtype=bool)
+            attempt = positions - np.maximum.accumulate(np.where(first, positions, 0))
+
+            curve = []
+            for number in range(max_attempts):
+                attempt_scores = scores[attempt == number]
+                if not attempt_scores.size:
+                    break
+                curve.append({'attempt': number + 1, **_summary(attempt_scores)})
+
+            # Last minus first score of every learner with at least two assessments
+            last = np.r_[first[1:], True] if learner.size else first
+            repeat = last & (attempt > 0)
+            gains = scores[repeat] - scores[np.flatnonzero(repeat) - attempt[repeat]]
+            return {
+                'domain': domain,
+                'curve': curve,
+                'improvement': {
+                    'learners': int(gains.size),
+                    'mean_gain': _round(gains.mean()) if gains.size else None,
+                    'improved_share': _round((gains > 0).mean(), 3) if gains.size else None,
+                },
+            }
+        return self._cached(('progress', domain, max_attempts), compute)
+
+
+# Singleton instance
+_cohort_analytics = None
+
+def get_cohort_analytics() -> CohortAnalytics:
+    """Get or create cohort analytics singleton"""
+    global _cohort_analytics
+
+    if _cohort_analytics is None:
+        _cohort_analytics = CohortAnalytics(
+            get_results_store(),
+            refresh_interval=float(os.getenv('ANALYTICS_REFRESH_SECONDS', 5)),
+        )
+
+    return _cohort_analytics
@@ -0,0 +1,137 @@
+"""
+Feedback Pack Service
+Pre-generated AI summaries and recommendations served before any live Gemini call
+"""
+
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from . import question_bank
+
+logger = logging.getLogger(__name__)
+
+PACK_FORMAT = 1
+DEFAULT_PACK_FILE = 'feedback_pack.json'
+DEFAULT_BUCKET_SIZE = 10
+
+
+def score_bucket(score: float, bucket_size: int = DEFAULT_BUCKET_SIZE) -> int:
+    """Map a 0-100 score to the lower bound of its bucket"""
+    score = max(0.0, min(100.0, float(score or 0)))
+    return int(score // bucket_size) * bucket_size
+
+
+def pack_key(locale: str, domain: str, difficulty: str, bucket: int) -> str:
+    return f'{locale}:{domain}:{difficulty}:{bucket}'
+
+
+def iter_grid(locales, bucket_size: int = DEFAULT_BUCKET_SIZE) -> Iterator[Tuple[str, str, str, int]]:
+    """Yield every (locale, domain, difficulty, bucket) combination the pack covers"""
+    for locale in locales:
+        for domain in question_bank.DOMAINS:
+            for difficulty in question_bank.DIFFICULTIES:
+                for bucket in range(0, 101, bucket_size):
+                    yield locale, domain, difficulty, bucket
+
+
+def resolve_pack_path(pack_file: str) -> Path:
+    """Resolve the pack path relative to the working directory or the app directory"""
+    path = Path(pack_file)
+    if not path.exists() and not path.is_absolute():
+        path = Path(__file__).parent.parent / pack_file
+    return path
+
+
+class FeedbackPack:
+    """Versioned, locale-aware library of pre-generated feedback"""
+
+    def __init__(self, entries: Optional[Dict[str, Dict]] = None, version: Optional[str] = None,
+                 bucket_size: int = DEFAULT_BUCKET_SIZE, model: Optional[str] = None):
+        self.entries = entries or {}
+        self.version = version or datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.bucket_size = bucket_size
+        self.model = model
+
+    @classmethod
+    def load(cls, pack_file: str = DEFAULT_PACK_FILE) -> 'FeedbackPack':
+        """
+        Load a pack from disk
+
+        Returns:
+            The loaded pack, or an empty pack if the file is missing or unusable
+        """
+        path = resolve_pack_path(pack_file)
+        if not path.exists():
+            logger.debug(f'No feedback pack found at {path}')
+            return cls()
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f'Could not read feedback pack {path}: {e}')
+            return cls()
+
+        if data.get('format') != PACK_FORMAT:
+            logger.warning(f'Ignoring feedback pack {path}: unsupported format {data.get("format")}')
+            return cls()
+
+        pack = cls(
+            entries=data.get('entries', {}),
+            version=data.get('version'),
+            bucket_size=int(data.get('bucket_size', DEFAULT_BUCKET_SIZE)),
+            model=data.get('model'),
+        )
+        logger.info(f'Loaded feedback pack {pack.version} with {len(pack)} entries')
+        return pack
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def key_for(self, assessment_data: Dict) -> str:
+        return pack_key(
+            assessment_data.get('locale') or 'en',
+            assessment_data.get('domain', ''),
+            assessment_data.get('difficulty', ''),
+            score_bucket(assessment_data.get('score', 0), self.bucket_size),
+        )
+
+    def lookup(self, assessment_data: Dict) -> Optional[Dict]:
+        """Return the pre-generated entry matching these results, if any"""
+        if not self.entries:
+            return None
+        return self.entries.get(self.key_for(assessment_data))
+
+    def set(self, key: str, entry: Dict) -> None:
+        self.entries[key] = entry
+
+    def to_dict(self) -> Dict:
+        return {
+            'format': PACK_FORMAT,
+            'version': self.version,
+            'model': self.model,
+            'bucket_size': self.bucket_size,
+            'generated_at': datetime.now().isoformat(),
+            'entries': self.entries,
+        }
+
+    def save(self, pack_file: str) -> None:
+        """Write the pack atomically so a crash never leaves a truncated file"""
+        path = Path(pack_file)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent.resolve()), prefix=f'.{path.name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
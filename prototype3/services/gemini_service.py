@@ -3,19 +3,102 @@ Gemini AI Service - Summary and Recommendations Only
 Generates personalized feedback based on assessment results
 """
 
+import asyncio
 import os
+import json
 import logging
-import google.generativeai as genai
-from typing import Dict, List, Optional
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+from .circuit_breaker import CircuitBreaker
+from .feedback_pack import DEFAULT_PACK_FILE, FeedbackPack
+from .metrics import REGISTRY
+from .rate_limiter import ConcurrencyLimit, TokenBucketLimiter
 
 logger = logging.getLogger(__name__)
 
+# Upstream call metrics (scraped via /api/metrics)
+GEMINI_LATENCY = REGISTRY.histogram(
+    'gemini_request_duration_seconds',
+    'Latency of Gemini generate_content calls',
+    labelnames=('operation', 'outcome'),
+)
+GEMINI_ERRORS = REGISTRY.counter(
+    'gemini_request_errors_total',
+    'Failed Gemini generate_content calls',
+    labelnames=('operation', 'error'),
+)
+GEMINI_SHORT_CIRCUITS = REGISTRY.counter(
+    'gemini_short_circuit_total',
+    'Gemini calls skipped because the circuit breaker was open',
+    labelnames=('operation',),
+)
+GEMINI_REJECTIONS = REGISTRY.counter(
+    'gemini_admission_rejections_total',
+    'Gemini calls answered with the fallback because the call budget or concurrency limit was reached',
+    labelnames=('operation', 'reason'),
+)
+FEEDBACK_PACK_LOOKUPS = REGISTRY.counter(
+    'feedback_pack_lookups_total',
+    'Feedback pack lookups made before a live Gemini call',
+    labelnames=('operation', 'result'),
+)
+
+MODEL_NAME = 'models/gemini-2.0-flash-lite'
+DEFAULT_REST_ENDPOINT = 'https://generativelanguage.googleapis.com'
+
+# Marks the end of a streamed response in the queue read by stream_assessment_summary
+_STREAM_END = object()
+
+
+def _candidate_text(response: Dict) -> str:
+    """Text of the first candidate of a REST generateContent response (or stream chunk)"""
+    candidates = response.get('candidates') or [{}]
+    parts = candidates[0].get('content', {}).get('parts', [])
+    return ''.join(part.get('text', '') for part in parts)
+
 class GeminiService:
     """Service for generating AI-powered summaries and recommendations"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize Gemini service with API key"""
+    def __init__(self, api_key: Optional[str] = None, timeout: Optional[float] = None,
+                 failure_threshold: Optional[int] = None, cooldown: Optional[float] = None,
+                 feedback_pack: Optional[FeedbackPack] = None, stream_timeout: Optional[float] = None):
+        """
+        Initialize Gemini service with API key
+        
+        Args:
+            api_key: Gemini API key (defaults to GEMINI_API_KEY)
+            timeout: Per-call timeout in seconds (defaults to GEMINI_TIMEOUT_SECONDS)
+            failure_threshold: Consecutive failures before falling back (defaults to GEMINI_BREAKER_THRESHOLD)
+            cooldown: Seconds to serve fallbacks once the breaker opens (defaults to GEMINI_BREAKER_COOLDOWN)
+            feedback_pack: Pre-generated feedback served before live calls (defaults to GEMINI_FEEDBACK_PACK)
+            stream_timeout: Deadline in seconds for a whole streamed summary (defaults to GEMINI_STREAM_TIMEOUT_SECONDS)
+        """
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+        self.timeout = timeout if timeout is not None else float(os.getenv('GEMINI_TIMEOUT_SECONDS', 8))
+        self.stream_timeout = stream_timeout if stream_timeout is not None else float(
+            os.getenv('GEMINI_STREAM_TIMEOUT_SECONDS', 30)
+        )
+        max_concurrency = int(os.getenv('GEMINI_MAX_CONCURRENCY', 8))
+        # Upstream calls run on a small bounded pool so a hung call never pins the request thread
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='gemini')
+        self._http = None  # httpx.AsyncClient for the async variants, created on first use
+        # Admission control: calls beyond these limits get the fallback at once instead of queueing
+        self._slots = ConcurrencyLimit('gemini', max_concurrency)
+        self._async_slots = ConcurrencyLimit('gemini_async', int(os.getenv('GEMINI_ASYNC_MAX_CONCURRENCY', 256)))
+        self.quota = self._quota_from_env()
+        self.breaker = CircuitBreaker(
+            'gemini',
+            failure_threshold=failure_threshold if failure_threshold is not None else int(os.getenv('GEMINI_BREAKER_THRESHOLD', 5)),
+            reset_timeout=cooldown if cooldown is not None else float(os.getenv('GEMINI_BREAKER_COOLDOWN', 60)),
+        )
+        self.feedback_pack = feedback_pack if feedback_pack is not None else FeedbackPack.load(
+            os.getenv('GEMINI_FEEDBACK_PACK', DEFAULT_PACK_FILE)
+        )
         
         if not self.api_key:
             logger.warning('Gemini API key not configured - AI summaries will be disabled')
@@ -23,13 +106,110 @@ class GeminiService:
             return
         
         try:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('models/gemini-2.0-flash-lite')
+            # Imported here rather than at module level: the SDK pulls in grpc and
+            # protobuf (~0.5s) and is not needed at all when no key is configured
+            import google.generativeai as genai
+            
+            # GEMINI_API_ENDPOINT points the SDK at another server (e.g. the local mock
+            # in benchmarks/mock_gemini.py); the REST transport accepts http:// hosts
+            api_endpoint = os.getenv('GEMINI_API_ENDPOINT')
+            if api_endpoint:
+                genai.configure(
+                    api_key=self.api_key,
+                    transport='rest',
+                    client_options={'api_endpoint': api_endpoint},
+                )
+                logger.info(f'Gemini requests routed to {api_endpoint}')
+            else:
+                genai.configure(api_key=self.api_key)
+            self.model = genai.GenerativeModel(MODEL_NAME)
             logger.info('✅ Gemini AI service initialized for summaries/recommendations')
         except Exception as e:
             logger.error(f'Failed to initialize Gemini: {e}')
             self.model = None
     
+    @staticmethod
+    def _quota_from_env() -> Optional[TokenBucketLimiter]:
+        """Global call budget from GEMINI_RATE_LIMIT_RPM (0 = unlimited), shared by workers with RATE_LIMIT_DIR"""
+        rpm = float(os.getenv('GEMINI_RATE_LIMIT_RPM', 0))
+        if rpm <= 0:
+            return None
+        burst = float(os.getenv('GEMINI_RATE_LIMIT_BURST', max(1, rpm // 6)))
+        return TokenBucketLimiter('gemini', rate=rpm / 60, burst=burst)
+    
+    def _admit(self, operation: str, slots: ConcurrencyLimit) -> bool:
+        """
+        Take a concurrency slot, a call from the budget and the breaker's permission
+        
+        Returns:
+            True if the call may go ahead (the caller then releases the slot), False to serve the fallback
+        """
+        if not slots.try_acquire():
+            GEMINI_REJECTIONS.inc(operation=operation, reason='concurrency')
+            logger.warning(f'Gemini concurrency limit reached - skipping {operation} call')
+            return False
+        if self.quota is not None and not self.quota.take()[0]:
+            slots.release()
+            GEMINI_REJECTIONS.inc(operation=operation, reason='rate')
+            logger.warning(f'Gemini call budget spent - skipping {operation} call')
+            return False
+        # Asked last: in half-open state a granted request is the breaker's single trial call
+        if not self.breaker.allow_request():
+            slots.release()
+            GEMINI_SHORT_CIRCUITS.inc(operation=operation)
+            logger.warning(f'Gemini circuit open - skipping {operation} call')
+            return False
+        return True
+    
+    def _lookup_pack(self, operation: str, assessment_data: Dict) -> Optional[Dict]:
+        """Return the pre-generated feedback entry for these results, if the pack has one"""
+        entry = self.feedback_pack.lookup(assessment_data)
+        if entry and entry.get(operation):
+            FEEDBACK_PACK_LOOKUPS.inc(operation=operation, result='hit')
+            return entry
+        if len(self.feedback_pack):
+            FEEDBACK_PACK_LOOKUPS.inc(operation=operation, result='miss')
+        return None
+    
+    def _call_model(self, operation: str, prompt: str, max_output_tokens: int) -> Optional[str]:
+        """
+        Call the model with a timeout, guarded by the circuit breaker
+        
+        Args:
+            operation: Name of the calling operation (metrics label)
+            prompt: Prompt text
+            max_output_tokens: Generation token limit
+        
+        Returns:
+            Response text, or None if the call was not admitted (circuit open or a limit reached)
+        
+        Raises:
+            Exception: Upstream errors are recorded and re-raised for the caller's fallback
+        """
+        if not self._admit(operation, self._slots):
+            return None
+        
+        start = time.perf_counter()
+        try:
+            future = self._executor.submit(
+                self.model.generate_content,
+                prompt,
+                generation_config={'temperature': 0.7, 'max_output_tokens': max_output_tokens},
+            )
+            # The slot frees when the upstream call ends, even if we stop waiting for it first
+            future.add_done_callback(lambda _: self._slots.release())
+            response = future.result(timeout=self.timeout)
+            text = response.text.strip()
+        except Exception as e:
+            GEMINI_LATENCY.observe(time.perf_counter() - start, operation=operation, outcome='error')
+            GEMINI_ERRORS.inc(operation=operation, error=type(e).__name__)
+            self.breaker.record_failure()
+            raise
+        
+        GEMINI_LATENCY.observe(time.perf_counter() - start, operation=operation, outcome='success')
+        self.breaker.record_success()
+        return text
+    
     def generate_assessment_summary(self, assessment_data: Dict) -> Optional[str]:
         """
         Generate a personalized summary of the assessment performance
@@ -40,21 +220,19 @@ class GeminiService:
         Returns:
             Summary text or None if generation fails
         """
+        entry = self._lookup_pack('summary', assessment_data)
+        if entry:
+            return entry['summary']
+        
         if not self.model:
             return self._get_fallback_summary(assessment_data)
         
         try:
             prompt = self._build_summary_prompt(assessment_data)
+            summary = self._call_model('summary', prompt, max_output_tokens=500)
+            if summary is None:
+                return self._get_fallback_summary(assessment_data)
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens=500,
-                )
-            )
-            
-            summary = response.text.strip()
             logger.info('✅ Generated AI summary')
             return summary
         
@@ -62,6 +240,88 @@ class GeminiService:
             logger.exception(f'Error generating summary: {e}')
             return self._get_fallback_summary(assessment_data)
     
+    def stream_assessment_summary(self, assessment_data: Dict) -> Iterator[str]:
+        """
+        Stream a personalized summary as text chunks arrive from the model
+        
+        Falls back to a single chunk holding the non-AI summary when the model is
+        unavailable, the call is not admitted, or it fails before any text arrives.
+        Every chunk must arrive within the call timeout and the whole stream
+        within stream_timeout, so a stalled stream never holds the caller.
+        
+        Args:
+            assessment_data: Dictionary containing assessment results
+        
+        Yields:
+            Summary text chunks
+        """
+        entry = self._lookup_pack('summary', assessment_data)
+        if entry:
+            yield entry['summary']
+            return
+        
+        if not self.model or not self._admit('summary_stream', self._slots):
+            yield self._get_fallback_summary(assessment_data)
+            return
+        
+        prompt = self._build_summary_prompt(assessment_data)
+        start = time.perf_counter()
+        deadline = start + self.stream_timeout
+        chunks = queue.Queue()
+        stop = threading.Event()
+        emitted = False
+        try:
+            future = self._executor.submit(self._read_stream, prompt, chunks, stop)
+            # Held for the whole stream: the slot frees when the upstream connection
+            # closes, even if we stop waiting for it first
+            future.add_done_callback(lambda _: self._slots.release())
+            while True:
+                wait = min(self.timeout, deadline - time.perf_counter())
+                try:
+                    item = chunks.get(timeout=max(wait, 0))
+                except queue.Empty:
+                    raise TimeoutError(f'No summary chunk within {max(wait, 0):.1f}s') from None
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                emitted = True
+                yield item
+        except Exception as e:
+            GEMINI_LATENCY.observe(time.perf_counter() - start, operation='summary_stream', outcome='error')
+            GEMINI_ERRORS.inc(operation='summary_stream', error=type(e).__name__)
+            self.breaker.record_failure()
+            logger.exception(f'Error streaming summary: {e}')
+            if not emitted:
+                yield self._get_fallback_summary(assessment_data)
+            return
+        finally:
+            # Also reached when the client disconnects and the generator is closed
+            stop.set()
+        
+        GEMINI_LATENCY.observe(time.perf_counter() - start, operation='summary_stream', outcome='success')
+        self.breaker.record_success()
+        logger.info('✅ Streamed AI summary')
+    
+    def _read_stream(self, prompt: str, chunks: queue.Queue, stop: threading.Event) -> None:
+        """Executor task: put the streamed response's text chunks (or its error) on a queue, then _STREAM_END"""
+        try:
+            response = self.model.generate_content(
+                prompt,
+                generation_config={'temperature': 0.7, 'max_output_tokens': 500},
+                stream=True,
+            )
+            for chunk in response:
+                if stop.is_set():
+                    return
+                text = chunk.text
+                if text:
+                    chunks.put(text)
+        except Exception as e:
+            chunks.put(e)
+        finally:
+            chunks.put(_STREAM_END)
+    
     def generate_recommendations(self, assessment_data: Dict) -> Optional[List[str]]:
         """
         Generate personalized learning recommendations
@@ -72,56 +332,274 @@ class GeminiService:
         Returns:
             List of recommendations or None if generation fails
         """
+        entry = self._lookup_pack('recommendations', assessment_data)
+        if entry:
+            return list(entry['recommendations'])
+        
         if not self.model:
             return self._get_fallback_recommendations(assessment_data)
         
         try:
             prompt = self._build_recommendations_prompt(assessment_data)
+            recommendations_text = self._call_model('recommendations', prompt, max_output_tokens=400)
+            if recommendations_text is None:
+                return self._get_fallback_recommendations(assessment_data)
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens=400,
-                )
-            )
+            recommendations = self._parse_recommendations(recommendations_text)
+            logger.info(f'✅ Generated {len(recommendations)} AI recommendations')
+            return recommendations
+        
+        except Exception as e:
+            logger.exception(f'Error generating recommendations: {e}')
+            return self._get_fallback_recommendations(assessment_data)
+    
+    # Async variants for the ASGI entry point (asgi.py). They call the
+    # generateContent REST API over httpx so hundreds of calls can wait on the
+    # model from one event loop instead of one thread each.
+    
+    def _rest_request(self, method: str, prompt: str, max_output_tokens: int) -> Dict:
+        """URL, headers and body of a generateContent / streamGenerateContent REST call"""
+        base = os.getenv('GEMINI_API_ENDPOINT') or DEFAULT_REST_ENDPOINT
+        if '://' not in base:
+            base = f'https://{base}'
+        return {
+            'url': f'{base.rstrip("/")}/v1beta/{MODEL_NAME}:{method}',
+            'headers': {'x-goog-api-key': self.api_key},
+            'json': {
+                'contents': [{'role': 'user', 'parts': [{'text': prompt}]}],
+                'generationConfig': {'temperature': 0.7, 'maxOutputTokens': max_output_tokens},
+            },
+        }
+    
+    def _async_client(self):
+        """Shared httpx.AsyncClient; created on first use so WSGI deployments never import httpx"""
+        if self._http is None:
+            import httpx
             
-            # Parse recommendations (expecting a list)
-            recommendations_text = response.text.strip()
-            recommendations = [
-                line.strip().lstrip('•-*').strip() 
-                for line in recommendations_text.split('\n') 
-                if line.strip() and not line.strip().startswith('#')
-            ]
+            limit = int(os.getenv('GEMINI_ASYNC_MAX_CONCURRENCY', 256))
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+            )
+        return self._http
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client (ASGI lifespan shutdown)"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+    
+    async def _call_model_async(self, operation: str, prompt: str, max_output_tokens: int) -> Optional[str]:
+        """Async _call_model: same admission control, timeout and metrics, no thread held while waiting"""
+        if not self._admit(operation, self._async_slots):
+            return None
+        
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(
+                self._async_client().post(**self._rest_request('generateContent', prompt, max_output_tokens)),
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            text = _candidate_text(response.json()).strip()
+        except Exception as e:
+            GEMINI_LATENCY.observe(time.perf_counter() - start, operation=operation, outcome='error')
+            GEMINI_ERRORS.inc(operation=operation, error=type(e).__name__)
+            self.breaker.record_failure()
+            raise
+        finally:
+            self._async_slots.release()
+        
+        GEMINI_LATENCY.observe(time.perf_counter() - start, operation=operation, outcome='success')
+        self.breaker.record_success()
+        return text
+    
+    async def generate_recommendations_async(self, assessment_data: Dict) -> Optional[List[str]]:
+        """Async generate_recommendations, with the same pack lookup and fallbacks"""
+        entry = self._lookup_pack('recommendations', assessment_data)
+        if entry:
+            return list(entry['recommendations'])
+        
+        if not self.model:
+            return self._get_fallback_recommendations(assessment_data)
+        
+        try:
+            prompt = self._build_recommendations_prompt(assessment_data)
+            recommendations_text = await self._call_model_async('recommendations', prompt, max_output_tokens=400)
+            if recommendations_text is None:
+                return self._get_fallback_recommendations(assessment_data)
             
+            recommendations = self._parse_recommendations(recommendations_text)
             logger.info(f'✅ Generated {len(recommendations)} AI recommendations')
-            return recommendations[:5]  # Limit to 5 recommendations
+            return recommendations
         
         except Exception as e:
             logger.exception(f'Error generating recommendations: {e}')
             return self._get_fallback_recommendations(assessment_data)
     
+    async def stream_assessment_summary_async(self, assessment_data: Dict) -> AsyncIterator[str]:
+        """Async stream_assessment_summary, with the same pack lookup and fallbacks"""
+        entry = self._lookup_pack('summary', assessment_data)
+        if entry:
+            yield entry['summary']
+            return
+        
+        if not self.model or not self._admit('summary_stream', self._async_slots):
+            yield self._get_fallback_summary(assessment_data)
+            return
+        
+        start = time.perf_counter()
+        deadline = start + self.stream_timeout
+        emitted = False
+        try:
+            prompt = self._build_summary_prompt(assessment_data)
+            request = self._rest_request('streamGenerateContent', prompt, max_output_tokens=500)
+            async with self._async_client().stream('POST', **request) as response:
+                response.raise_for_status()
+                # The stream is one JSON array whose elements arrive as they are generated
+                decoder = json.JSONDecoder()
+                buffer = ''
+                # Each read is bounded by the client timeout, the whole stream by the deadline
+                async for data in response.aiter_text():
+                    if time.perf_counter() > deadline:
+                        raise TimeoutError(f'Summary stream exceeded {self.stream_timeout:.0f}s')
+                    buffer += data
+                    while True:
+                        buffer = buffer.lstrip(' \r\n\t[,]')
+                        try:
+                            chunk, end = decoder.raw_decode(buffer)
+                        except json.JSONDecodeError:
+                            break
+                        buffer = buffer[end:]
+                        text = _candidate_text(chunk)
+                        if text:
+                            emitted = True
+                            yield text
+        except Exception as e:
+            GEMINI_LATENCY.observe(time.perf_counter() - start, operation='summary_stream', outcome='error')
+            GEMINI_ERRORS.inc(operation='summary_stream', error=type(e).__name__)
+            self.breaker.record_failure()
+            logger.exception(f'Error streaming summary: {e}')
+            if not emitted:
+                yield self._get_fallback_summary(assessment_data)
+            return
+        finally:
+            self._async_slots.release()
+        
+        GEMINI_LATENCY.observe(time.perf_counter() - start, operation='summary_stream', outcome='success')
+        self.breaker.record_success()
+        logger.info('✅ Streamed AI summary')
+    
+    def generate_pack_entry(self, assessment_data: Dict) -> Dict:
+        """
+        Generate a feedback pack entry with live calls only (no pack, no fallback)
+        
+        Args:
+            assessment_data: Representative results for one grid cell
+        
+        Returns:
+            Dictionary with 'summary' and 'recommendations'
+        
+        Raises:
+            RuntimeError: If the model is unavailable or a call was not admitted
+            Exception: Upstream errors are propagated so the caller can retry
+        """
+        if not self.model:
+            raise RuntimeError('Gemini model not configured')
+        
+        summary = self._call_model('summary', self._build_summary_prompt(assessment_data), max_output_tokens=500)
+        recommendations_text = self._call_model(
+            'recommendations',
+            self._build_recommendations_prompt(assessment_data),
+            max_output_tokens=400
+        )
+        if summary is None or recommendations_text is None:
+            raise RuntimeError('Gemini call not admitted (circuit open or call budget spent)')
+        
+        return {
+            'summary': summary,
+            'recommendations': self._parse_recommendations(recommendations_text),
+        }
+    
+    def generate_question(self, domain: str, difficulty: str) -> Optional[Dict]:
+        """
+        Generate a new multiple-choice question in the question bank format
+        
+        Args:
+            domain: Question domain (e.g., 'network-security')
+            difficulty: Question difficulty ('beginner', 'intermediate', 'advanced')
+        
+        Returns:
+            Question dictionary, or None if the model is unavailable or returned unusable output
+        """
+        if not self.model:
+            return None
+        
+        try:
+            text = self._call_model('question', self._build_question_prompt(domain, difficulty), max_output_tokens=1024)
+            if text is None:
+                return None
+            
+            # Strip markdown code fences the model sometimes wraps JSON in
+            text = re.sub(r'^```(?:json)?\s*|\s*```$', '', text.strip())
+            question = json.loads(text)
+            if not isinstance(question, dict):
+                logger.warning('Generated question is not a JSON object')
+                return None
+            
+            logger.info(f'✅ Generated AI question: {question.get("title", "Untitled")}')
+            return question
+        
+        except json.JSONDecodeError as e:
+            logger.warning(f'Generated question is not valid JSON: {e}')
+            return None
+        except Exception as e:
+            logger.exception(f'Error generating question: {e}')
+            return None
+    
+    def _parse_recommendations(self, recommendations_text: str) -> List[str]:
+        """Parse a bulleted model response into at most 5 recommendations"""
+        recommendations = [
+            line.strip().lstrip('•-*').strip() 
+            for line in recommendations_text.split('\n') 
+            if line.strip() and not line.strip().startswith('#')
+        ]
+        return recommendations[:5]
+    
+    def _language_instruction(self, assessment_data: Dict) -> str:
+        """Instruction asking the model to answer in the user's locale"""
+        locale = assessment_data.get('locale') or 'en'
+        if locale == 'en':
+            return ''
+        try:
+            from babel import Locale
+            language = Locale.parse(locale).english_name
+        except Exception:
+            language = locale
+        return f'\nWrite the response in {language}.'
+    
     def _build_summary_prompt(self, assessment_data: Dict) -> str:
         """Build prompt for summary generation"""
         domain = assessment_data.get('domain', 'cybersecurity')
-        score = assessment_data.get('score', 0)
+        score = assessment_data.get('score_range') or assessment_data.get('score', 0)
         correct = assessment_data.get('correct_answers', 0)
         total = assessment_data.get('total_questions', 0)
         difficulty = assessment_data.get('difficulty', 'intermediate')
+        # Pack entries are generated per score bucket, so they omit exact counts
+        correct_line = f'\nCorrect Answers: {correct}/{total}' if total else ''
         
         return f"""You are a cybersecurity education expert. Provide a brief, encouraging 2-3 sentence summary of this student's assessment performance.
 
 Domain: {domain.replace('-', ' ').title()}
-Score: {score}%
-Correct Answers: {correct}/{total}
+Score: {score}%{correct_line}
 Difficulty Level: {difficulty.title()}
 
-Keep the tone positive and constructive. Focus on strengths and areas for growth. Be specific about the domain."""
+Keep the tone positive and constructive. Focus on strengths and areas for growth. Be specific about the domain.{self._language_instruction(assessment_data)}"""
     
     def _build_recommendations_prompt(self, assessment_data: Dict) -> str:
         """Build prompt for recommendations generation"""
         domain = assessment_data.get('domain', 'cybersecurity')
-        score = assessment_data.get('score', 0)
+        score = assessment_data.get('score_range') or assessment_data.get('score', 0)
         difficulty = assessment_data.get('difficulty', 'intermediate')
         weak_areas = assessment_data.get('weak_areas', [])
         
@@ -135,7 +613,27 @@ Current Level: {difficulty.title()}
 Weak Areas: {weak_areas_text}
 
 Provide practical recommendations like specific courses, certifications, hands-on labs, or resources. 
-Return ONLY a bulleted list, one recommendation per line, without additional explanation."""
+Return ONLY a bulleted list, one recommendation per line, without additional explanation.{self._language_instruction(assessment_data)}"""
+    
+    def _build_question_prompt(self, domain: str, difficulty: str) -> str:
+        """Build prompt for question generation"""
+        return f"""You are a cybersecurity education expert. Write one original multiple-choice assessment question.
+
+Domain: {domain.replace('-', ' ').title()}
+Difficulty Level: {difficulty.title()}
+
+Return ONLY a JSON object with exactly these fields:
+- "title": short title (string)
+- "context": a realistic scenario (string)
+- "question": the question (string)
+- "options": exactly 4 answer choices (array of strings)
+- "correct": index of the correct option, 0-3 (integer)
+- "explanation": why the correct answer is right (string)
+- "learningPoints": 2-4 key takeaways (array of strings)
+- "sources": 1-3 reference URLs (array of strings)
+- "difficulty": "{difficulty}"
+- "domain": "{domain}"
+"""
     
     def _get_fallback_summary(self, assessment_data: Dict) -> str:
         """Generate a basic summary without AI"""
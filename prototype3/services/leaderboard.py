@@ -0,0 +1,268 @@
+"""
+Leaderboard Module
+Per-domain and overall rankings by best or average score, with O(log n) updates and rank lookups
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from .question_bank import DOMAINS
+from .results_store import ResultsStore, get_results_store
+
+logger = logging.getLogger(__name__)
+
+OVERALL = 'overall'
+SCOPES = (OVERALL, *DOMAINS)
+METRICS = ('best', 'average')
+
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_path() -> str:
+    return os.getenv('LEADERBOARD_SNAPSHOT', os.path.join(os.getcwd(), 'leaderboard_snapshot.json'))
+
+
+def display_name(learner_id: str) -> str:
+    """Public name of an anonymous learner; the learner id itself stays private"""
+    return f'Learner {hashlib.sha256(learner_id.encode("utf-8")).hexdigest()[:6].upper()}'
+
+
+class Ranking:
+    """
+    Learners ordered by one score, highest first; equal scores share a rank
+
+    Entries are (-score, learner_id) in a sorted list, so an update is a
+    remove plus an add and a rank is a bisect, all O(log n).
+    """
+
+    def __init__(self, values: Optional[Dict[str, float]] = None):
+        self._values: Dict[str, float] = dict(values or {})
+        self._order = SortedList((-value, learner) for learner, value in self._values.items())
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def update(self, learner: str, value: float) -> None:
+        previous = self._values.get(learner)
+        if previous == value:
+            return
+        if previous is not None:
+            self._order.remove((-previous, learner))
+        self._order.add((-value, learner))
+        self._values[learner] = value
+
+    def rank(self, learner: str) -> Optional[int]:
+        """1 + the number of learners with a strictly higher score, or None if not ranked"""
+        value = self._values.get(learner)
+        if value is None:
+            return None
+        return self._order.bisect_left((-value,)) + 1
+
+    def value(self, learner: str) -> Optional[float]:
+        return self._values.get(learner)
+
+    def top(self, count: int, offset: int = 0) -> List[Tuple[int, str, float]]:
+        """(rank, learner, score) of positions offset .. offset + count, in O(log n + count)"""
+        entries = []
+        rank = None
+        previous = None
+        for position, (negated, learner) in enumerate(self._order.islice(offset, offset + count), offset):
+            if negated != previous:
+                # Only the first entry may tie with entries before the page
+                rank = self._order.bisect_left((negated,)) + 1 if previous is None else position + 1
+                previous = negated
+            entries.append((rank, learner, -negated))
+        return entries
+
+
+class LeaderboardService:
+    """
+    Rankings for every scope (overall and each domain) and metric
+
+    Fed from the results store: refresh() applies the results recorded since
+    its last look, so every worker converges on the same boards. The learner
+    totals and the last applied result id are snapshotted periodically, and
+    a restart replays only the results recorded after the snapshot.
+    """
+
+    def __init__(self, store: ResultsStore, snapshot_file: Optional[str] = None, refresh_interval: float = 5.0,
+                 min_average_count: int = 3, snapshot_interval: float = 60.0):
+        """
+        Initialize the leaderboards from the snapshot and the results store
+
+        Args:
+            store: Results store to follow
+            snapshot_file: Snapshot location (defaults to LEADERBOARD_SNAPSHOT)
+            refresh_interval: Minimum seconds between polls of the results store
+            min_average_count: Assessments in a scope before a learner is ranked by average
+            snapshot_interval: Minimum seconds between snapshots
+        """
+        self.store = store
+        self.snapshot_file = snapshot_file or snapshot_path()
+        self.refresh_interval = refresh_interval
+        self.min_average_count = min_average_count
+        self.snapshot_interval = snapshot_interval
+        self.last_result_id = 0
+        # scope -> learner -> [assessments, total score, best score]
+        self._totals: Dict[str, Dict[str, List[float]]] = {scope: {} for scope in SCOPES}
+        self._lock = threading.Lock()
+        self._last_refresh = 0.0
+        self._last_snapshot = 0.0
+        self._snapshot_id = 0
+
+        self._load_snapshot()
+        self._rankings = {
+            (scope, metric): Ranking({
+                learner: self._metric(metric, totals)
+                for learner, totals in self._totals[scope].items()
+                if metric == 'best' or totals[0] >= self.min_average_count
+            })
+            for scope in SCOPES
+            for metric in METRICS
+        }
+        self.refresh(force=True)
+
+    @staticmethod
+    def _metric(metric: str, totals: List[float]) -> float:
+        count, total, best = totals
+        return best if metric == 'best' else round(total / count, 2)
+
+    def _load_snapshot(self) -> None:
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f'Ignoring unreadable leaderboard snapshot {self.snapshot_file}: {e}')
+            return
+
+        if (snapshot.get('version') != SNAPSHOT_VERSION
+                or not isinstance(snapshot.get('totals'), dict)
+                or snapshot.get('last_result_id', 0) > self.store.last_result_id()):
+            # Another format, or a snapshot of a results database that has since been replaced
+            logger.warning('Leaderboard snapshot does not match the results store - rebuilding')
+            return
+        for scope, totals in snapshot['totals'].items():
+            if scope in self._totals:
+                self._totals[scope] = totals
+        self.last_result_id = self._snapshot_id = snapshot['last_result_id']
+        logger.info(f'✅ Leaderboard snapshot loaded up to result {self.last_result_id}')
+
+    def save_snapshot(self) -> None:
+        """Atomically write the learner totals and the last applied result id"""
+        with self._lock:
+            snapshot = {
+                'version': SNAPSHOT_VERSION,
+                'last_result_id': self.last_result_id,
+                'totals': self._totals,
+            }
+            directory = os.path.dirname(os.path.abspath(self.snapshot_file))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.leaderboard-')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f, separators=(',', ':'))
+                os.replace(tmp_path, self.snapshot_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self._snapshot_id = self.last_result_id
+            self._last_snapshot = time.monotonic()
+
+    def refresh(self, force: bool = False) -> int:
+        """Apply results recorded since the last refresh; returns how many were applied"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return 0
+            self._last_refresh = now
+
+            applied = 0
+            upto = self.store.last_result_id()
+            if upto > self.last_result_id:
+                for _, learner, domain, _, score, _ in self.store.results_between(self.last_result_id, upto):
+                    self._apply(learner, domain, score)
+                    applied += 1
+                self.last_result_id = upto
+
+            snapshot_due = self.last_result_id > self._snapshot_id and now - self._last_snapshot >= self.snapshot_interval
+
+        if snapshot_due:
+            try:
+                self.save_snapshot()
+            except OSError as e:
+                logger.error(f'Could not write leaderboard snapshot {self.snapshot_file}: {e}')
+        return applied
+
+    def _apply(self, learner: str, domain: str, score: float) -> None:
+        for scope in (OVERALL, domain):
+            if scope not in self._totals:
+                continue
+            totals = self._totals[scope].setdefault(learner, [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += score
+            totals[2] = max(totals[2], score)
+            self._rankings[(scope, 'best')].update(learner, totals[2])
+            if totals[0] >= self.min_average_count:
+                self._rankings[(scope, 'average')].update(learner, self._metric('average', totals))
+
+    def top(self, scope: str = OVERALL, metric: str = 'best', count: int = 10, offset: int = 0,
+            viewer: Optional[str] = None) -> List[Dict]:
+        """Leaders of one board, best first; the viewer's own entry is flagged with 'you'"""
+        self.refresh()
+        with self._lock:
+            totals = self._totals[scope]
+            return [
+                {
+                    'rank': rank,
+                    'name': display_name(learner),
+                    'score': score,
+                    'assessments': int(totals[learner][0]),
+                    'you': learner == viewer,
+                }
+                for rank, learner, score in self._rankings[(scope, metric)].top(count, offset)
+            ]
+
+    def standing(self, learner: str, scope: str = OVERALL, metric: str = 'best') -> Optional[Dict]:
+        """A learner's rank on one board, or None if they are not on it"""
+        self.refresh()
+        with self._lock:
+            ranking = self._rankings[(scope, metric)]
+            rank = ranking.rank(learner)
+            if rank is None:
+                return None
+            return {
+                'rank': rank,
+                'name': display_name(learner),
+                'score': ranking.value(learner),
+                'assessments': int(self._totals[scope][learner][0]),
+                'ranked': len(ranking),
+            }
+
+    def size(self, scope: str = OVERALL, metric: str = 'best') -> int:
+        return len(self._rankings[(scope, metric)])
+
+
+# Singleton instance
+_leaderboard = None
+
+def get_leaderboard() -> LeaderboardService:
+    """Get or create leaderboard singleton"""
+    global _leaderboard
+
+    if _leaderboard is None:
+        _leaderboard = LeaderboardService(
+            get_results_store(),
+            refresh_interval=float(os.getenv('LEADERBOARD_REFRESH_SECONDS', 5)),
+            min_average_count=int(os.getenv('LEADERBOARD_MIN_ASSESSMENTS', 3)),
+        )
+
+    return _leaderboard
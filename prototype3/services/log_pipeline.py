@@ -0,0 +1,156 @@
+"""
+Log Pipeline Module
+Queue-based non-blocking handlers, per-route debug sampling and JSON output
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional
+
+from flask import g, has_request_context, request
+
+# Attributes every LogRecord has; anything else was passed via extra= and goes into the JSON
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'route'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, route, message, extras and exception"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        route = getattr(record, 'route', None)
+        if route:
+            entry['route'] = route
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Tags records with the endpoint being served and samples DEBUG records per route
+
+    The sampling decision is made once per request (every Nth request of each
+    endpoint keeps its DEBUG records), so a kept request has a complete trail.
+    Dropped records are never formatted.
+    """
+
+    def __init__(self, debug_sample_rate: float = 1.0):
+        super().__init__()
+        # A fraction: above 1 keeps every request, 0 or below keeps none
+        debug_sample_rate = min(debug_sample_rate, 1.0)
+        self.every = round(1 / debug_sample_rate) if debug_sample_rate > 0 else 0
+        # Approximate under concurrency; exact counts do not matter for sampling
+        self._seen: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not has_request_context():
+            return True
+        route = request.endpoint or 'unmatched'
+        record.route = route
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+
+        sampled = g.get('_log_debug_sampled')
+        if sampled is None:
+            seen = self._seen.get(route, 0)
+            self._seen[route] = seen + 1
+            sampled = bool(self.every) and seen % self.every == 0
+            g._log_debug_sampled = sampled
+        return sampled
+
+
+class _Pipeline:
+    """Queue handler plus the listener thread writing to the real handlers"""
+
+    def __init__(self, handlers: List[logging.Handler]):
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.handler = QueueHandler(self.queue)
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def start(self) -> None:
+        if self.listener._thread is None:
+            self.listener.start()
+
+    def stop(self) -> None:
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+
+_pipeline: Optional[_Pipeline] = None
+
+
+def _stop_pipeline() -> None:
+    if _pipeline is not None:
+        _pipeline.stop()
+
+
+def _start_pipeline() -> None:
+    if _pipeline is not None:
+        _pipeline.start()
+
+
+# Registered once and applied to whichever pipeline is installed at the time
+atexit.register(_stop_pipeline)
+if hasattr(os, 'register_at_fork'):
+    # The listener thread does not survive fork (e.g. gunicorn --preload);
+    # drain it first, then run one listener per process
+    os.register_at_fork(before=_stop_pipeline, after_in_parent=_start_pipeline, after_in_child=_start_pipeline)
+
+
+def make_formatter(log_format: str) -> logging.Formatter:
+    if log_format == 'json':
+        return JsonFormatter()
+    return logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def install(level: int, handlers: List[logging.Handler], log_format: str = 'text',
+            use_queue: bool = False, debug_sample_rate: float = 1.0) -> None:
+    """
+    Replace the root logger's handlers
+
+    Args:
+        level: Root log level
+        handlers: Destination handlers (file, stream)
+        log_format: 'text' or 'json'
+        use_queue: Write through a QueueHandler so requests never block on log I/O
+        debug_sample_rate: Fraction of requests per route that keep DEBUG records
+    """
+    global _pipeline
+
+    formatter = make_formatter(log_format)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    if _pipeline is not None:
+        _pipeline.stop()
+        _pipeline = None
+
+    if use_queue:
+        _pipeline = _Pipeline(handlers)
+        front = [_pipeline.handler]
+    else:
+        front = handlers
+
+    context_filter = RequestContextFilter(debug_sample_rate)
+    for handler in front:
+        handler.addFilter(context_filter)
+        root.addHandler(handler)
+    root.setLevel(level)
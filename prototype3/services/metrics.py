@@ -0,0 +1,331 @@
+"""
+Metrics Service Module
+Minimal in-process counters and histograms rendered in Prometheus text format
+
+With METRICS_MULTIPROC_DIR set, every worker process periodically writes a
+snapshot of its metrics to that directory and /api/metrics merges the snapshots
+of all workers, so scrapes are correct whichever worker answers them.
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# Latency buckets in seconds (upper bounds), tuned for web requests and LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Buckets for sub-millisecond in-process work (session I/O, question draws)
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Totals of exited workers in the multiprocess directory (see MetricsRegistry.archive_process)
+ARCHIVE_FILENAME = 'metrics_archive.json'
+
+
+def _label_key(labelnames: Tuple[str, ...], labels: Dict[str, str]) -> Tuple[str, ...]:
+    return tuple(str(labels.get(name, '')) for name in labelnames)
+
+
+def _format_labels(labelnames, values, extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.extend(extra.items())
+    if not pairs:
+        return ''
+    escaped = [
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for k, v in pairs
+    ]
+    return '{' + ','.join(escaped) + '}'
+
+
+def _read_json(path: str) -> Optional[Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _write_json(directory: str, filename: str, data: Dict) -> None:
+    """Replace a file atomically, so readers never see half of it"""
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.metrics_', suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, os.path.join(directory, filename))
+
+
+def _merge(merged: Dict[str, Dict], data: Dict) -> None:
+    """Add a snapshot file's metrics ({name: spec with [key, value] pairs}) into merged"""
+    for name, spec in data.items():
+        target = merged.setdefault(name, dict(spec, values={}))
+        for key, value in spec['values']:
+            key = tuple(key)
+            if spec['type'] == 'counter':
+                target['values'][key] = target['values'].get(key, 0.0) + value
+            else:
+                existing = target['values'].get(key)
+                target['values'][key] = value if existing is None else [a + b for a, b in zip(existing, value)]
+
+
+def _as_file(merged: Dict[str, Dict]) -> Dict:
+    return {name: dict(spec, values=[[list(k), v] for k, v in spec['values'].items()]) for name, spec in merged.items()}
+
+
+def _render(name: str, spec: Dict) -> List[str]:
+    """Render one metric snapshot (see Metric.snapshot) as Prometheus text lines"""
+    lines = [f'# HELP {name} {spec["help"]}', f'# TYPE {name} {spec["type"]}']
+    labelnames = spec['labelnames']
+    for key, value in sorted(spec['values'].items()):
+        if spec['type'] == 'counter':
+            lines.append(f'{name}{_format_labels(labelnames, key)} {value}')
+            continue
+        cumulative = 0.0
+        for i, bound in enumerate(spec['buckets']):
+            cumulative += value[i]
+            labels = _format_labels(labelnames, key, {'le': repr(float(bound))})
+            lines.append(f'{name}_bucket{labels} {cumulative}')
+        lines.append(f'{name}_bucket{_format_labels(labelnames, key, {"le": "+Inf"})} {value[-1]}')
+        lines.append(f'{name}_sum{_format_labels(labelnames, key)} {value[-2]}')
+        lines.append(f'{name}_count{_format_labels(labelnames, key)} {value[-1]}')
+    return lines
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(_label_key(self.labelnames, labels), 0.0)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            values = dict(self._values)
+        return {'type': 'counter', 'help': self.documentation, 'labelnames': self.labelnames, 'values': values}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values = {}
+
+
+class Histogram:
+    """Histogram with optional labels; buckets are stored per-bucket and rendered cumulatively"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(self.labelnames, labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = [0.0] * (len(self.buckets) + 2)
+                self._values[key] = series
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def get_count(self, **labels) -> float:
+        series = self._values.get(_label_key(self.labelnames, labels))
+        return series[-1] if series else 0.0
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            values = {k: list(v) for k, v in self._values.items()}
+        return {
+            'type': 'histogram',
+            'help': self.documentation,
+            'labelnames': self.labelnames,
+            'buckets': self.buckets,
+            'values': values,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values = {}
+
+
+class MetricsRegistry:
+    """Holds all metrics of the process, keyed by name"""
+
+    def __init__(self, multiproc_dir: Optional[str] = None, flush_interval: float = 1.0):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self.multiproc_dir = multiproc_dir
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+
+    def _get_or_create(self, cls, name: str, documentation: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f'Metric {name} already registered as {metric.type_name}')
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames=labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames=labelnames, buckets=buckets)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def reset(self) -> None:
+        """Drop all recorded values (used in forked children; the parent keeps its own file)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+        self._last_flush = 0.0
+
+    def flush(self) -> None:
+        """Write this process's snapshot to the multiprocess directory"""
+        if not self.multiproc_dir:
+            return
+        self._last_flush = time.monotonic()
+        _write_json(self.multiproc_dir, f'metrics_{os.getpid()}.json', _as_file(self.snapshot()))
+
+    def maybe_flush(self) -> None:
+        """Flush at most once per flush_interval; cheap enough to call on every request"""
+        if self.multiproc_dir and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def clear_files(self) -> None:
+        """Delete the snapshots of earlier runs (from the gunicorn master, before any worker starts)"""
+        if not self.multiproc_dir or not os.path.isdir(self.multiproc_dir):
+            return
+        for filename in os.listdir(self.multiproc_dir):
+            if filename.startswith(('metrics_', '.metrics_')):
+                try:
+                    os.remove(os.path.join(self.multiproc_dir, filename))
+                except OSError:
+                    pass
+
+    def archive_process(self, pid: int) -> None:
+        """
+        Fold an exited worker's snapshot into the archive and delete it
+
+        Called by the gunicorn master before it starts a replacement, so the
+        totals survive the worker and a new worker that gets the same pid
+        starts from an empty file. The archive first lists the snapshot as
+        merged, so a scrape in between never counts it twice or not at all.
+        """
+        if not self.multiproc_dir:
+            return
+        filename = f'metrics_{pid}.json'
+        data = _read_json(os.path.join(self.multiproc_dir, filename))
+        if data is None:
+            return
+        archive = _read_json(os.path.join(self.multiproc_dir, ARCHIVE_FILENAME)) or {'metrics': {}}
+        merged: Dict[str, Dict] = {}
+        _merge(merged, archive['metrics'])
+        _merge(merged, data)
+        archive = {'metrics': _as_file(merged)}
+        _write_json(self.multiproc_dir, ARCHIVE_FILENAME, dict(archive, merged=[filename]))
+        os.remove(os.path.join(self.multiproc_dir, filename))
+        _write_json(self.multiproc_dir, ARCHIVE_FILENAME, archive)
+
+    def _collect(self) -> Dict[str, Dict]:
+        """Snapshot of this process, or the merge of all worker snapshots in multiprocess mode"""
+        if not self.multiproc_dir:
+            return self.snapshot()
+
+        self.flush()
+        snapshots = {}
+        for filename in os.listdir(self.multiproc_dir):
+            if filename.startswith('metrics_') and filename.endswith('.json') and filename != ARCHIVE_FILENAME:
+                data = _read_json(os.path.join(self.multiproc_dir, filename))
+                if data is not None:
+                    snapshots[filename] = data
+        # Read after the snapshots: a snapshot archived meanwhile is listed as merged
+        archive = _read_json(os.path.join(self.multiproc_dir, ARCHIVE_FILENAME)) or {'metrics': {}}
+
+        merged: Dict[str, Dict] = {}
+        _merge(merged, archive['metrics'])
+        for filename, data in snapshots.items():
+            if filename not in archive.get('merged', ()):
+                _merge(merged, data)
+        return merged
+
+    def render(self) -> str:
+        collected = self._collect()
+        lines: List[str] = []
+        for name in sorted(collected):
+            lines.extend(_render(name, collected[name]))
+        return '\n'.join(lines) + '\n'
+
+
+# Global registry
+REGISTRY = MetricsRegistry(multiproc_dir=os.getenv('METRICS_MULTIPROC_DIR') or None)
+
+if REGISTRY.multiproc_dir:
+    atexit.register(REGISTRY.flush)
+    if hasattr(os, 'register_at_fork'):
+        # Values recorded before a fork belong to the parent's file, not the child's
+        os.register_at_fork(before=REGISTRY.flush, after_in_child=REGISTRY.reset)
+
+
+def render_prometheus() -> str:
+    """Render all registered metrics in Prometheus text exposition format"""
+    return REGISTRY.render()
+
+
+class TimedSessionInterface:
+    """Session interface proxy that records session load and save time"""
+
+    def __init__(self, interface, histogram: Histogram):
+        self._interface = interface
+        self._histogram = histogram
+
+    def __getattr__(self, name):
+        return getattr(self._interface, name)
+
+    def open_session(self, app, request):
+        start = time.perf_counter()
+        try:
+            return self._interface.open_session(app, request)
+        finally:
+            self._histogram.observe(time.perf_counter() - start, operation='load')
+
+    def save_session(self, app, session, response):
+        start = time.perf_counter()
+        try:
+            return self._interface.save_session(app, session, response)
+        finally:
+            self._histogram.observe(time.perf_counter() - start, operation='save')
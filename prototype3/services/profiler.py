@@ -0,0 +1,171 @@
+"""
+Profiler Service Module
+Opt-in sampling and per-request profiling for live workers
+"""
+
+import cProfile
+import hmac
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 0.005      # Seconds between stack samples
+MAX_DURATION = 60.0           # Upper bound for one sampling run
+
+# Thread id -> endpoint (e.g. 'assessment.question') of the request it is serving
+_active_routes: Dict[int, str] = {}
+
+# Only one sampling run per process at a time
+_sampling_lock = threading.Lock()
+
+
+def profiler_token() -> str:
+    """Shared secret enabling profiling; profiling is disabled when empty"""
+    return os.getenv('PROFILER_TOKEN', '')
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    """Check a client-supplied token against PROFILER_TOKEN"""
+    expected = profiler_token()
+    return bool(expected and token and hmac.compare_digest(token.encode('utf-8'), expected.encode('utf-8')))
+
+
+def output_dir() -> str:
+    """Directory for profiles written by the signal handler and per-request cProfile"""
+    return os.getenv('PROFILER_OUTPUT_DIR', os.path.join(os.getcwd(), 'profiles'))
+
+
+def mark_route(endpoint: Optional[str]) -> None:
+    """Tag the current thread with the endpoint it is serving (None to clear)"""
+    ident = threading.get_ident()
+    if endpoint:
+        _active_routes[ident] = endpoint
+    else:
+        _active_routes.pop(ident, None)
+
+
+def _frame_name(frame) -> str:
+    module = frame.f_globals.get('__name__', '?')
+    return f'{module}:{frame.f_code.co_name}'
+
+
+def sample_stacks(duration: float, interval: float = DEFAULT_INTERVAL) -> Optional[str]:
+    """
+    Sample the stacks of all threads of this process for a while
+
+    Args:
+        duration: Seconds to sample (capped at MAX_DURATION)
+        interval: Seconds between samples
+
+    Returns:
+        Collapsed stacks ("route;frame;frame count" per line, root first) ready
+        for flamegraph.pl or speedscope, or None if a run is already in progress
+    """
+    if not _sampling_lock.acquire(blocking=False):
+        return None
+    try:
+        duration = max(0.0, min(duration, MAX_DURATION))
+        me = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        stacks: Counter = Counter()
+        samples = 0
+        deadline = time.monotonic() + duration
+
+        while time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(_frame_name(frame))
+                    frame = frame.f_back
+                root = _active_routes.get(ident) or f'thread:{names.get(ident, ident)}'
+                frames.append(root)
+                stacks[';'.join(reversed(frames))] += 1
+            samples += 1
+            time.sleep(interval)
+
+        logger.info(f'✅ Sampled {samples} times over {duration:.1f}s ({len(stacks)} unique stacks)')
+        return ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
+    finally:
+        _sampling_lock.release()
+
+
+def write_profile(content: str, prefix: str) -> str:
+    """Write collapsed stacks to the output directory and return the path"""
+    directory = output_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{prefix}-{os.getpid()}-{int(time.time())}.folded')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path
+
+
+def install_signal_handler(signum: int, duration: float) -> bool:
+    """
+    Start a background sampling run whenever the process receives signum
+
+    Returns:
+        True if the handler was installed (main thread on a POSIX platform)
+    """
+    import signal
+
+    def handle(_signum, _frame):
+        def run():
+            content = sample_stacks(duration)
+            if content is None:
+                logger.warning('Profiling signal ignored - a sampling run is already in progress')
+                return
+            logger.info(f'✅ Profile written to {write_profile(content, "signal")}')
+
+        threading.Thread(target=run, name='profiler-signal', daemon=True).start()
+
+    try:
+        signal.signal(signum, handle)
+    except ValueError:
+        # Not on the main thread (e.g. some embedded servers)
+        return False
+    return True
+
+
+def install_from_env() -> bool:
+    """Install the signal handler configured by PROFILER_SIGNAL / PROFILER_SIGNAL_SECONDS"""
+    import signal
+
+    signum = getattr(signal, os.getenv('PROFILER_SIGNAL', 'SIGUSR2'), None)
+    if signum is None:
+        return False
+    return install_signal_handler(signum, float(os.getenv('PROFILER_SIGNAL_SECONDS', 30)))
+
+
+class RequestProfile:
+    """Deterministic cProfile run for a single request"""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.profile = cProfile.Profile()
+
+    def start(self) -> bool:
+        try:
+            self.profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per process
+            logger.warning(f'Skipping request profile for {self.endpoint} - another profiler is active')
+            return False
+        return True
+
+    def stop(self) -> str:
+        """Stop profiling and dump pstats data; returns the file path"""
+        self.profile.disable()
+        directory = output_dir()
+        os.makedirs(directory, exist_ok=True)
+        safe_endpoint = (self.endpoint or 'unmatched').replace('/', '_')
+        path = os.path.join(directory, f'request-{safe_endpoint}-{os.getpid()}-{time.time_ns()}.prof')
+        self.profile.dump_stats(path)
+        return path
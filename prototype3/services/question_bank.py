@@ -3,14 +3,29 @@ Simple Question Bank Service - Hardcoded Questions Only
 Loads questions from questions.json file
 """
 
+import hashlib
 import json
 import logging
 import random
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from .metrics import FAST_BUCKETS, REGISTRY
 
 logger = logging.getLogger(__name__)
 
+# Categories of questions.json
+DOMAINS = ('network-security', 'secure-coding', 'incident-response')
+DIFFICULTIES = ('beginner', 'intermediate', 'advanced')
+
+QUESTION_DRAW_LATENCY = REGISTRY.histogram(
+    'question_draw_duration_seconds',
+    'Time spent drawing a question from the bank',
+    labelnames=('domain', 'difficulty'),
+    buckets=FAST_BUCKETS,
+)
+
 class QuestionBank:
     """Service for loading and managing hardcoded questions from JSON"""
     
@@ -24,6 +39,7 @@ class QuestionBank:
         self.questions_file = questions_file
         self.questions = {}
         self.used_questions = {}  # Track used questions per domain/difficulty
+        self.version = ''  # Content hash; question references are only valid within one version
         
         # Load questions at initialization
         self._load_questions()
@@ -49,8 +65,10 @@ class QuestionBank:
             
             logger.info(f'Loading questions from: {questions_path}')
             
-            with open(questions_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(questions_path, 'rb') as f:
+                raw = f.read()
+            data = json.loads(raw)
+            self.version = hashlib.sha256(raw).hexdigest()[:8]
             
             self.questions = data.get('questions', {})
             
@@ -87,6 +105,14 @@ class QuestionBank:
         Returns:
             Question dictionary or None if no questions available
         """
+        start = time.perf_counter()
+        try:
+            return self._draw_question(domain, difficulty)
+        finally:
+            QUESTION_DRAW_LATENCY.observe(time.perf_counter() - start, domain=domain, difficulty=difficulty)
+    
+    def _draw_question(self, domain: str, difficulty: str) -> Optional[Dict]:
+        """Pick a random unused question, resetting the category once exhausted"""
         key = f'{domain}_{difficulty}'
         
         if key not in self.questions:
@@ -129,6 +155,41 @@ class QuestionBank:
         # Return a copy to avoid modification
         return question.copy()
     
+    def draw_from_deck(self, domain: str, difficulty: str, seed: int, position: int) -> Optional[Tuple[int, Dict]]:
+        """
+        Deterministically draw the question at a position of a seeded shuffle
+        
+        Unlike get_question this keeps no per-process state: the same seed and
+        position give the same question in every worker, and consecutive
+        positions do not repeat until the category is exhausted.
+        
+        Args:
+            domain: Question domain
+            difficulty: Question difficulty
+            seed: Per-assessment deck seed
+            position: Questions already drawn from this category by the assessment
+        
+        Returns:
+            (index in the category, question copy) or None if the category is empty
+        """
+        key = f'{domain}_{difficulty}'
+        available_questions = self.questions.get(key)
+        if not available_questions:
+            logger.warning(f'No questions found for {key}')
+            return None
+        
+        deck = list(range(len(available_questions)))
+        random.Random(f'{seed}:{key}').shuffle(deck)
+        index = deck[position % len(deck)]
+        return index, available_questions[index].copy()
+    
+    def question_at(self, domain: str, difficulty: str, index: int) -> Optional[Dict]:
+        """Copy of the question at an index of a category, or None if out of range"""
+        available_questions = self.questions.get(f'{domain}_{difficulty}', [])
+        if not 0 <= index < len(available_questions):
+            return None
+        return available_questions[index].copy()
+    
     def get_question_count(self) -> Dict:
         """
         Get statistics about available questions
@@ -196,3 +257,13 @@ class QuestionBank:
             # Reset all
             self.used_questions = {}
             logger.info('Reset all used questions')
+
+# Global question bank instance
+_question_bank = None
+
+def get_question_bank() -> QuestionBank:
+    """Get or create the global question bank instance"""
+    global _question_bank
+    if _question_bank is None:
+        _question_bank = QuestionBank()
+    return _question_bank
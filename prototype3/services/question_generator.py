@@ -0,0 +1,226 @@
+"""
+Question Generator Service
+Background AI question generation with pre-warmed per-category buffers
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Set, Tuple
+
+from cachelib import FileSystemCache
+
+from .gemini_service import GeminiService, get_gemini_service
+from .question_bank import QuestionBank, get_question_bank
+from .question_validation import build_existing_index, norm_text, normalize_to_category, validate_question
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs are kept this long for polling
+JOB_TTL_SECONDS = 600
+
+
+def question_job_dir() -> str:
+    """Directory every worker records generation jobs in (must be shared between them)"""
+    return os.getenv('QUESTION_JOB_DIR', os.path.join(os.getcwd(), 'question_jobs'))
+
+
+class GeneratorBusy(Exception):
+    """Raised when this process already has its maximum of generation jobs pending"""
+
+
+class QuestionGenerator:
+    """
+    Generates, validates and deduplicates AI questions off the request path
+
+    Jobs are recorded in a directory shared by all workers, so a poll can land
+    on any of them. Buffers are per process: each worker keeps its own
+    buffer_size questions per category.
+    """
+
+    def __init__(self, gemini_service: GeminiService, question_bank: QuestionBank,
+                 buffer_size: int = 3, workers: int = 2, max_attempts: int = 3,
+                 max_pending_jobs: int = 16, job_dir: Optional[str] = None):
+        """
+        Initialize the generator
+
+        Args:
+            gemini_service: Service used to generate raw questions
+            question_bank: Bank used for category validation and deduplication
+            buffer_size: Ready questions kept per domain_difficulty category
+            workers: Background generation threads
+            max_attempts: Generation attempts per question before giving up
+            max_pending_jobs: Jobs this process queues before refusing more
+            job_dir: Shared job directory (defaults to QUESTION_JOB_DIR)
+        """
+        self.gemini_service = gemini_service
+        self.question_bank = question_bank
+        self.buffer_size = buffer_size
+        self.max_attempts = max_attempts
+        self.max_pending_jobs = max_pending_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='question-gen')
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, deque] = {}
+        self._refills_in_flight: Dict[str, int] = {}
+        self._pending_jobs = 0
+        # Same backend as the assessment store; expired jobs are dropped by their timeout
+        self._jobs = FileSystemCache(job_dir or question_job_dir(), default_timeout=JOB_TTL_SECONDS)
+        # (domain, difficulty, title, question) of every bank and generated question
+        self._seen: Set[Tuple[str, str, str, str]] = set(
+            build_existing_index({'questions': question_bank.questions})
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.gemini_service.model is not None
+
+    def has_category(self, domain: str, difficulty: str) -> bool:
+        return f'{domain}_{difficulty}' in self.question_bank.questions
+
+    def prewarm(self) -> None:
+        """Start filling the buffer of every category in the bank"""
+        if not self.enabled:
+            return
+        for key in self.question_bank.questions:
+            self._schedule_refill(key)
+        logger.info(f'Pre-warming question buffers for {len(self.question_bank.questions)} categories')
+
+    def request_question(self, domain: str, difficulty: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Return a buffered question immediately, or queue a job for one
+
+        Returns:
+            (question, None) when a buffered question was available, otherwise (None, job_id)
+
+        Raises:
+            GeneratorBusy: When max_pending_jobs jobs are already pending in this process
+        """
+        key = f'{domain}_{difficulty}'
+        with self._lock:
+            buffer = self._buffers.setdefault(key, deque())
+            question = buffer.popleft() if buffer else None
+
+        self._schedule_refill(key)
+        if question is not None:
+            logger.debug(f'Served buffered question for {key}')
+            return question, None
+
+        with self._lock:
+            if self._pending_jobs >= self.max_pending_jobs:
+                raise GeneratorBusy(f'{self._pending_jobs} question generation jobs already pending')
+            self._pending_jobs += 1
+
+        job = {
+            'id': str(uuid.uuid4()),
+            'category': key,
+            'status': 'pending',
+            'question': None,
+            'error': None,
+            'created': time.time(),
+        }
+        if not self._jobs.set(job['id'], job):
+            self._finish_job()
+            raise OSError(f'Question job store is not writable: {question_job_dir()}')
+        self._executor.submit(self._run_job, job)
+        logger.debug(f'Queued question generation job {job["id"]} for {key}')
+        return None, job['id']
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """A job recorded by any worker, or None if it never existed or has expired"""
+        return self._jobs.get(job_id)
+
+    def buffer_levels(self) -> Dict[str, int]:
+        with self._lock:
+            return {key: len(buffer) for key, buffer in self._buffers.items()}
+
+    def _schedule_refill(self, key: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            missing = (
+                self.buffer_size
+                - len(self._buffers.setdefault(key, deque()))
+                - self._refills_in_flight.get(key, 0)
+            )
+            if missing <= 0:
+                return
+            self._refills_in_flight[key] = self._refills_in_flight.get(key, 0) + missing
+        for _ in range(missing):
+            self._executor.submit(self._refill_one, key)
+
+    def _refill_one(self, key: str) -> None:
+        try:
+            question = self._generate_valid(key)
+            if question is not None:
+                with self._lock:
+                    self._buffers.setdefault(key, deque()).append(question)
+        finally:
+            with self._lock:
+                self._refills_in_flight[key] = max(0, self._refills_in_flight.get(key, 1) - 1)
+
+    def _run_job(self, job: Dict) -> None:
+        try:
+            question = self._generate_valid(job['category'])
+        except Exception as e:
+            logger.exception(f'Question generation job {job["id"]} failed: {e}')
+            question = None
+        finally:
+            self._finish_job()
+        if question is not None:
+            job.update(status='done', question=question)
+        else:
+            job.update(status='failed', error='Failed to generate question')
+        if not self._jobs.set(job['id'], job):
+            logger.error(f'Could not record result of question generation job {job["id"]}')
+
+    def _finish_job(self) -> None:
+        with self._lock:
+            self._pending_jobs -= 1
+
+    def _generate_valid(self, key: str) -> Optional[Dict]:
+        """Generate a question that passes validation and is not a duplicate"""
+        domain, difficulty = key.rsplit('_', 1)
+        for attempt in range(1, self.max_attempts + 1):
+            raw = self.gemini_service.generate_question(domain, difficulty)
+            if raw is None:
+                continue
+
+            errors = [e for e in validate_question(raw) if not e.startswith('Info:')]
+            if errors:
+                logger.warning(f'Generated question for {key} rejected (attempt {attempt}): {"; ".join(errors)}')
+                continue
+
+            question = normalize_to_category(raw, domain, difficulty)
+            dedup_key = (domain, difficulty, norm_text(question['title']), norm_text(question['question']))
+            with self._lock:
+                if dedup_key in self._seen:
+                    logger.info(f'Generated question for {key} is a duplicate (attempt {attempt})')
+                    continue
+                self._seen.add(dedup_key)
+
+            question['source'] = 'ai'
+            return question
+
+        logger.error(f'Giving up on question generation for {key} after {self.max_attempts} attempts')
+        return None
+
+
+# Global instance
+_question_generator = None
+
+def get_question_generator() -> QuestionGenerator:
+    """Get the global question generator; warmup pre-warms its buffers before the worker takes traffic"""
+    global _question_generator
+    if _question_generator is None:
+        _question_generator = QuestionGenerator(
+            get_gemini_service(),
+            get_question_bank(),
+            buffer_size=int(os.getenv('QUESTION_BUFFER_SIZE', 3)),
+            workers=int(os.getenv('QUESTION_GEN_WORKERS', 2)),
+            max_pending_jobs=int(os.getenv('QUESTION_MAX_PENDING_JOBS', 16)),
+        )
+    return _question_generator
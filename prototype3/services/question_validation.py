@@ -0,0 +1,107 @@
+"""
+Question Validation Module
+Structure checks, normalization and deduplication keys shared by merge_questions.py and the AI question generator
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Any, List, Tuple
+
+
+REQUIRED_FIELDS = {
+    'title': str,
+    'context': str,
+    'question': str,
+    'options': list,
+    'correct': int,
+    'explanation': str,
+    'learningPoints': list,
+    'sources': list,
+    'difficulty': str,
+    'domain': str,
+}
+
+
+def norm_text(s: str) -> str:
+    return ' '.join((s or '').strip().lower().split())
+
+
+def validate_question(q: Dict[str, Any]) -> List[str]:
+    errors: List[str] = []
+
+    # Required fields and types
+    for field, tp in REQUIRED_FIELDS.items():
+        if field not in q:
+            errors.append(f"Missing required field '{field}'")
+            continue
+        if not isinstance(q[field], tp):
+            errors.append(f"Field '{field}' must be of type {tp.__name__}")
+
+    if errors:
+        return errors
+
+    # Options sanity
+    options = q['options']
+    if len(options) < 2:
+        errors.append('Options must contain at least 2 choices')
+    if len(options) > 8:
+        errors.append('Options must not exceed 8 choices')
+    # Typical convention is 4 options; warn if not 4
+    if len(options) != 4:
+        errors.append(f"Info: Non-standard option count ({len(options)}). Expected 4.")
+
+    # Correct index bounds
+    correct = q['correct']
+    if not (0 <= correct < len(options)):
+        errors.append(f"Correct index {correct} out of bounds for options length {len(options)}")
+
+    # Strings not empty (basic sanity)
+    for sf in ['title', 'context', 'question', 'explanation', 'difficulty', 'domain']:
+        if not str(q[sf]).strip():
+            errors.append(f"Field '{sf}' must not be empty")
+
+    # Lists content type checks (optional but helpful)
+    if not all(isinstance(o, str) for o in options):
+        errors.append('All options must be strings')
+    if not all(isinstance(lp, str) for lp in q['learningPoints']):
+        errors.append('All learningPoints must be strings')
+    if not all(isinstance(src, str) for src in q['sources']):
+        errors.append('All sources must be strings')
+
+    return errors
+
+
+def build_existing_index(existing: Dict[str, Any]) -> Dict[Tuple[str, str, str, str], bool]:
+    idx: Dict[Tuple[str, str, str, str], bool] = {}
+    questions = existing.get('questions', {})
+    for key, arr in questions.items():
+        if not isinstance(arr, list):
+            continue
+        try:
+            domain, difficulty = key.rsplit('_', 1)
+        except ValueError:
+            # Skip malformed keys
+            continue
+        for q in arr:
+            title = norm_text(q.get('title', ''))
+            qtext = norm_text(q.get('question', ''))
+            idx[(domain, difficulty, title, qtext)] = True
+    return idx
+
+
+def normalize_to_category(q: Dict[str, Any], cat_domain: str, cat_diff: str) -> Dict[str, Any]:
+    q = dict(q)  # shallow copy
+    # Normalize whitespace in strings
+    for f in ['title', 'context', 'question', 'explanation', 'difficulty', 'domain']:
+        if f in q and isinstance(q[f], str):
+            q[f] = q[f].strip()
+    # Trim options strings
+    if 'options' in q and isinstance(q['options'], list):
+        q['options'] = [str(o).strip() for o in q['options']]
+    # Force domain/difficulty to match the category
+    q['domain'] = cat_domain
+    q['difficulty'] = cat_diff
+    # Remove any runtime-only fields if present (e.g., id, timestamp)
+    q.pop('id', None)
+    q.pop('timestamp', None)
+    return q
@@ -0,0 +1,269 @@
+"""
+Rate Limiter Module
+Token buckets and concurrency limits that turn excess load away at once instead of queueing it
+"""
+
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from flask import current_app, g, request
+
+from .metrics import REGISTRY
+from . import render_cache
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_REJECTIONS = REGISTRY.counter(
+    'rate_limit_rejections_total',
+    'Page requests answered with 429 by a rate or concurrency limit',
+    labelnames=('limit',),
+)
+
+# Blueprints serving HTML pages; the JSON APIs and static files are not limited here
+PAGE_BLUEPRINTS = ('home', 'assessment', 'dashboard')
+
+
+def shared_dir() -> Optional[str]:
+    """RATE_LIMIT_DIR: keep buckets in a directory shared by all workers instead of per process"""
+    return os.getenv('RATE_LIMIT_DIR') or None
+
+
+def _refill(tokens: float, updated: float, now: float, rate: float, burst: float) -> float:
+    return min(burst, tokens + max(0.0, now - updated) * rate)
+
+
+class MemoryBucketStore:
+    """Buckets of one process; the least recently used keys are dropped past max_keys"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: 'OrderedDict[str, Tuple[float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, cost: float, rate: float, burst: float, spend: bool = True) -> float:
+        """Take cost tokens (or only check for them); returns 0 if they were available, else seconds until they will be"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = _refill(tokens, updated, now, rate, burst)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            if not wait and spend:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            # An evicted key has not been seen for the longest time, so it is most likely full again
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class FileBucketStore:
+    """
+    Buckets shared by every worker through one small file per key
+
+    Each take() holds an exclusive flock on the key's file while it reads,
+    refills and writes the bucket, so workers never overspend a bucket
+    between them. Files idle long enough to be full again are pruned.
+    """
+
+    def __init__(self, directory: str, idle_seconds: float, prune_every: int = 4096):
+        self.directory = directory
+        self.idle_seconds = idle_seconds
+        self.prune_every = prune_every
+        self._takes = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def take(self, key: str, cost: float, rate: float, burst: float, spend: bool = True) -> float:
+        """Take cost tokens (or only check for them); returns 0 if they were available, else seconds until they will be"""
+        import fcntl  # POSIX only, like the gunicorn workers that share the directory
+
+        path = os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest()[:32])
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            try:
+                tokens, updated = (float(v) for v in os.pread(fd, 64, 0).split())
+            except ValueError:  # New (empty) bucket
+                tokens, updated = burst, now
+            tokens = _refill(tokens, updated, now, rate, burst)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            if not wait and spend:
+                tokens -= cost
+            os.pwrite(fd, f'{tokens:.6f} {now:.6f}'.ljust(64).encode('ascii'), 0)
+        finally:
+            os.close(fd)  # Releases the lock
+
+        self._takes += 1
+        if self._takes % self.prune_every == 0:
+            self.prune()
+        return wait
+
+    def prune(self) -> int:
+        """Remove buckets that have refilled completely; returns how many were removed"""
+        cutoff = time.time() - self.idle_seconds
+        removed = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError:
+                    continue  # Removed by another worker
+        return removed
+
+
+class TokenBucketLimiter:
+    """
+    Named family of token buckets, one per key (client IP, session, 'global', ...)
+
+    A bucket holds up to burst tokens and refills at rate tokens per second;
+    a call that finds too few tokens is rejected with the time to wait rather
+    than delayed.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, directory: Optional[str] = None):
+        """
+        Initialize the limiter
+
+        Args:
+            name: Name used in logs, metrics and the shared bucket directory
+            rate: Tokens added per second
+            burst: Bucket capacity, i.e. calls allowed at once after a quiet period
+            directory: Shared bucket directory (defaults to RATE_LIMIT_DIR; per process if unset)
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError(f'Rate limit {name} needs a positive rate and a burst of at least 1')
+        self.name = name
+        self.rate = float(rate)
+        self.burst = float(burst)
+        directory = directory or shared_dir()
+        if directory:
+            self.store = FileBucketStore(os.path.join(directory, name), idle_seconds=self.burst / self.rate)
+        else:
+            self.store = MemoryBucketStore()
+
+    def take(self, key: str = 'global', cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Spend cost tokens from the key's bucket
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+        wait = self.store.take(key, cost, self.rate, self.burst)
+        return not wait, wait
+
+    def check(self, key: str = 'global', cost: float = 1.0) -> Tuple[bool, float]:
+        """take() without spending: whether the key's bucket holds cost tokens now"""
+        wait = self.store.take(key, cost, self.rate, self.burst, spend=False)
+        return not wait, wait
+
+
+class ConcurrencyLimit:
+    """At most limit holders at a time; try_acquire() never waits for a free slot"""
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = max(1, int(limit))
+        self._semaphore = threading.BoundedSemaphore(self.limit)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        if not self._semaphore.acquire(blocking=False):
+            return False
+        with self._lock:
+            self._in_flight += 1
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._semaphore.release()
+
+
+def _limiter_from_env(name: str, default_rate: float, default_burst: float) -> Optional[TokenBucketLimiter]:
+    """RATE_LIMIT_<NAME>_RATE / _BURST; a rate of 0 disables the limit"""
+    prefix = f'RATE_LIMIT_{name.upper()}'
+    rate = float(os.getenv(f'{prefix}_RATE', default_rate))
+    if rate <= 0:
+        return None
+    return TokenBucketLimiter(name, rate, float(os.getenv(f'{prefix}_BURST', default_burst)))
+
+
+def _too_many_requests(limit: str, retry_after: float):
+    RATE_LIMIT_REJECTIONS.inc(limit=limit)
+    logger.warning('Rate limit %s hit by %s on %s', limit, request.remote_addr, request.endpoint)
+    response = current_app.make_response((render_cache.render_cached('errors/429.html'), 429))
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def init_app(app) -> None:
+    """
+    Limit page requests per client IP and per session, and optionally in flight
+
+    Off unless RATE_LIMIT_ENABLED=True: behind a proxy the per-IP limit only
+    tells clients apart once TRUSTED_PROXY_HOPS is set, and without
+    RATE_LIMIT_DIR every worker keeps its own buckets. Requests over a limit
+    get a 429 page with Retry-After straight from before_request, before any
+    view work.
+    """
+    if os.getenv('RATE_LIMIT_ENABLED', 'False') != 'True':
+        app.logger.info('Page rate limits disabled')
+        return
+
+    ip_limiter = _limiter_from_env('ip', default_rate=5, default_burst=60)
+    if ip_limiter is not None and int(os.getenv('TRUSTED_PROXY_HOPS', 0)) <= 0:
+        app.logger.warning('Per-IP page limit keys on the connecting address; behind a proxy set TRUSTED_PROXY_HOPS')
+    session_limiter = _limiter_from_env('session', default_rate=2, default_burst=30)
+    max_in_flight = int(os.getenv('RATE_LIMIT_MAX_IN_FLIGHT', 0))
+    in_flight = ConcurrencyLimit('in_flight', max_in_flight) if max_in_flight > 0 else None
+    cookie_name = app.config.get('SESSION_COOKIE_NAME', 'session')
+
+    @app.before_request
+    def limit_page_requests():
+        if request.blueprint not in PAGE_BLUEPRINTS:
+            return None
+
+        # Only a returning browser has a session to charge; a new one is covered by its IP
+        # (the client's own address behind a proxy, see TRUSTED_PROXY_HOPS)
+        buckets = [
+            (limiter, key)
+            for limiter, key in ((ip_limiter, request.remote_addr), (session_limiter, request.cookies.get(cookie_name)))
+            if limiter is not None and key
+        ]
+        # Every bucket is checked before any is charged, so a request one limit
+        # turns away costs nothing from the others
+        for limiter, key in buckets:
+            allowed, retry_after = limiter.check(key)
+            if not allowed:
+                return _too_many_requests(limiter.name, retry_after)
+        for limiter, key in buckets:
+            allowed, retry_after = limiter.take(key)
+            if not allowed:  # Emptied by a concurrent request since the check
+                return _too_many_requests(limiter.name, retry_after)
+
+        if in_flight is not None:
+            if not in_flight.try_acquire():
+                return _too_many_requests(in_flight.name, 1)
+            g.page_slot = in_flight
+        return None
+
+    @app.teardown_request
+    def release_page_slot(error=None):
+        page_slot = g.pop('page_slot', None)
+        if page_slot is not None:
+            page_slot.release()
+
+    app.logger.info(f'Page rate limits enabled ({"shared: " + shared_dir() if shared_dir() else "per process"})')
@@ -0,0 +1,144 @@
+"""
+Render Cache Service Module
+Caches fully rendered static and semi-static pages per template, locale and inputs
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from flask import current_app, render_template, request
+from flask_babel import get_locale
+from jinja2 import FileSystemBytecodeCache
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+VERSION_FILE = 'render_cache.version'
+
+RENDER_CACHE_LOOKUPS = REGISTRY.counter(
+    'render_cache_lookups_total',
+    'Render cache lookups by template and result',
+    labelnames=('template', 'result'),
+)
+
+
+def template_cache_dir() -> str:
+    """Directory shared by the Jinja bytecode cache and the render cache version marker"""
+    return os.getenv('TEMPLATE_CACHE_DIR', os.path.join(os.getcwd(), 'template_cache'))
+
+
+def configure_bytecode_cache(app) -> None:
+    """Persist compiled templates so new workers skip Jinja compilation"""
+    directory = template_cache_dir()
+    os.makedirs(directory, exist_ok=True)
+    # Entries are keyed by template name and validated against a source checksum,
+    # so edited templates are recompiled without manual cleanup
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def invalidate(directory: Optional[str] = None) -> None:
+    """
+    Invalidate rendered pages in every running worker
+
+    Bumps the version marker that workers poll; call after compiling
+    translations or deploying changed page content.
+    """
+    directory = directory or template_cache_dir()
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, VERSION_FILE), 'w', encoding='utf-8') as f:
+        f.write(str(time.time_ns()))
+
+
+class RenderCache:
+    """LRU cache of rendered HTML for pages that are identical for every user within a locale"""
+
+    def __init__(self, max_entries: int = 512, check_interval: float = 2.0, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+        self.directory = directory or template_cache_dir()
+        self._entries: 'OrderedDict[Tuple, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = self._read_version()
+        self._last_check = time.monotonic()
+
+    def _read_version(self) -> Optional[float]:
+        try:
+            return os.stat(os.path.join(self.directory, VERSION_FILE)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _check_version(self) -> None:
+        """Drop all entries if invalidate() ran since the last check (polled, at most every check_interval)"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        version = self._read_version()
+        if version != self._version:
+            self._version = version
+            self.clear()
+            logger.info('Render cache invalidated')
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def render(self, template_name: str, cache_inputs: Hashable = (), **context) -> str:
+        """
+        Render a template, reusing earlier output for the same key
+
+        Args:
+            template_name: Template to render
+            cache_inputs: Everything besides locale and route the output depends on
+            **context: Template context (must be fully determined by cache_inputs)
+
+        Returns:
+            Rendered HTML
+        """
+        if current_app.config.get('DEBUG') or os.getenv('RENDER_CACHE', 'True') != 'True':
+            # Debug pages show per-session details and templates auto-reload
+            return render_template(template_name, **context)
+
+        self._check_version()
+        key = (template_name, str(get_locale()), request.endpoint, request.script_root, cache_inputs)
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+        if html is not None:
+            RENDER_CACHE_LOOKUPS.inc(template=template_name, result='hit')
+            return html
+
+        RENDER_CACHE_LOOKUPS.inc(template=template_name, result='miss')
+        html = render_template(template_name, **context)
+        with self._lock:
+            self._entries[key] = html
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+
+# Singleton instance
+_render_cache = None
+
+def get_render_cache() -> RenderCache:
+    """Get or create render cache singleton"""
+    global _render_cache
+    
+    if _render_cache is None:
+        _render_cache = RenderCache(max_entries=int(os.getenv('RENDER_CACHE_MAX_ENTRIES', 512)))
+    
+    return _render_cache
+
+
+def render_cached(template_name: str, cache_inputs: Hashable = (), **context) -> str:
+    """Render through the shared render cache (see RenderCache.render)"""
+    return get_render_cache().render(template_name, cache_inputs, **context)
@@ -0,0 +1,141 @@
+"""
+Results Export Module
+Streams results and learner history as CSV or NDJSON in bounded chunks, whatever the export size
+"""
+
+import csv
+import io
+import json
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, Mapping, NamedTuple, Optional, Sequence
+
+from flask import Response
+
+from .question_bank import DIFFICULTIES, DOMAINS
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Columns of a learner's session history (see update_user_stats)
+HISTORY_COLUMNS = ('date', 'domain', 'difficulty', 'score', 'performance_level')
+
+# Approximate size of each chunk handed to the server
+CHUNK_SIZE = 64 * 1024
+
+
+class ExportFilters(NamedTuple):
+    """Row filters; since is inclusive and before exclusive, both naive ISO timestamps"""
+    domain: Optional[str] = None
+    difficulty: Optional[str] = None
+    since: Optional[str] = None
+    before: Optional[str] = None
+
+    def matches(self, record: Dict) -> bool:
+        """Whether a history record passes the filters"""
+        completed = record.get('date', '')
+        return ((self.domain is None or record.get('domain') == self.domain)
+                and (self.difficulty is None or record.get('difficulty') == self.difficulty)
+                and (self.since is None or completed >= self.since)
+                and (self.before is None or completed < self.before))
+
+
+def _parse_time(value: str, end: bool) -> str:
+    """
+    Bound of a date range as an ISO timestamp comparable with stored ones
+
+    A bare date covers the whole day, so an end date is turned into the start
+    of the next day. Stored timestamps are naive server time, so offsets are
+    refused rather than silently compared as text.
+    """
+    if len(value) == 10:
+        day = date.fromisoformat(value)
+        return (day + timedelta(days=1) if end else day).isoformat()
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        raise ValueError('timestamps must not carry a UTC offset')
+    # Inclusive end: anything before the next microsecond
+    return (moment + timedelta(microseconds=1) if end else moment).isoformat()
+
+
+def parse_filters(args: Mapping[str, str]) -> ExportFilters:
+    """
+    Filters from request or command-line arguments
+
+    Args:
+        args: domain, difficulty, from and to (YYYY-MM-DD or ISO timestamps, both inclusive)
+
+    Raises:
+        ValueError: For an unknown domain or difficulty, or a malformed date
+    """
+    domain = args.get('domain') or None
+    if domain is not None and domain not in DOMAINS:
+        raise ValueError(f'Unknown domain: {domain}')
+    difficulty = args.get('difficulty') or None
+    if difficulty is not None and difficulty not in DIFFICULTIES:
+        raise ValueError(f'Unknown difficulty: {difficulty}')
+    try:
+        since = _parse_time(args['from'], end=False) if args.get('from') else None
+        before = _parse_time(args['to'], end=True) if args.get('to') else None
+    except ValueError as e:
+        raise ValueError(f'Invalid date (use YYYY-MM-DD or an ISO timestamp): {e}') from None
+    return ExportFilters(domain, difficulty, since, before)
+
+
+def stream_rows(fmt: str, columns: Sequence[str], rows: Iterable[Sequence],
+                chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Encode rows lazily into chunks of about chunk_size characters
+
+    Only one chunk is held at a time, so memory does not depend on the number
+    of rows; grouping rows keeps the per-chunk cost of chunked transfer
+    encoding low.
+    """
+    buffer = io.StringIO()
+    if fmt == 'csv':
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        write = writer.writerow
+    else:
+        def write(row):
+            buffer.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+            buffer.write('\n')
+
+    for row in rows:
+        write(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def history_rows(history: Iterable[Dict], filters: ExportFilters) -> Iterator[tuple]:
+    """HISTORY_COLUMNS of the history records that pass the filters"""
+    for record in history:
+        if filters.matches(record):
+            yield tuple(record.get(column) for column in HISTORY_COLUMNS)
+
+
+def export_response(rows: Iterable[Sequence], columns: Sequence[str], fmt: str, filename: str) -> Response:
+    """Streamed download; without a Content-Length the server sends it with chunked transfer encoding"""
+    return Response(
+        stream_rows(fmt, columns, rows),
+        mimetype=FORMATS[fmt],
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'Cache-Control': 'no-store',
+            'X-Accel-Buffering': 'no',
+        }
+    )
+
+
+def export_filename(name: str, fmt: str, filters: ExportFilters) -> str:
+    """Download name that records the filters, e.g. results-secure-coding-2026-01-01.csv"""
+    parts = [name, filters.domain, filters.difficulty, filters.since and filters.since[:10]]
+    return '-'.join(part for part in parts if part) + f'.{fmt}'
@@ -0,0 +1,211 @@
+"""
+Results Import Module
+Validates historical results for bulk import and recomputes the affected learners' badges in parallel
+"""
+
+import csv
+import hashlib
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+from .assessment_service import get_assessment_service
+from .badges import BADGE_DEFS, evaluate_badges
+from .question_bank import DIFFICULTIES, DOMAINS
+from .results_export import HISTORY_COLUMNS
+from .results_store import ResultsStore, read_histories
+
+logger = logging.getLogger(__name__)
+
+# Learners whose badges one worker task recomputes
+BADGE_CHUNK = 100
+
+# Claim links (import_results.py --claim-links) stay valid this long
+CLAIM_MAX_AGE = 30 * 24 * 60 * 60
+CLAIM_SALT = 'learner-claim'
+
+
+def import_id(learner_id: str, completed_at: str, domain: str, difficulty: str, score: float) -> str:
+    """Assessment id of an imported result, derived from its content so a re-run imports nothing twice"""
+    text = f'{learner_id}\0{completed_at}\0{domain}\0{difficulty}\0{score}'
+    return 'import-' + hashlib.sha256(text.encode('utf-8')).hexdigest()[:24]
+
+
+def validate_record(record: Mapping) -> Tuple:
+    """
+    Check one historical result against the session history schema (see update_user_stats)
+
+    Args:
+        record: learner_id plus the HISTORY_COLUMNS fields
+
+    Returns:
+        The record as a ResultsStore IMPORT_COLUMNS tuple
+
+    Raises:
+        ValueError: Describing the first invalid field
+    """
+    if not isinstance(record, Mapping):
+        raise ValueError('not a JSON object')
+    learner_id = str(record.get('learner_id') or '').strip()
+    if not learner_id:
+        raise ValueError('learner_id is required')
+
+    try:
+        completed = datetime.fromisoformat(str(record.get('date') or ''))
+    except ValueError:
+        raise ValueError(f'date must be an ISO date or timestamp, got {record.get("date")!r}') from None
+    if completed.tzinfo is not None:
+        # Stored timestamps are naive server time
+        completed = completed.astimezone().replace(tzinfo=None)
+    if completed > datetime.now():
+        raise ValueError(f'date is in the future: {record.get("date")}')
+
+    domain = record.get('domain')
+    if domain not in DOMAINS:
+        raise ValueError(f'unknown domain {domain!r}')
+    difficulty = record.get('difficulty')
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f'unknown difficulty {difficulty!r}')
+
+    try:
+        score = float(record.get('score'))
+    except (TypeError, ValueError):
+        raise ValueError(f'score must be a number, got {record.get("score")!r}') from None
+    if not 0 <= score <= 100:
+        raise ValueError(f'score must be between 0 and 100, got {score}')
+
+    # The level follows from the score, as it does for live results; a missing one is derived
+    expected = get_assessment_service().get_performance_level(score)
+    level = record.get('performance_level') or expected
+    if level != expected:
+        raise ValueError(f'performance_level {level!r} does not match score {score} (expected {expected!r})')
+
+    completed_at = completed.isoformat()
+    return (learner_id, import_id(learner_id, completed_at, domain, difficulty, score),
+            domain, difficulty, score, level, completed_at)
+
+
+def read_records(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[int, Dict]]:
+    """
+    (line number, record) of a CSV or NDJSON file, read lazily
+
+    The format follows the file extension unless given; CSV needs a header row.
+    A malformed NDJSON line is yielded as None, so it fails validation.
+    """
+    fmt = fmt or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                yield line_number, record
+
+
+def replay_badges(history: List[Dict]) -> List[str]:
+    """
+    Badges earned over a history, oldest record first
+
+    Each record is added and evaluated in turn, as update_user_stats does after
+    every assessment, so badges that depend on the latest result (expert,
+    speedster, comeback) are awarded exactly as they would have been live.
+    """
+    user_stats = {
+        'total_assessments': 0,
+        'total_score': 0,
+        'avg_score': 0,
+        'badges': [],
+        'history': []
+    }
+    for record in history:
+        user_stats['total_assessments'] += 1
+        user_stats['total_score'] += record['score']
+        user_stats['history'].append({column: record[column] for column in HISTORY_COLUMNS})
+        user_stats['badges'].extend(evaluate_badges(user_stats, record))
+        if len(user_stats['badges']) == len(BADGE_DEFS):
+            break
+    return user_stats['badges']
+
+
+def _learner_badges(task: Tuple[str, List[str]]) -> List[Tuple[str, str]]:
+    """Worker task: (learner_id, badge_id) pairs of a chunk of learners"""
+    db_path, learner_ids = task
+    return [
+        (learner, badge)
+        for learner, history in read_histories(db_path, learner_ids).items()
+        for badge in replay_badges(history)
+    ]
+
+
+def recompute_badges(store: ResultsStore, learner_ids: Iterable[str], workers: Optional[int] = None) -> int:
+    """
+    Replay the full history of each learner and record the badges they earned
+
+    Args:
+        store: Results store holding the histories and badges
+        learner_ids: Learners to recompute
+        workers: Worker processes (defaults to the CPU count; 1 runs in this process)
+
+    Returns:
+        Number of badges newly recorded
+    """
+    learner_ids = list(learner_ids)
+    tasks = [(store.path, learner_ids[i:i + BADGE_CHUNK]) for i in range(0, len(learner_ids), BADGE_CHUNK)]
+    awarded = 0
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            awarded += store.save_badges(_learner_badges(task))
+        return awarded
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for badges in pool.map(_learner_badges, tasks):
+            awarded += store.save_badges(badges)
+    return awarded
+
+
+def claim_token(secret_key: str, learner_id: str) -> str:
+    """Signed token a migrated learner opens at /dashboard/claim/<token> to see their imported history"""
+    return URLSafeTimedSerializer(secret_key, salt=CLAIM_SALT).dumps(learner_id)
+
+
+def claimed_learner(secret_key: str, token: str, max_age: int = CLAIM_MAX_AGE) -> Optional[str]:
+    """The learner_id of a claim token, or None if it is forged or expired"""
+    try:
+        return URLSafeTimedSerializer(secret_key, salt=CLAIM_SALT).loads(token, max_age=max_age)
+    except BadSignature:
+        return None
+
+
+def claimed_stats(store: ResultsStore, learner_id: str, user_stats: Dict) -> Dict:
+    """
+    Session user stats holding a claimed learner's stored history and badges
+
+    Assessments the browser took before the claim are kept; they stay under
+    its previous learner id in the results store.
+    """
+    history = [
+        {column: record[column] for column in HISTORY_COLUMNS}
+        for record in read_histories(store.path, [learner_id])[learner_id]
+    ]
+    history.extend(user_stats.get('history', []))
+    total_score = sum(record['score'] for record in history)
+    badges = list(user_stats.get('badges', []))
+    badges.extend(badge for badge in store.learner_badges(learner_id) if badge not in badges)
+    return {
+        'total_assessments': len(history),
+        'total_score': total_score,
+        'avg_score': round(total_score / len(history), 2) if history else 0,
+        'badges': badges,
+        'history': history,
+    }
@@ -0,0 +1,309 @@
+"""
+Results Store Module
+Completed assessments of every learner in one shared SQLite database, for cohort-wide views
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    learner_id TEXT NOT NULL,
+    assessment_id TEXT UNIQUE,
+    domain TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score REAL NOT NULL,
+    correct INTEGER,
+    answered INTEGER,
+    total_time REAL,
+    performance_level TEXT,
+    completed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_learner ON results (learner_id);
+CREATE INDEX IF NOT EXISTS results_domain_completed ON results (domain, completed_at);
+CREATE INDEX IF NOT EXISTS results_completed ON results (completed_at);
+CREATE TABLE IF NOT EXISTS answers (
+    result_id INTEGER NOT NULL REFERENCES results (id),
+    position INTEGER NOT NULL,
+    question_key TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    is_correct INTEGER NOT NULL,
+    time_taken REAL NOT NULL,
+    PRIMARY KEY (result_id, position)
+);
+CREATE TABLE IF NOT EXISTS questions (
+    key TEXT PRIMARY KEY,
+    domain TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    title TEXT
+);
+CREATE TABLE IF NOT EXISTS learner_badges (
+    learner_id TEXT NOT NULL,
+    badge_id TEXT NOT NULL,
+    PRIMARY KEY (learner_id, badge_id)
+);
+"""
+
+# Columns of exported results, in order
+EXPORT_COLUMNS = (
+    'id', 'learner_id', 'assessment_id', 'domain', 'difficulty', 'score', 'correct',
+    'answered', 'total_time', 'performance_level', 'completed_at',
+)
+
+# Columns of imported historical results, in order
+IMPORT_COLUMNS = ('learner_id', 'assessment_id', 'domain', 'difficulty', 'score', 'performance_level', 'completed_at')
+
+# Unix time of an ISO timestamp, computed by SQLite so loaders never parse dates in Python
+UNIX_TIME = "COALESCE((julianday(completed_at) - 2440587.5) * 86400.0, 0)"
+
+
+def results_db_path() -> str:
+    """Database file every worker records into (must be shared between them)"""
+    return os.getenv('RESULTS_DB', os.path.join(os.getcwd(), 'results.db'))
+
+
+def question_key(domain: str, difficulty: str, question: Dict) -> str:
+    """Stable key of a bank question; the bank stores no ids and its order can change between versions"""
+    text = f'{domain}\0{difficulty}\0{question.get("question", "")}'
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+class ResultsStore:
+    """
+    Completed assessments, their answers and the questions they refer to
+
+    Writers from all workers are serialized by SQLite (WAL mode, so readers
+    never block them). Result ids only grow, which lets readers load just the
+    rows added since their last look.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or results_db_path()
+        self._local = threading.local()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection (sqlite3 connections must not be shared between threads or processes)"""
+        conn, pid = getattr(self._local, 'conn', (None, None))
+        if conn is None or pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = (conn, os.getpid())
+        return conn
+
+    def record(self, learner_id: str, results_data: Dict, assessment: Dict) -> Optional[int]:
+        """
+        Record a completed assessment with its answers
+
+        Args:
+            learner_id: Anonymous id of the learner (kept in their session)
+            results_data: Output of AssessmentService.calculate_results plus performance_level
+            assessment: The assessment, for per-question answers
+
+        Returns:
+            The new result id, or None if this assessment was recorded before
+        """
+        domain = assessment['domain']
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO results (learner_id, assessment_id, domain, difficulty, score, correct, '
+                'answered, total_time, performance_level, completed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    learner_id,
+                    assessment['id'],
+                    domain,
+                    results_data.get('difficulty', assessment['difficulty']),
+                    results_data['score'],
+                    results_data.get('correct'),
+                    results_data.get('answered'),
+                    results_data.get('total_time'),
+                    results_data.get('performance_level'),
+                    results_data['completion_date'],
+                )
+            )
+            if not cursor.rowcount:
+                return None
+            result_id = cursor.lastrowid
+
+            answers = []
+            questions = []
+            for position, (question, answer) in enumerate(zip(assessment['questions'], assessment['answers'])):
+                difficulty = question.get('difficulty', assessment['difficulty'])
+                key = question_key(domain, difficulty, question)
+                answers.append((result_id, position, key, difficulty, int(answer['is_correct']), answer['time_taken']))
+                questions.append((key, domain, difficulty, question.get('title')))
+            conn.executemany('INSERT OR IGNORE INTO questions VALUES (?, ?, ?, ?)', questions)
+            conn.executemany('INSERT INTO answers VALUES (?, ?, ?, ?, ?, ?)', answers)
+
+        logger.debug('Recorded result %s for assessment %s', result_id, assessment['id'])
+        return result_id
+
+    def last_result_id(self) -> int:
+        return self._connect().execute('SELECT COALESCE(MAX(id), 0) FROM results').fetchone()[0]
+
+    def results_between(self, after_id: int, upto_id: int) -> Iterator[Tuple]:
+        """(id, learner_id, domain, difficulty, score, completed unix time) of results in (after_id, upto_id]"""
+        return self._connect().execute(
+            f'SELECT id, learner_id, domain, difficulty, score, {UNIX_TIME} FROM results '
+            'WHERE id > ? AND id <= ? ORDER BY id',
+            (after_id, upto_id)
+        )
+
+    def answers_between(self, after_id: int, upto_id: int) -> Iterator[Tuple]:
+        """(result_id, question_key, difficulty, is_correct, time_taken) of answers to results in (after_id, upto_id]"""
+        return self._connect().execute(
+            'SELECT result_id, question_key, difficulty, is_correct, time_taken FROM answers '
+            'WHERE result_id > ? AND result_id <= ? ORDER BY result_id, position',
+            (after_id, upto_id)
+        )
+
+    def export_rows(self, domain: Optional[str] = None, difficulty: Optional[str] = None,
+                    since: Optional[str] = None, before: Optional[str] = None,
+                    batch_size: int = 1000) -> Iterator[Tuple]:
+        """
+        Results matching the filters (EXPORT_COLUMNS), oldest first
+
+        Args:
+            domain: Only this domain
+            difficulty: Only this difficulty
+            since: Only results completed at or after this ISO timestamp
+            before: Only results completed before this ISO timestamp
+            batch_size: Rows fetched from SQLite at a time
+
+        Rows are read in batches along the completed_at indexes, so SQLite never
+        sorts and memory stays flat whatever the number of rows. The generator
+        has its own connection, closed when it is exhausted or closed, and may
+        be resumed from any thread (as streaming servers do).
+        """
+        clauses = []
+        params = []
+        for condition, value in (('domain = ?', domain), ('difficulty = ?', difficulty),
+                                 ('completed_at >= ?', since), ('completed_at < ?', before)):
+            if value is not None:
+                clauses.append(condition)
+                params.append(value)
+        where = f'WHERE {" AND ".join(clauses)} ' if clauses else ''
+
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        try:
+            cursor = conn.execute(
+                f'SELECT {", ".join(EXPORT_COLUMNS)} FROM results {where}ORDER BY completed_at, id',
+                params
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            conn.close()
+
+    def import_results(self, records: Iterable[Tuple], batch_size: int = 50000, cache_mb: int = 256) -> int:
+        """
+        Bulk-insert historical results without answers
+
+        Args:
+            records: IMPORT_COLUMNS tuples; a record whose assessment_id is already stored is skipped
+            batch_size: Records per transaction
+            cache_mb: SQLite page cache while importing; keeps the index pages of
+                large batches in memory (about twice as fast for a million rows)
+
+        Returns:
+            Number of results inserted
+        """
+        conn = self._connect()
+        cache_size = conn.execute('PRAGMA cache_size').fetchone()[0]
+        conn.execute(f'PRAGMA cache_size={-1024 * cache_mb}')
+        before = conn.total_changes
+        statement = (f'INSERT OR IGNORE INTO results ({", ".join(IMPORT_COLUMNS)}) '
+                     f'VALUES ({", ".join("?" * len(IMPORT_COLUMNS))})')
+        try:
+            batch = []
+            for record in records:
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    with conn:
+                        conn.executemany(statement, batch)
+                    batch = []
+            if batch:
+                with conn:
+                    conn.executemany(statement, batch)
+        finally:
+            conn.execute(f'PRAGMA cache_size={cache_size}')
+        return conn.total_changes - before
+
+    def learners_after(self, after_id: int) -> List[str]:
+        """Learners with results recorded after after_id"""
+        rows = self._connect().execute('SELECT DISTINCT learner_id FROM results WHERE id > ?', (after_id,))
+        return [learner for learner, in rows]
+
+    def save_badges(self, badges: Iterable[Tuple[str, str]]) -> int:
+        """Record (learner_id, badge_id) pairs in one transaction; returns how many were new"""
+        with self._connect() as conn:
+            return conn.executemany('INSERT OR IGNORE INTO learner_badges VALUES (?, ?)', badges).rowcount
+
+    def learner_badges(self, learner_id: str) -> List[str]:
+        rows = self._connect().execute('SELECT badge_id FROM learner_badges WHERE learner_id = ?', (learner_id,))
+        return [badge for badge, in rows]
+
+    def questions(self) -> Dict[str, Tuple[str, str, Optional[str]]]:
+        """Question key -> (domain, difficulty, title)"""
+        rows = self._connect().execute('SELECT key, domain, difficulty, title FROM questions')
+        return {key: (domain, difficulty, title) for key, domain, difficulty, title in rows}
+
+
+def read_histories(path: str, learner_ids: List[str]) -> Dict[str, List[Dict]]:
+    """
+    Every result of the given learners as session history records, oldest first
+
+    Opens its own read-only connection, for worker processes. Records carry
+    avg_time_per_question as well when the result has timings.
+    """
+    histories: Dict[str, List[Dict]] = {learner: [] for learner in learner_ids}
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True, timeout=10)
+    try:
+        rows = conn.execute(
+            'SELECT learner_id, completed_at, domain, difficulty, score, performance_level, total_time, answered '
+            f'FROM results WHERE learner_id IN ({", ".join("?" * len(learner_ids))}) '
+            'ORDER BY learner_id, completed_at, id',
+            learner_ids
+        )
+        for learner, completed, domain, difficulty, score, level, total_time, answered in rows:
+            record = {
+                'date': completed,
+                'domain': domain,
+                'difficulty': difficulty,
+                'score': score,
+                'performance_level': level,
+            }
+            if total_time is not None and answered:
+                record['avg_time_per_question'] = round(total_time / answered, 2)
+            histories[learner].append(record)
+    finally:
+        conn.close()
+    return histories
+
+
+# Singleton instance
+_results_store = None
+
+def get_results_store() -> ResultsStore:
+    """Get or create results store singleton"""
+    global _results_store
+
+    if _results_store is None:
+        _results_store = ResultsStore()
+
+    return _results_store
@@ -0,0 +1,188 @@
+"""
+Static Assets Service Module
+Fingerprinted, pre-compressed static files with long-lived cache headers
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import shutil
+from typing import Dict, List, Optional
+
+from flask import current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip variants are built without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DIST_DIR = 'dist'
+MANIFEST_FILE = 'manifest.json'
+HASH_LENGTH = 12
+
+# Only text formats compress well; audio and images are already compressed
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.json', '.html', '.svg', '.txt', '.map', '.xml'}
+
+# Variant suffixes in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Files content-hashed by their own generator (compile_translations.py), immutable
+# even when written after the last asset build
+SELF_HASHED = re.compile(rf'^i18n/[^/]+\.[0-9a-f]{{{HASH_LENGTH}}}\.json$')
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(relative_path: str, digest: str) -> str:
+    """'sound/correct.mp3' -> 'sound/correct.<digest>.mp3'"""
+    root, ext = os.path.splitext(relative_path)
+    if root.endswith(f'.{digest}'):
+        # Already content-hashed by its generator (e.g. i18n bundles)
+        return relative_path
+    return f'{root}.{digest}{ext}'
+
+
+def _write_variants(path: str, data: bytes) -> List[str]:
+    """Write .br/.gz next to path when they save at least 10%; returns the encodings written"""
+    encodings = []
+    candidates = [('gzip', '.gz', lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        candidates.insert(0, ('br', '.br', lambda: brotli.compress(data, quality=11)))
+    for encoding, suffix, compress in candidates:
+        compressed = compress()
+        if len(compressed) < len(data) * 0.9:
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            encodings.append(encoding)
+    return encodings
+
+
+def build(static_dir: str, clean: bool = False) -> Dict[str, Dict]:
+    """
+    Fingerprint every file under static_dir into static_dir/dist
+
+    Args:
+        static_dir: The app's static folder
+        clean: Remove earlier builds first (otherwise old hashed files are kept
+            so pages rendered by not-yet-restarted workers still resolve)
+
+    Returns:
+        Manifest assets: logical path -> {'path': hashed path under static/, 'encodings': [...]}
+    """
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    if clean and os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+
+    assets: Dict[str, Dict] = {}
+    for root, dirs, files in os.walk(static_dir):
+        if os.path.abspath(root) == os.path.abspath(static_dir):
+            dirs[:] = [d for d in dirs if d != DIST_DIR]
+        for filename in sorted(files):
+            source = os.path.join(root, filename)
+            logical = os.path.relpath(source, static_dir).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                data = f.read()
+
+            target_rel = f'{DIST_DIR}/{hashed_name(logical, fingerprint(data))}'
+            target = os.path.join(static_dir, *target_rel.split('/'))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(data)
+
+            encodings = []
+            if os.path.splitext(filename)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                encodings = _write_variants(target, data)
+            assets[logical] = {'path': target_rel, 'encodings': encodings}
+
+    os.makedirs(dist_dir, exist_ok=True)
+    with open(os.path.join(dist_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'assets': assets}, f, indent=2, sort_keys=True)
+        f.write('\n')
+    logger.info(f'✅ Built {len(assets)} fingerprinted assets into {dist_dir}')
+    return assets
+
+
+class AssetManifest:
+    """Logical static path -> fingerprinted path lookup, loaded once per process"""
+
+    def __init__(self, assets: Optional[Dict[str, Dict]] = None):
+        self.assets = assets or {}
+        # Hashed path -> encodings, for the static view
+        self.encodings = {entry['path']: entry.get('encodings', []) for entry in self.assets.values()}
+
+    @classmethod
+    def load(cls, static_dir: str) -> 'AssetManifest':
+        path = os.path.join(static_dir, DIST_DIR, MANIFEST_FILE)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(json.load(f).get('assets', {}))
+        except (OSError, json.JSONDecodeError):
+            logger.info('No asset manifest found - serving unfingerprinted static files')
+            return cls()
+
+    def resolve(self, filename: str) -> str:
+        entry = self.assets.get(filename)
+        return entry['path'] if entry else filename
+
+
+def asset_url(filename: str) -> str:
+    """URL of a static file, fingerprinted when the asset build has run (not in debug mode)"""
+    manifest: AssetManifest = current_app.extensions['asset_manifest']
+    if current_app.config.get('DEBUG'):
+        return url_for('static', filename=filename)
+    return url_for('static', filename=manifest.resolve(filename))
+
+
+def _accepts(encoding: str) -> bool:
+    """Whether Accept-Encoding allows encoding (by name or '*') with a non-zero q"""
+    return request.accept_encodings[encoding] > 0
+
+
+def serve_static(filename: str):
+    """Static view: pre-compressed variants, immutable caching for fingerprinted files, ETag/304"""
+    static_dir = current_app.static_folder
+    manifest: AssetManifest = current_app.extensions['asset_manifest']
+    available = manifest.encodings.get(filename, ())
+
+    chosen, content_encoding = filename, None
+    for encoding, suffix in ENCODINGS:
+        if encoding in available and _accepts(encoding):
+            chosen, content_encoding = filename + suffix, encoding
+            break
+
+    fingerprinted = filename in manifest.encodings or SELF_HASHED.match(filename) is not None
+    response = send_from_directory(
+        static_dir,
+        chosen,
+        mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+        conditional=True,
+        etag=True,
+        max_age=31536000 if fingerprinted else 0,
+    )
+    if content_encoding:
+        response.headers['Content-Encoding'] = content_encoding
+    if available:
+        response.vary.add('Accept-Encoding')
+    if fingerprinted:
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        # Unversioned URLs must be revalidated; the ETag makes that a 304
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def init_app(app) -> None:
+    """Load the manifest, expose asset_url() to templates and take over the static view"""
+    app.extensions['asset_manifest'] = AssetManifest.load(app.static_folder)
+    app.add_template_global(asset_url)
+    app.view_functions['static'] = serve_static
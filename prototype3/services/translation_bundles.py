@@ -0,0 +1,93 @@
+"""
+Translation Bundles Service Module
+Per-locale, content-hashed client-side string bundles split from static/translations.json
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+from flask import current_app, url_for
+from flask_babel import get_locale
+
+from .static_assets import asset_url
+
+logger = logging.getLogger(__name__)
+
+SOURCE_FILE = 'translations.json'
+BUNDLE_DIR = 'i18n'
+MANIFEST_FILE = 'manifest.json'
+
+
+def build_bundles(static_dir: str) -> Dict[str, str]:
+    """
+    Split static/translations.json into static/i18n/<locale>.<hash>.json
+
+    Earlier bundles are left in place so pages rendered by workers that have
+    not restarted yet keep resolving.
+
+    Returns:
+        Manifest: locale -> bundle path relative to the static folder
+    """
+    with open(os.path.join(static_dir, SOURCE_FILE), 'r', encoding='utf-8') as f:
+        source = json.load(f)
+
+    bundle_dir = os.path.join(static_dir, BUNDLE_DIR)
+    os.makedirs(bundle_dir, exist_ok=True)
+
+    manifest: Dict[str, str] = {}
+    for locale, strings in sorted(source.items()):
+        data = json.dumps(strings, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        filename = f'{locale}.{digest}.json'
+        with open(os.path.join(bundle_dir, filename), 'wb') as f:
+            f.write(data)
+        manifest[locale] = f'{BUNDLE_DIR}/{filename}'
+
+    with open(os.path.join(bundle_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    logger.info(f'✅ Built {len(manifest)} translation bundles into {bundle_dir}')
+    return manifest
+
+
+def _load_manifest(app) -> Dict[str, str]:
+    manifest = app.extensions.get('translation_bundles')
+    if manifest is None:
+        path = os.path.join(app.static_folder, BUNDLE_DIR, MANIFEST_FILE)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            logger.info('No translation bundles built - serving strings from /api/translations')
+            manifest = {}
+        app.extensions['translation_bundles'] = manifest
+    return manifest
+
+
+def load_strings(static_dir: str, locale: str) -> Optional[Dict[str, str]]:
+    """Strings for one locale straight from the source file (unbuilt fallback)"""
+    with open(os.path.join(static_dir, SOURCE_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f).get(locale)
+
+
+def bundle_url(locale: str) -> str:
+    """URL of the client-side string bundle for a locale (English if it has none)"""
+    manifest = _load_manifest(current_app)
+    path = manifest.get(locale) or manifest.get('en')
+    if path:
+        return asset_url(path)
+    return url_for('api.translations', language=locale)
+
+
+def current_locale() -> str:
+    """Locale of the current request as a string, for templates"""
+    return str(get_locale() or 'en')
+
+
+def init_app(app) -> None:
+    """Expose translation_bundle_url() and current_locale() to templates"""
+    app.add_template_global(bundle_url, 'translation_bundle_url')
+    app.add_template_global(current_locale)
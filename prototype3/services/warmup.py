@@ -0,0 +1,216 @@
+"""
+Worker Warmup Module
+Loads, compiles and primes everything a first request would otherwise pay for, and reports worker readiness
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from flask import request
+from flask_babel import force_locale, get_translations
+
+from . import cohort_analytics
+from .gemini_service import get_gemini_service
+from .leaderboard import get_leaderboard
+from .question_bank import DOMAINS, get_question_bank
+from .question_generator import get_question_generator
+from .render_cache import get_render_cache
+
+logger = logging.getLogger(__name__)
+
+# Cache-backed pages rendered once per locale (the badge catalog as a new learner sees it)
+PRIMED_PAGES = (
+    '/about',
+    '/assessment/start',
+    *(f'/assessment/start?domain={domain}' for domain in DOMAINS),
+    '/dashboard/badges',
+)
+
+# Key of the session backend round trip; outside the session key prefix
+PROBE_KEY = 'readiness-probe-{pid}'
+
+_lock = threading.Lock()
+_state: Dict = {'status': 'cold', 'seconds': None, 'steps': {}}
+
+
+def _question_bank(app) -> Dict:
+    question_bank = get_question_bank()
+    counts = question_bank.get_question_count()
+    if not counts['total']:
+        raise RuntimeError('question bank is empty')
+    return {'version': question_bank.version, 'questions': counts['total']}
+
+
+def _templates(app) -> Dict:
+    """Compile every page template (from the bytecode cache when it is warm) into Jinja's in-memory cache"""
+    names = [name for name in app.jinja_env.list_templates() if name.endswith('.html')]
+    for name in names:
+        app.jinja_env.get_template(name)
+    return {'templates': len(names)}
+
+
+def _catalogs(app) -> Dict:
+    """Parse the Babel catalog of every supported language into Flask-Babel's process-wide cache"""
+    loaded = []
+    with app.test_request_context():
+        for locale in app.config['LANGUAGES']:
+            with force_locale(locale):
+                if get_translations().files:
+                    loaded.append(locale)
+    return {'locales': loaded}
+
+
+def _rendered_pages(app) -> Dict:
+    """Render the cache-backed pages in every language through their views, filling the render cache"""
+    rendered = 0
+    for locale in app.config['LANGUAGES']:
+        for path in PRIMED_PAGES:
+            with app.test_request_context(path, headers={'Accept-Language': locale}):
+                app.view_functions[request.endpoint](**request.view_args)
+                rendered += 1
+    return {'pages': rendered, 'cached': len(get_render_cache())}
+
+
+def _leaderboard(app) -> Dict:
+    return {'ranked': get_leaderboard().size()}
+
+
+def _analytics(app) -> Dict:
+    """Load the cohort columns up front, only where the analytics API is enabled"""
+    if not (cohort_analytics.analytics_token() and cohort_analytics.analytics_available()):
+        return {'skipped': True}
+    analytics = cohort_analytics.get_cohort_analytics()
+    analytics.refresh(force=True)
+    return {'results': analytics.results.size}
+
+
+def _ai_service(app) -> Dict:
+    gemini_service = get_gemini_service()
+    return {'feedback_pack_entries': len(gemini_service.feedback_pack)}
+
+
+def _question_buffers(app) -> Dict:
+    """Start filling the AI question buffers in the background, so /api/generate-question has them ready"""
+    generator = get_question_generator()
+    if not generator.enabled:
+        return {'skipped': True}
+    generator.prewarm()
+    return {'categories': len(generator.question_bank.questions), 'buffer_size': generator.buffer_size}
+
+
+# (name, step, required for readiness)
+STEPS: List[Tuple[str, Callable, bool]] = [
+    ('question_bank', _question_bank, True),
+    ('templates', _templates, True),
+    ('catalogs', _catalogs, False),
+    ('ai_service', _ai_service, False),
+    ('question_buffers', _question_buffers, False),
+    ('render_cache', _rendered_pages, False),
+    ('leaderboard', _leaderboard, False),
+    ('analytics', _analytics, False),
+]
+
+
+def warm(app) -> Dict:
+    """
+    Run every warmup step once per process
+
+    Called before a worker takes traffic (gunicorn post_worker_init, ASGI
+    lifespan startup, python app.py). A failing step is logged and reported
+    by readiness() instead of stopping the worker.
+
+    Returns:
+        The warmup state: status, seconds and per-step results
+    """
+    with _lock:
+        if _state['status'] != 'cold':
+            return _state
+
+        _state['status'] = 'warming'
+        start = time.perf_counter()
+        for name, step, required in STEPS:
+            step_start = time.perf_counter()
+            try:
+                result = {'ok': True, **step(app)}
+            except Exception as e:
+                logger.exception(f'Warmup step {name} failed: {e}')
+                result = {'ok': False, 'error': str(e)}
+            result['ms'] = round((time.perf_counter() - step_start) * 1000, 1)
+            result['required'] = required
+            _state['steps'][name] = result
+
+        _state['seconds'] = round(time.perf_counter() - start, 3)
+        failed = [name for name, result in _state['steps'].items() if not result['ok']]
+        _state['status'] = 'failed' if failed else 'warm'
+        if failed:
+            logger.error(f'Worker {os.getpid()} warmup finished with failed steps: {", ".join(failed)}')
+        else:
+            logger.info(f'✅ Worker {os.getpid()} warmed up in {_state["seconds"]}s')
+        return _state
+
+
+def _session_backend(app) -> Dict:
+    """Round trip through the session store, timed"""
+    cache = getattr(app.session_interface, 'cache', None)
+    if cache is None:
+        return {'ok': True, 'type': type(app.session_interface).__name__, 'latency_ms': None}
+
+    key = PROBE_KEY.format(pid=os.getpid())
+    start = time.perf_counter()
+    try:
+        ok = cache.set(key, 1, timeout=60) and cache.get(key) == 1
+        cache.delete(key)
+    except Exception as e:
+        logger.error(f'Session backend probe failed: {e}')
+        ok = False
+    return {
+        'ok': bool(ok),
+        'type': type(cache).__name__,
+        'latency_ms': round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+def readiness(app) -> Dict:
+    """
+    Whether this worker should get traffic, with the state behind the answer
+
+    Ready once warmup has run its required steps, the question bank has
+    questions and the session store answers. Servers without a warmup hook
+    warm up on their first readiness check.
+    """
+    state = warm(app) if _state['status'] == 'cold' else _state
+
+    question_bank = get_question_bank()
+    counts = question_bank.get_question_count()
+    session_backend = _session_backend(app)
+    gemini_service = get_gemini_service()
+    question_generator = get_question_generator()
+
+    warmed = state['status'] != 'warming' and all(
+        result['ok'] for result in state['steps'].values() if result['required']
+    )
+    return {
+        'ready': warmed and counts['total'] > 0 and session_backend['ok'],
+        'pid': os.getpid(),
+        'warmup': state,
+        'question_bank': {
+            'version': question_bank.version,
+            'total': counts['total'],
+            'categories': counts['by_domain'],
+        },
+        'session_backend': session_backend,
+        'ai': {
+            'model_configured': gemini_service.model is not None,
+            'breaker': gemini_service.breaker.state,
+            'feedback_pack': {
+                'version': gemini_service.feedback_pack.version,
+                'entries': len(gemini_service.feedback_pack),
+            },
+            # Ready AI questions per domain_difficulty in this worker (refilled in the background)
+            'question_buffers': question_generator.buffer_levels() if question_generator.enabled else None,
+        },
+        'render_cache_entries': len(get_render_cache()),
+    }
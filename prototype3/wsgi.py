@@ -0,0 +1,9 @@
+"""
+CyberHubs AI Assessment Platform - WSGI Entry Point
+Production entry point: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from app import create_app, init_services
+
+app = create_app()
+init_services(app)